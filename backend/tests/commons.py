@@ -29,10 +29,12 @@
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
 from enum import Enum
+from functools import partial
 from http import HTTPStatus
 from typing import Any, Iterable, TypeAlias
 
 import allure
+import orjson
 from django.db.models import Model
 from django.test.client import RequestFactory
 from rest_framework.renderers import JSONRenderer
@@ -100,6 +102,8 @@ class CustomAPIClient(APIClient):
         if validate_status:
             with allure.step(f'Validate status code is {expected_status}'):
                 assert response.status_code == expected_status, err_msg
+        if response.streaming:
+            response.json = partial(orjson.loads, b''.join(response.streaming_content))
         response.json_strip = json_strip.__get__(response)  # noqa: WPS609
         return response
 
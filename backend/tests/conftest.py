@@ -42,6 +42,7 @@ from channels.layers import get_channel_layer
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils import timezone
 from pytest_factoryboy import register
@@ -71,6 +72,7 @@ from tests.factories import (
     RoleFactory,
     SystemMessageFactory,
     TestCaseFactory,
+    TestCaseStepFactory,
     TestCaseWithStepsFactory,
     TestFactory,
     TestPlanFactory,
@@ -89,6 +91,7 @@ from testy.users.choices import UserAllowedPermissionCodenames
 register(ParameterFactory)
 register(ProjectFactory)
 register(TestCaseFactory)
+register(TestCaseStepFactory)
 register(TestCaseWithStepsFactory, _name='test_case_with_steps')
 register(TestFactory)
 register(TestPlanFactory)
@@ -472,6 +475,17 @@ def empty_plan_data_project_statistics(
     return expected, start_date, end_date
 
 
+@pytest.fixture(autouse=True)
+def use_local_memory_cache_backend(settings):
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def use_dummy_cache_backend(settings):
     settings.CACHES = {
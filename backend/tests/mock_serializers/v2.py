@@ -61,7 +61,6 @@ from testy.tests_representation.api.v2.serializers import (
     TestUnionSerializer,
 )
 from testy.tests_representation.models import TestPlan
-from testy.tests_representation.selectors.testplan import TestPlanSelector
 from testy.utilities.time import WorkTimeProcessor
 
 
@@ -73,9 +72,7 @@ class TestMockSerializer(BaseTestMockSerializer, TestSerializer):
         return '/'.join([elem.name for elem in instance.case.suite.get_ancestors(include_self=True)])
 
     def get_plan_path(self, instance):
-        plans = instance.plan.get_ancestors(include_self=True)
-        plans = TestPlanSelector.annotate_title(plans)
-        return '/'.join([elem.title for elem in plans])
+        return '/'.join([elem.title for elem in instance.plan.get_ancestors(include_self=True)])
 
 
 class ProjectRetrieveMockSerializer(BaseIsManageableProject, ProjectRetrieveSerializer):
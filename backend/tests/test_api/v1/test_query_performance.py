@@ -92,6 +92,7 @@ class TestNumberOfQueries:
         for _ in range(constants.NUMBER_OF_OBJECTS_TO_CREATE):
             project_factory()
         view_name_list = constants.LIST_VIEW_NAMES['project']
+        authorized_superuser_client.send_request(view_name_list)  # warm up cached permission matrix
         with CaptureQueriesContext(connection) as context:
             authorized_superuser_client.send_request(view_name_list)
             num_of_queries_initial = len(context.captured_queries)
@@ -111,7 +112,6 @@ class TestNumberOfQueries:
                                                                            f'is exceeding allowed maximum.\n' \
                                                                            f'Number of queries: "{num_of_queries}"'
 
-    @pytest.mark.skip('Increase queries for speed up statistic')
     def test_project_progress_queries(
         self, api_client, project, authorized_superuser, test_factory,
         test_result_factory, test_plan_factory,
@@ -311,8 +311,8 @@ class TestSuiteEndpoints:
             self._validate_copied_objects(
                 attachments_section_2,
                 copied_attachments_sec_2,
-                changed_attr_names=['id', 'object_id', 'content_object', 'file'],
-                copied_attr_names=['name', 'filename', 'file_extension', 'size', 'content_type', 'comment'],
+                changed_attr_names=['id', 'object_id', 'content_object'],
+                copied_attr_names=['name', 'filename', 'file_extension', 'size', 'content_type', 'comment', 'file'],
                 project_id_changed=is_project_specified,
             )
         with allure.step('Validate steps copied in suite section_2'):
@@ -328,8 +328,8 @@ class TestSuiteEndpoints:
             self._validate_copied_objects(
                 attachments_steps_section_2,
                 copied_attachments_steps_sec_2,
-                changed_attr_names=['id', 'object_id', 'content_object', 'file'],
-                copied_attr_names=['name', 'filename', 'file_extension', 'size', 'content_type', 'comment'],
+                changed_attr_names=['id', 'object_id', 'content_object'],
+                copied_attr_names=['name', 'filename', 'file_extension', 'size', 'content_type', 'comment', 'file'],
                 project_id_changed=is_project_specified,
             )
 
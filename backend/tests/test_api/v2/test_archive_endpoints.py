@@ -30,11 +30,16 @@
 # <http://www.gnu.org/licenses/>.
 from copy import deepcopy
 from http import HTTPStatus
+from unittest import mock
 
+import orjson
 import pytest
+from django.core.cache import cache
 
 from tests.commons import RequestType
 from testy.core.models import Project
+from testy.core.tasks import run_subtree_job
+from testy.root.relations import RelationTreeMixin
 from testy.tests_representation.models import Test, TestCase, TestPlan, TestResult
 
 
@@ -43,6 +48,8 @@ class TestArchiveEndpoints:
     archive_preview_view_name = 'api:v2:{0}-archive-preview'
     archive_view_name = 'api:v2:{0}-archive-commit'
     archive_restore_view_name = 'api:v2:{0}-archive-restore'
+    archive_async_view_name = 'api:v2:{0}-archive-async'
+    archive_restore_async_view_name = 'api:v2:{0}-archive-restore-async'
 
     model_to_key = [
         [Project, 'project'],
@@ -95,6 +102,41 @@ class TestArchiveEndpoints:
 
         self._validate_restored_objects(expected_objects)
 
+    @pytest.mark.parametrize(
+        'instances_key, expected_objects_diff, idxs_for_deletion',
+        [
+            ('project', [1, 11, 2, 40, 400], [-1]),
+            ('testplan', [0, 2, 0, 20, 200], [-1, -2]),
+            ('testcase', [0, 0, 2, 40, 400], [-1, -2]),
+        ],
+    )
+    def test_data_cascade_recovery_async(
+        self, api_client, authorized_superuser, data_for_cascade_tests_behaviour,
+        instances_key, expected_objects_diff, idxs_for_deletion,
+    ):
+        expected_objects, objects_count = data_for_cascade_tests_behaviour
+        expected_objects.pop('testsuite')
+        instance_ids = [expected_objects[instances_key][idx].id for idx in idxs_for_deletion]
+        for instance_id in instance_ids:
+            self._run_job(
+                api_client,
+                self.archive_async_view_name.format(instances_key),
+                reverse_kwargs={'pk': instance_id},
+            )
+        for (model, key), objects_number_diff in zip(self.model_to_key, expected_objects_diff):
+            assert model.objects.filter(is_archive=False).count() == objects_count[key] - objects_number_diff, \
+                f'Count of objects of model {model} did not match expected'
+        self._run_job(
+            api_client,
+            self.archive_restore_async_view_name.format(instances_key),
+            data={'instance_ids': instance_ids},
+        )
+
+        for model, key in self.model_to_key:
+            assert model.objects.filter(is_archive=False).count() == objects_count[key], \
+                f'Objects with model {model} were not restored'
+        self._validate_restored_objects(expected_objects)
+
     @pytest.mark.parametrize(
         'instances_key, expected_objects_diff, idx_for_deletion',
         [
@@ -138,6 +180,61 @@ class TestArchiveEndpoints:
 
         self._validate_restored_objects(expected_objects)
 
+    def test_archive_by_preview_plan(self, api_client, authorized_superuser, data_for_cascade_tests_behaviour):
+        expected_objects, objects_count = data_for_cascade_tests_behaviour
+        plan_to_archive, plan_to_skip = expected_objects['testplan'][-1], expected_objects['testplan'][-2]
+        response = api_client.send_request(
+            self.archive_preview_view_name.format('testplan'),
+            reverse_kwargs={'pk': plan_to_archive.id},
+        )
+        cache_key = response.cookies['archive_cache'].value
+        assert orjson.loads(cache.get(cache_key)) == {
+            'model': TestPlan._meta.label_lower,
+            'pk': plan_to_archive.id,
+            'path': plan_to_archive.path,
+            'counts': [elem['count'] for elem in response.json()],
+        }
+        get_plan_queryset = RelationTreeMixin.get_plan_queryset
+        with mock.patch.object(RelationTreeMixin, 'get_plan_queryset', wraps=get_plan_queryset) as plan_qs_mock:
+            for plan in (plan_to_archive, plan_to_skip):
+                api_client.send_request(
+                    self.archive_view_name.format('testplan'),
+                    reverse_kwargs={'pk': plan.id},
+                    request_type=RequestType.POST,
+                )
+        assert plan_qs_mock.call_count == 1, 'Objects of previewed plan must be gathered from preview plan'
+        assert cache.get(cache_key) is None, 'Preview plan was not removed after use'
+        assert RelationTreeMixin.preview_cache_stats() == {'hits': 1, 'misses': 1}
+        assert TestPlan.objects.filter(is_archive=False).count() == objects_count['testplan'] - 2
+        assert Test.objects.filter(is_archive=False).count() == objects_count['test'] - 20
+
+    def test_archive_moved_after_preview(self, api_client, authorized_superuser, test_plan_factory, test_factory):
+        plan = test_plan_factory()
+        test = test_factory(plan=plan, project=plan.project)
+        api_client.send_request(self.archive_preview_view_name.format('testplan'), reverse_kwargs={'pk': plan.id})
+        plan.parent = test_plan_factory(project=plan.project)
+        plan.save()
+        api_client.send_request(
+            self.archive_view_name.format('testplan'),
+            reverse_kwargs={'pk': plan.id},
+            request_type=RequestType.POST,
+        )
+        assert RelationTreeMixin.preview_cache_stats() == {'hits': 0, 'misses': 1}
+        assert TestPlan.objects.get(pk=plan.id).is_archive, 'Moved plan was not archived'
+        assert Test.objects.get(pk=test.id).is_archive, 'Test of moved plan was not archived'
+
+    @classmethod
+    def _run_job(cls, api_client, view_name, **request_kwargs):
+        with mock.patch('testy.root.mixins.run_subtree_job.apply_async') as apply_mock:
+            api_client.send_request(
+                view_name,
+                request_type=RequestType.POST,
+                expected_status=HTTPStatus.ACCEPTED,
+                **request_kwargs,
+            )
+        result = run_subtree_job.apply(**apply_mock.call_args.kwargs).get()
+        assert not result['cancelled']
+
     def _validate_restored_objects(self, expected_objects):
         actual_objects = {
             'project': [],
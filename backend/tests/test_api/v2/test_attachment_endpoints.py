@@ -247,6 +247,37 @@ class TestAttachmentEndpoints:
         Attachment.deleted_objects.all().hard_delete()
         assert len(os.listdir(attachment_file_path)) == 2, 'All related files must be deleted, other should exist.'
 
+    @pytest.mark.parametrize('extension', ['.txt'])
+    @pytest.mark.django_db(transaction=True)
+    def test_clones_share_file_until_last_reference_deleted(
+        self, api_client, authorized_superuser, create_file, project, test_case,
+    ):
+        attachment_json = {
+            'project': project.id,
+            'file': create_file,
+        }
+        attachment_ids = []
+        for _ in range(2):
+            create_file.seek(0)
+            attachment_ids.append(
+                api_client.send_request(
+                    self.list_view_name,
+                    data=attachment_json,
+                    request_type=RequestType.POST,
+                    expected_status=HTTPStatus.CREATED,
+                    format='multipart',
+                ).json()[0]['id'],
+            )
+        first_attachment, second_attachment = Attachment.objects.filter(pk__in=attachment_ids)
+        assert first_attachment.file.name == second_attachment.file.name, 'Same content must be stored once'
+        clone = first_attachment.model_clone(common_attrs_to_change={'object_id': test_case.id})
+        assert clone.file.name == first_attachment.file.name, 'Clone must reference source file'
+        for attachment in (first_attachment, second_attachment):
+            attachment.hard_delete()
+            assert os.path.isfile(clone.file.path), 'File removed while still referenced'
+        clone.hard_delete()
+        assert not os.path.isfile(clone.file.path)
+
     @pytest.mark.parametrize('extension', ['.txt'])
     @pytest.mark.django_db(transaction=True)
     def test_cascade_soft_delete(
@@ -35,6 +35,9 @@ import allure
 import pytest
 from channels.db import database_sync_to_async
 from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from notifications.models import Notification
 
 from tests.commons import RequestType, model_to_dict_via_serializer
@@ -44,6 +47,7 @@ from testy.core.choices import ActionCode
 from testy.core.models import NotificationSetting
 from testy.core.services.notifications import NotificationService
 from testy.root.asgi import application
+from testy.tests_representation.tasks import notify_bulk_assign
 
 
 @allure.parent_suite('Test notifications')
@@ -141,6 +145,33 @@ class TestNotificationEndpoints:
         with allure.step('Validate notifications did not appear'):
             assert not Notification.objects.filter(unread=True).count()
 
+    @allure.title('Test bulk assignment notifications are created with constant number of queries')
+    def test_notify_bulk_assign(
+        self,
+        mock_notifications_channel_layer,
+        default_notify_settings,
+        test_factory,
+        user_factory,
+        user,
+    ):
+        old_assignee, new_assignee, unsubscribed = user_factory(), user_factory(), user_factory()
+        for setting in NotificationSetting.objects.filter(pk__in=default_notify_settings):
+            setting.subscribers.add(old_assignee, new_assignee)
+        tests = [test_factory(assignee=old_assignee) for _ in range(5)]
+        tests.extend(test_factory(assignee=unsubscribed) for _ in range(5))
+        tests_mapping = {str(test.pk): test.assignee_id for test in tests}
+        with CaptureQueriesContext(connection) as context:
+            notify_bulk_assign(tests_mapping, new_assignee.pk, user.pk)
+        with allure.step('Validate number of queries does not depend on number of tests'):
+            assert len(context.captured_queries) == 6
+        with allure.step('Validate only subscribed users are notified'):
+            assert Notification.objects.filter(recipient=old_assignee).count() == 5
+            assert Notification.objects.filter(recipient=new_assignee).count() == len(tests)
+            assert not Notification.objects.filter(recipient=unsubscribed).exists()
+        notification = Notification.objects.filter(recipient=new_assignee, target_object_id=tests[0].pk).get()
+        assert notification.data['placeholder_text'] == f'Test {tests[0].case.name}'
+        assert notification.verb == f'{{{{placeholder}}}} was assigned to you by {user.username}'
+
     @pytest.mark.parametrize('unread', [True, False], ids=['unread', 'read'])
     def test_mark_as(
         self,
@@ -169,6 +200,39 @@ class TestNotificationEndpoints:
         with allure.step('Validate notifications were marked as unread'):
             assert Notification.objects.filter(unread=unread).count() == notifications_count
 
+    @allure.title('Test unread notifications counter is kept in cache')
+    def test_unread_count_cached(
+        self,
+        mock_notifications_channel_layer,
+        user,
+        user_factory,
+        authorized_client,
+        test,
+        notification_factory,
+    ):
+        notifications = [notification_factory(target=test, actor=user, recipient=user, unread=True) for _ in range(3)]
+        with allure.step('Count unread notifications in database on first read'):
+            assert NotificationService.unread_count(user.pk) == len(notifications)
+        with allure.step('Validate mark as read adjusts counter without counting in database'):
+            authorized_client.send_request(
+                self.view_name_mark_as,
+                data={'notifications': [notifications[0].pk], 'unread': False},
+                request_type=RequestType.POST,
+            )
+            with CaptureQueriesContext(connection) as context:
+                assert NotificationService.unread_count(user.pk) == len(notifications) - 1
+            assert not context.captured_queries
+        with allure.step('Validate reconciliation restores counter from database'):
+            Notification.objects.filter(recipient=user).update(unread=True)
+            other_user = user_factory()
+            notification_factory(target=test, actor=user, recipient=other_user, unread=True)
+            NotificationService.reconcile_unread_counts()
+            assert cache.get(f'notifications_unread_{user.pk}') is None, 'Stale counter must be dropped'
+            assert cache.get(f'notifications_unread_{other_user.pk}') is None, 'Uncached counter must not be set'
+            assert NotificationService.unread_count(user.pk) == len(notifications)
+            NotificationService.reconcile_unread_counts()
+            assert cache.get(f'notifications_unread_{user.pk}') == len(notifications), 'Valid counter must be kept'
+
     @allure.title('Test user does not have access to others notifications')
     def test_notifications_access(self, test, user_factory, notification_factory, api_client):
         user_seeing = user_factory()
@@ -34,6 +34,9 @@ from http import HTTPStatus
 import allure
 import pytest
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from tests.commons import RequestType
 from tests.constants import DETAIL_VIEW_NAMES, LIST_VIEW_NAMES
@@ -42,6 +45,7 @@ from testy.tests_representation.models import TestResult
 from testy.users.choices import UserAllowedPermissionCodenames
 from testy.users.models import Membership, Role, User
 from testy.users.selectors.permissions import PermissionSelector
+from testy.users.selectors.roles import RoleSelector
 
 
 @pytest.mark.django_db
@@ -683,6 +687,72 @@ class TestRolePermissions:
                 expected_status=HTTPStatus.OK,
             )
 
+    @allure.title('Test permission checks are served from cached permission matrix')
+    def test_permission_matrix_cached(self, project_factory, authorized_client, user, admin):
+        with allure.step('Create private project'):
+            project = project_factory(is_private=True)
+        with self._role(project, user, admin):
+            with CaptureQueriesContext(connection) as context:
+                for _ in range(2):
+                    assert not RoleSelector.restricted_project_access(user)
+                    assert RoleSelector.project_view_allowed(user, project)
+                    assert RoleSelector.action_allowed_for_instance(
+                        user,
+                        project,
+                        UserAllowedPermissionCodenames.CHANGE_PROJECT,
+                    )
+            assert len(context.captured_queries) == 1, 'Permission matrix must be compiled with single query'
+            with CaptureQueriesContext(connection) as context:
+                authorized_client.send_request(DETAIL_VIEW_NAMES['project'], reverse_kwargs={'pk': project.pk})
+            num_of_queries_cached = len(context.captured_queries)
+            cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                authorized_client.send_request(DETAIL_VIEW_NAMES['project'], reverse_kwargs={'pk': project.pk})
+            assert len(context.captured_queries) == num_of_queries_cached + 1
+
+    @allure.title('Test cached permission matrix is reset on role and membership changes')
+    def test_permission_matrix_invalidation(self, project_factory, authorized_client, user, role_factory):
+        with allure.step('Create private project'):
+            project = project_factory(is_private=True)
+        with allure.step('Create role allowed to view project only'):
+            role = role_factory(permissions=PermissionSelector.permission_by_codenames(['view_project']))
+        patch_kwargs = {
+            'view_name': DETAIL_VIEW_NAMES['project'],
+            'reverse_kwargs': {'pk': project.pk},
+            'request_type': RequestType.PATCH,
+            'data': {'name': 'New name'},
+        }
+        with self._role(project, user, role):
+            authorized_client.send_request(**patch_kwargs, expected_status=HTTPStatus.FORBIDDEN)
+            with allure.step('Grant change permission to role'):
+                role.permissions.add(*PermissionSelector.permission_by_codenames(['change_project']))
+            authorized_client.send_request(**patch_kwargs, expected_status=HTTPStatus.OK)
+            with allure.step('Revoke all permissions from role'):
+                role.permissions.clear()
+            authorized_client.send_request(**patch_kwargs, expected_status=HTTPStatus.FORBIDDEN)
+            role.permissions.add(*PermissionSelector.permission_by_codenames(['view_project']))
+            authorized_client.send_request(DETAIL_VIEW_NAMES['project'], reverse_kwargs={'pk': project.pk})
+        with allure.step('Validate access is revoked with membership'):
+            authorized_client.send_request(
+                DETAIL_VIEW_NAMES['project'],
+                reverse_kwargs={'pk': project.pk},
+                expected_status=HTTPStatus.FORBIDDEN,
+            )
+
+    @allure.title('Test cached permission matrix is reset on soft delete and restore of memberships')
+    def test_permission_matrix_invalidation_on_soft_delete(self, project_factory, authorized_client, user, admin):
+        with allure.step('Create private project'):
+            project = project_factory(is_private=True)
+        view_kwargs = {'view_name': DETAIL_VIEW_NAMES['project'], 'reverse_kwargs': {'pk': project.pk}}
+        with self._role(project, user, admin):
+            authorized_client.send_request(**view_kwargs)
+            with allure.step('Soft delete membership with queryset'):
+                Membership.objects.filter(project=project).delete()
+            authorized_client.send_request(**view_kwargs, expected_status=HTTPStatus.FORBIDDEN)
+            with allure.step('Restore membership with queryset'):
+                Membership.deleted_objects.filter(project=project).restore()
+            authorized_client.send_request(**view_kwargs)
+
     @contextmanager
     def _role(self, project: Project, user: User, role: Role):
         with allure.step(f'Sending request as user: {user} with role: {role} for {project}'):
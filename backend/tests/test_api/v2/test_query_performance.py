@@ -36,6 +36,7 @@ from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from tests import constants
+from testy.tests_representation.selectors.testplan import TestPlanSelector
 
 
 @pytest.mark.django_db
@@ -92,6 +93,7 @@ class TestNumberOfQueries:
         for _ in range(constants.NUMBER_OF_OBJECTS_TO_CREATE):
             project_factory()
         view_name_list = constants.LIST_VIEW_NAMES['project']
+        authorized_superuser_client.send_request(view_name_list)  # warm up cached permission matrix
         with CaptureQueriesContext(connection) as context:
             authorized_superuser_client.send_request(view_name_list)
             num_of_queries_initial = len(context.captured_queries)
@@ -111,7 +113,6 @@ class TestNumberOfQueries:
                                                                            f'is exceeding allowed maximum.\n' \
                                                                            f'Number of queries: "{num_of_queries}"'
 
-    @pytest.mark.skip('Increase queries for speed up statistic')
     def test_project_progress_queries(
         self, api_client, project, authorized_superuser, test_factory,
         test_result_factory, test_plan_factory,
@@ -155,3 +156,50 @@ class TestNumberOfQueries:
             second_num_of_queries = len(context.captured_queries)
         assert first_num_of_queries == second_num_of_queries, 'Number of queries grew with more instances'
         assert self.max_num_of_queries >= second_num_of_queries
+
+    def test_plan_progress_queries(self, authorized_superuser_client, project, test_factory, test_plan_factory):
+        root_plan = test_plan_factory(project=project)
+        num_of_queries = []
+        for _ in range(2):
+            child_plan = test_plan_factory(project=project, parent=root_plan)
+            for _ in range(constants.NUMBER_OF_OBJECTS_TO_CREATE):  # noqa: WPS440
+                test_factory(plan=test_plan_factory(project=project, parent=child_plan), project=project)
+            with CaptureQueriesContext(connection) as context:
+                authorized_superuser_client.send_request(
+                    'api:v2:testplan-progress',
+                    reverse_kwargs={'pk': root_plan.pk},
+                )
+            num_of_queries.append(len(context.captured_queries))
+        assert num_of_queries[0] == num_of_queries[1], 'Number of queries grew with more child plans'
+
+    def test_result_list_queries(
+        self, authorized_superuser_client, project, test_factory, test_result_with_steps_factory,
+    ):
+        test = test_factory(project=project)
+        num_of_queries = []
+        for _ in range(2):
+            for _ in range(constants.NUMBER_OF_OBJECTS_TO_CREATE):  # noqa: WPS440
+                test_result_with_steps_factory(test=test, project=project)
+            with CaptureQueriesContext(connection) as context:
+                authorized_superuser_client.send_request(
+                    'api:v2:testresult-list',
+                    query_params={'project': project.id, 'test': test.id},
+                )
+            num_of_queries.append(len(context.captured_queries))
+        assert num_of_queries[0] == num_of_queries[1], 'Number of queries grew with more step results'
+
+    def test_plan_breadcrumbs_queries(self, project, test_plan_factory):
+        parent = test_plan_factory(project=project)
+        plans = []
+        for _ in range(constants.NUMBER_OF_OBJECTS_TO_CREATE):
+            parent = test_plan_factory(project=project, parent=parent)
+            plans.append(parent)
+        with CaptureQueriesContext(connection) as context:
+            ids_to_breadcrumbs = TestPlanSelector.testplan_breadcrumbs_by_ids([plan.id for plan in plans])
+        assert len(context.captured_queries) == 1, 'Breadcrumbs are expected to be fetched with one query'
+        breadcrumbs = ids_to_breadcrumbs[plans[-1].id]
+        for plan in reversed(plans):
+            assert breadcrumbs['id'] == plan.id
+            assert breadcrumbs['title'] == plan.title
+            breadcrumbs = breadcrumbs['parent']
+        assert breadcrumbs['parent'] is None, 'Root plan is expected on top of breadcrumbs'
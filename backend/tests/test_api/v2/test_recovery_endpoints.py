@@ -30,12 +30,15 @@
 # <http://www.gnu.org/licenses/>.
 from copy import deepcopy
 from http import HTTPStatus
+from unittest import mock
 
 import pytest
 
 from tests.commons import RequestType
 from testy.core.models import Project
-from testy.tests_description.models import TestCase, TestSuite
+from testy.core.services.subtree_jobs import SubtreeJobService
+from testy.core.tasks import run_subtree_job
+from testy.tests_description.models import TestCase, TestCaseVersions, TestSuite
 from testy.tests_representation.models import Test, TestPlan, TestResult
 
 
@@ -45,6 +48,10 @@ class TestRecovery:
     deleted_list_view = 'api:v2:{0}-deleted-list'
     recovery_view_name = 'api:v2:{0}-deleted-recover'
     delete_permanent_view_name = 'api:v2:{0}-deleted-remove'
+    delete_async_view_name = 'api:v2:{0}-delete-async'
+    delete_preview_view_name = 'api:v2:testcase-delete-preview'
+    recovery_async_view_name = 'api:v2:{0}-deleted-recover-async'
+    job_cancel_view_name = 'api:v2:job-cancel'
     remove_view_name = 'api:v2:remove-permanently'
     project_view_name_detail = 'api:v2:project-detail'
     case_view_name_detail = 'api:v2:testcase-detail'
@@ -119,6 +126,29 @@ class TestRecovery:
 
         self._validate_restored_objects(expected_objects)
 
+    def test_case_recovery_keeps_versions_index(self, api_client, authorized_superuser, test_case):
+        test_case.name = 'updated'
+        test_case.save()
+        versions = TestCaseVersions.objects.get(case=test_case)
+        preview = api_client.send_request(self.delete_preview_view_name, reverse_kwargs={'pk': test_case.id}).json()
+        verbose_names = {elem['verbose_name'] for elem in preview}
+        assert TestCaseVersions._meta.verbose_name not in verbose_names, 'Versions index was previewed'
+        api_client.send_request(
+            self.case_view_name_detail,
+            reverse_kwargs={'pk': test_case.id},
+            expected_status=HTTPStatus.NO_CONTENT,
+            request_type=RequestType.DELETE,
+        )
+        api_client.send_request(
+            self.recovery_view_name.format('testcase'),
+            data={'instance_ids': [test_case.id]},
+            request_type=RequestType.POST,
+        )
+        assert TestCase.objects.filter(pk=test_case.id).exists(), 'Test case was not restored'
+        restored_versions = TestCaseVersions.objects.get(case=test_case)
+        assert restored_versions.versions == versions.versions
+        assert restored_versions.current_version == versions.current_version
+
     @pytest.mark.parametrize(
         'instances_key, expected_objects_diff, model_key, detail_view, idxs_for_deletion',
         [
@@ -165,6 +195,121 @@ class TestRecovery:
         for model, _ in self.model_to_key:
             assert not model.deleted_objects.count()
 
+    @pytest.mark.parametrize(
+        'instances_key, expected_objects_diff, idxs_for_deletion',
+        [
+            ('project', [1, 11, 40, 400, 2, 1], [-1]),
+            ('testplan', [0, 1, 20, 200, 0, 0], [-1]),
+            ('testsuite', [0, 0, 40, 400, 2, 1], [-1]),
+            ('testcase', [0, 0, 40, 400, 2, 0], [-1, -2]),
+        ],
+        ids=['projects', 'plans', 'suites', 'several cases'],
+    )
+    def test_data_cascade_recovery_async(
+        self, api_client, authorized_superuser, data_for_cascade_tests_behaviour,
+        instances_key, expected_objects_diff, idxs_for_deletion,
+    ):
+        expected_objects, objects_count = data_for_cascade_tests_behaviour
+        instance_ids = [expected_objects[instances_key][idx].id for idx in idxs_for_deletion]
+        for instance_id in instance_ids:
+            result = self._run_job(
+                api_client,
+                self.delete_async_view_name.format(instances_key),
+                reverse_kwargs={'pk': instance_id},
+                request_type=RequestType.DELETE,
+            )
+            assert not result['cancelled']
+
+        for (model, key), objects_number_diff in zip(self.model_to_key, expected_objects_diff):
+            assert model.objects.count() == objects_count[key] - objects_number_diff, \
+                f'Count of objects of model {model} did not match expected'
+        result = self._run_job(
+            api_client,
+            self.recovery_async_view_name.format(instances_key),
+            data={'instance_ids': instance_ids},
+            request_type=RequestType.POST,
+        )
+        assert not result['cancelled']
+
+        for model, key in self.model_to_key:
+            assert model.objects.count() == objects_count[key], f'Objects with model {model} were not restored'
+        self._validate_restored_objects(expected_objects)
+
+    def test_subtree_job_in_small_chunks(self, api_client, authorized_superuser, project, test_plan_factory):
+        root = test_plan_factory(project=project)
+        plans = [root]
+        for _ in range(2):
+            plans.extend(test_plan_factory(project=project, parent=parent) for parent in plans[-2:])
+        plan_ids = [plan.id for plan in plans]
+        with mock.patch.object(SubtreeJobService, 'chunk_size', 2):
+            result = self._run_job(
+                api_client,
+                self.delete_async_view_name.format('testplan'),
+                reverse_kwargs={'pk': root.id},
+                request_type=RequestType.DELETE,
+            )
+            assert result == {'processed': len(plans), 'cancelled': False}
+            assert not TestPlan.objects.filter(pk__in=plan_ids).exists(), 'Whole subtree must be deleted'
+            result = self._run_job(
+                api_client,
+                self.recovery_async_view_name.format('testplan'),
+                data={'instance_ids': [root.id]},
+                request_type=RequestType.POST,
+            )
+        assert result == {'processed': len(plans), 'cancelled': False}
+        assert TestPlan.objects.filter(pk__in=plan_ids).count() == len(plans), 'Whole subtree must be restored'
+
+    def test_cancelled_job(self, api_client, authorized_superuser, data_for_cascade_tests_behaviour):
+        expected_objects, objects_count = data_for_cascade_tests_behaviour
+        with mock.patch('testy.root.mixins.run_subtree_job.apply_async') as apply_mock:
+            task_id = api_client.send_request(
+                self.delete_async_view_name.format('project'),
+                reverse_kwargs={'pk': expected_objects['project'][-1].id},
+                request_type=RequestType.DELETE,
+                expected_status=HTTPStatus.ACCEPTED,
+            ).json()['task_id']
+        api_client.send_request(
+            self.job_cancel_view_name,
+            reverse_kwargs={'task_id': task_id},
+            request_type=RequestType.POST,
+            expected_status=HTTPStatus.NO_CONTENT,
+        )
+        result = run_subtree_job.apply(kwargs=apply_mock.call_args.kwargs['kwargs'], task_id=task_id).get()
+        assert result == {'processed': 0, 'cancelled': True}
+        for model, key in self.model_to_key:
+            assert model.objects.count() == objects_count[key], f'Objects with model {model} were deleted'
+        api_client.send_request(
+            self.job_cancel_view_name,
+            reverse_kwargs={'task_id': task_id},
+            request_type=RequestType.POST,
+            expected_status=HTTPStatus.NOT_FOUND,
+        )
+
+    def test_job_cancel_by_other_user(self, user, api_client, authorized_superuser):
+        SubtreeJobService.register('foreign-task-id', user.pk)
+        assert not SubtreeJobService.cancel('foreign-task-id', authorized_superuser.pk)
+        assert not SubtreeJobService.is_cancelled('foreign-task-id')
+        api_client.send_request(
+            self.job_cancel_view_name,
+            reverse_kwargs={'task_id': 'foreign-task-id'},
+            request_type=RequestType.POST,
+            expected_status=HTTPStatus.NO_CONTENT,
+        )
+        assert SubtreeJobService.is_cancelled('foreign-task-id')
+
+    @classmethod
+    def _run_job(cls, api_client, view_name, **request_kwargs):
+        with mock.patch('testy.root.mixins.run_subtree_job.apply_async') as apply_mock:
+            response_body = api_client.send_request(
+                view_name,
+                expected_status=HTTPStatus.ACCEPTED,
+                **request_kwargs,
+            ).json()
+        task_id = apply_mock.call_args.kwargs['task_id']
+        assert response_body['task_id'] == task_id
+        assert response_body['progress_url'].endswith(f'/{task_id}/')
+        return run_subtree_job.apply(kwargs=apply_mock.call_args.kwargs['kwargs'], task_id=task_id).get()
+
     def _validate_restored_objects(self, expected_objects):
         actual_objects = {
             'project': [],
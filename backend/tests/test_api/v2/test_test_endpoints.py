@@ -350,6 +350,32 @@ class TestTestEndpoints:
         actual_count = Test.objects.filter(pk__in=affected_tests_pks, **payload).count()
         assert actual_count == expected_count
 
+    def test_bulk_update_tests_history(
+        self,
+        api_client,
+        authorized_superuser,
+        project,
+        test_plan_factory,
+        test_factory,
+        user,
+    ):
+        plan = test_plan_factory(project=project)
+        tests = [test_factory(project=project, plan=plan) for _ in range(constants.NUMBER_OF_OBJECTS_TO_CREATE)]
+        with mock.patch('testy.root.celery.app.send_task') as send_task:
+            response_body = api_client.send_request(
+                self.view_name_bulk_update,
+                {'current_plan': plan.pk, 'assignee': user.pk},
+                HTTPStatus.OK,
+                RequestType.PUT,
+            ).json()
+        expected = [{'id': test.pk, 'plan': plan.pk, 'assignee': user.pk} for test in tests]
+        assert response_body == expected
+        history = Test.history.filter(history_type='~', history_change_reason='Bulk update tests')
+        assert history.count() == len(tests)
+        assert set(history.values_list('assignee', 'history_user')) == {(user.pk, authorized_superuser.pk)}
+        old_assignees = send_task.call_args.kwargs['args'][0]
+        assert old_assignees == {test.pk: test.assignee_id for test in tests}
+
     @mock.patch('testy.root.celery.app.send_task', new=Mock())
     def test_bulk_update_plan_forbidden(
         self,
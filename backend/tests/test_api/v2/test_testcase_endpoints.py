@@ -36,7 +36,9 @@ from http import HTTPStatus
 import allure
 import pytest
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
 
 from tests import constants
 from tests.commons import CustomAPIClient, RequestType, model_to_dict_via_serializer
@@ -54,6 +56,7 @@ from tests.mock_serializers.v2 import TestCaseListMockSerializer, TestCaseMockSe
 from testy.core.models import Attachment, Label, LabeledItem
 from testy.tests_description.api.v2.serializers import TestCaseHistorySerializer, TestCaseRetrieveSerializer
 from testy.tests_description.models import TestCase, TestCaseStep
+from testy.tests_description.services.cases import TestCaseService
 from testy.utilities.string import join_iterable
 
 _ERRORS = 'errors'
@@ -134,6 +137,23 @@ class TestCaseEndpoints:
         with allure.step('Validate response body'):
             assert expected_count == len(response_body[0].get('test_cases')), 'Found more cases than expected'
 
+    def test_cases_search_sibling_order(self, superuser_client, test_case_factory, test_suite_factory, project):
+        root = test_suite_factory(project=project, name='root')
+        suites = [test_suite_factory(project=project, parent=root, name=name) for name in ('c', 'a', 'b')]
+        nested = test_suite_factory(project=project, parent=suites[1], name='z')
+        for suite in (*suites, nested):
+            test_case_factory(project=project, suite=suite, name=f'case {suite.name}')
+        response_body = superuser_client.send_request(
+            self.view_name_search,
+            query_params={'search': 'case', 'project': project.pk},
+        ).json()
+        assert [suite['name'] for suite in response_body] == ['root']
+        children = response_body[0]['children']
+        assert [suite['name'] for suite in children] == ['a', 'b', 'c'], 'Siblings must be sorted by name'
+        assert [suite['name'] for suite in children[0]['children']] == ['z']
+        for suite in (*children, children[0]['children'][0]):
+            assert [case['name'] for case in suite['test_cases']] == [f'case {suite["name"]}']
+
     @allure.title('Test case creation')
     def test_creation(self, superuser_client, project, test_suite):
         expected_number_of_cases = 1
@@ -1218,6 +1238,54 @@ class TestCaseWithStepsEndpoints:
             assert len(actual_data['steps']) == len(old_steps) + number_of_steps, \
                 'New steps were not added.'
 
+    @allure.title('Test steps sync keeps case versions')
+    def test_update_steps_versions(self, superuser_client, test_case_with_steps):
+        update_dict = model_to_dict_via_serializer(
+            test_case_with_steps,
+            TestCaseMockSerializer,
+            nested_fields=['steps'],
+            nested_fields_simple_list=['versions'],
+        )
+        update_dict['suite'] = update_dict['suite']['id']
+        removed_step = update_dict['steps'].pop(0)
+        update_dict['steps'].append({'name': 'New step', 'scenario': constants.SCENARIO})
+        superuser_client.send_request(
+            self.view_name_detail,
+            data=update_dict,
+            reverse_kwargs={'pk': update_dict['id']},
+            request_type=RequestType.PUT,
+        )
+        version = test_case_with_steps.history.first().history_id
+        with allure.step('Validate steps are bound to the new case version'):
+            assert set(test_case_with_steps.steps.values_list('test_case_history_id', flat=True)) == {version}
+            assert TestCaseStep.history.filter(test_case_history_id=version).count() == len(update_dict['steps'])
+        with allure.step('Validate removed step is deleted with the new case version'):
+            deleted_step = TestCaseStep.deleted_objects.get(pk=removed_step['id'])
+            assert deleted_step.test_case_history_id == version
+
+    @allure.title('Test steps sync query count does not depend on steps number')
+    def test_update_steps_queries(self, test_case_with_steps, test_case_step_factory, user):
+        steps = list(test_case_with_steps.steps.all())
+        queries_count = []
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as context:
+                TestCaseService().case_with_steps_update(
+                    test_case_with_steps,
+                    {
+                        'user': user,
+                        'steps': [{'id': step.id, 'name': step.name, 'scenario': step.scenario} for step in steps],
+                    },
+                )
+            queries_count.append(len(context))
+            steps.extend(
+                test_case_step_factory.create_batch(
+                    constants.NUMBER_OF_OBJECTS_TO_CREATE,
+                    project=test_case_with_steps.project,
+                    test_case=test_case_with_steps,
+                ),
+            )
+        assert queries_count[0] == queries_count[1], 'Number of queries depends on number of steps'
+
     @allure.title('Validate patch request not allowed')
     def test_patch_not_allowed(self, superuser_client, test_case):
         superuser_client.send_request(
@@ -1633,3 +1701,20 @@ class TestCaseFilter:
             },
         ).json()
         assert response['count'] == 2
+
+    def test_search_ranking(self, superuser_client, test_case_factory, project):
+        partial_matches = [
+            test_case_factory(project=project, name=f'Login form {suffix}') for suffix in ('validation', 'layout')
+        ]
+        exact_match = test_case_factory(project=project, name='Login form')
+        response = superuser_client.send_request(
+            self.view_name_list,
+            query_params={'project': project.id, 'search': 'login form'},
+        ).json()
+        assert [case['id'] for case in response['results']][0] == exact_match.id, 'Closest match must be first'
+        assert response['count'] == len(partial_matches) + 1
+        response = superuser_client.send_request(
+            self.view_name_list,
+            query_params={'project': project.id, 'search': 'login form', 'ordering': 'id'},
+        ).json()
+        assert [case['id'] for case in response['results']] == [*[case.id for case in partial_matches], exact_match.id]
@@ -36,6 +36,7 @@ from http import HTTPStatus
 from operator import attrgetter
 from typing import Any, Iterable
 from unittest import mock
+from urllib.parse import parse_qs, urlparse
 
 import allure
 import pytest
@@ -58,6 +59,7 @@ from testy.tests_description.models import TestCase
 from testy.tests_representation.choices import TestStatuses
 from testy.tests_representation.models import Test, TestPlan, TestResult
 from testy.tests_representation.selectors.status import ResultStatusSelector
+from testy.tests_representation.tasks import copy_plans
 from testy.tests_representation.validators import TestPlanCasesValidator
 from testy.utilities.sql import get_max_level
 from testy.utilities.tree import form_tree_prefetch_objects
@@ -77,6 +79,8 @@ class TestPlanEndpoints:
     view_name_histogram = 'api:v2:testplan-histogram'
     view_name_project_histogram = 'api:v2:project-testplan-histogram'
     view_name_copy = 'api:v2:testplan-copy'
+    view_name_copy_async = 'api:v2:testplan-copy-async'
+    view_name_progress = 'api:v2:testplan-progress'
     view_name_labels = 'api:v2:testplan-labels'
     view_name_union = 'api:v2:testplan-union'
 
@@ -1114,7 +1118,8 @@ class TestPlanEndpoints:
             if idx % 2:
                 test = test_factory(project=project, plan=plan)
                 result = test_result_factory(test=test, project=project)
-                assert test.last_status.id == result.id, 'Last status was not set'
+                test.refresh_from_db()
+                assert test.last_status.id == result.status.id, 'Last status was not set'
                 tests_to_copy.append(test)
             else:
                 test_factory(project=project, plan=plan, is_archive=True)
@@ -1232,6 +1237,49 @@ class TestPlanEndpoints:
         plan_to_copy.refresh_from_db()
         assert plan_to_copy.get_descendants(include_self=False).count()
 
+    def test_plan_copying_async(
+        self,
+        superuser_client,
+        superuser,
+        project,
+        test_plan_factory,
+        test_plan_with_parameters_factory,
+        test_factory,
+    ):
+        root_plan = test_plan_with_parameters_factory(project=project)
+        child_plans = [test_plan_with_parameters_factory(project=project, parent=root_plan) for _ in range(2)]
+        grandchild_plan = test_plan_factory(project=project, parent=child_plans[0])
+        for plan in (root_plan, *child_plans, grandchild_plan):
+            test_factory(project=project, plan=plan)
+        test_factory(project=project, plan=grandchild_plan, is_archive=True)
+        payload = {'plans': [{'plan': root_plan.pk, 'new_name': 'Copied plan'}], 'keep_assignee': True}
+        task_kwargs = {'plans': payload['plans'], 'dst_plan_id': None, 'keep_assignee': True, 'user_id': superuser.pk}
+        with mock.patch('testy.tests_representation.api.v2.views.copy_plans.delay') as delay_mock:
+            delay_mock.return_value.id = 'copy-task-id'
+            response_body = superuser_client.send_request(
+                self.view_name_copy_async,
+                request_type=RequestType.POST,
+                data=payload,
+                expected_status=HTTPStatus.ACCEPTED,
+            ).json()
+        delay_mock.assert_called_once_with(**task_kwargs)
+        assert response_body['task_id'] == 'copy-task-id'
+        assert response_body['progress_url'].endswith('/copy-task-id/')
+
+        copied_plan_ids = copy_plans.apply(kwargs=task_kwargs).get()
+        copied_root = TestPlan.objects.get(pk__in=copied_plan_ids, name='Copied plan')
+        assert copied_root.parent is None
+        copied_tree = {plan.name: plan for plan in copied_root.get_descendants()}
+        assert len(copied_tree) + 1 == len(copied_plan_ids) == 4
+        for src_plan in root_plan.get_descendants(include_self=True):
+            copied_plan = copied_tree.get(src_plan.name, copied_root)
+            assert copied_plan.tree_id == copied_root.pk
+            if src_plan.parent_id != root_plan.pk and src_plan != root_plan:
+                assert copied_plan.parent.name == src_plan.parent.name, 'Plan hierarchy was not preserved'
+            assert set(copied_plan.parameters.all()) == set(src_plan.parameters.all())
+            assert copied_plan.tests.count() == src_plan.tests.filter(is_archive=False).count()
+        assert Test.history.filter(plan__in=copied_plan_ids, history_type='+', history_user=superuser).count() == 4
+
     def test_copy_plan_not_keeping_comments(
         self,
         superuser_client,
@@ -1559,6 +1607,79 @@ class TestPlanEndpoints:
             ).json_strip()
             assert child_plans[parent_id] == response_data
 
+    @allure.title('Test plan progress')
+    def test_plan_progress(self, test_plan_factory, test_factory, test_result_factory, project, superuser_client):
+        root_plan = test_plan_factory(project=project)
+        plan_with_results = test_plan_factory(project=project, parent=root_plan)
+        plan_without_results = test_plan_factory(project=project, parent=root_plan)
+        test_plan_factory(project=project, parent=root_plan, is_archive=True)
+        archived_child = test_plan_factory(project=project, parent=plan_with_results, is_archive=True)
+        test_factory(project=project, plan=archived_child)
+        test_factory(project=project, plan=plan_without_results)
+        for created_at, plan in (
+            (timezone.datetime(2000, 1, 2), plan_with_results),
+            (timezone.datetime(1999, 1, 2), test_plan_factory(project=project, parent=plan_with_results)),
+        ):
+            with mock.patch('django.utils.timezone.now', return_value=timezone.make_aware(created_at)):
+                test_result_factory(test=test_factory(project=project, plan=plan), project=project)
+        response_body = superuser_client.send_request(
+            self.view_name_progress,
+            reverse_kwargs={'pk': root_plan.pk},
+            query_params={'start_date': '2000-01-01T00:00:00', 'end_date': '2000-01-03T00:00:00'},
+        ).json()
+        progress = {
+            plan['id']: (plan['tests_total'], plan['tests_progress_period'], plan['tests_progress_total'])
+            for plan in response_body
+        }
+        assert progress == {plan_with_results.pk: (2, 2, 2), plan_without_results.pk: (1, 0, 0)}, \
+            'Plan progress for period must count tests with results outside of period as before'
+
+    @allure.title('Test plan union cursor pagination')
+    def test_plan_union_cursor_pagination(
+        self,
+        test_plan_factory,
+        test_factory,
+        test_case_factory,
+        project,
+        authorized_superuser_client,
+    ):
+        root_plan = test_plan_factory(project=project)
+        for idx in range(5):
+            test_plan_factory(project=project, parent=root_plan, name=str(idx % 2))
+            test_factory(project=project, plan=root_plan, case=test_case_factory(name=str(idx % 2)))
+        query_params = {'project': project.pk, 'parent': root_plan.pk}
+        with allure.step('Get whole union with page number pagination'):
+            expected_data = authorized_superuser_client.send_request(
+                self.view_name_union,
+                query_params=query_params,
+            ).json_strip()
+        cursor_data = []
+        cursor = ''
+        with allure.step('Get union page by page with cursor pagination'):
+            while cursor is not None:
+                response_body = authorized_superuser_client.send_request(
+                    self.view_name_union,
+                    query_params={**query_params, 'cursor': cursor, 'page_size': 3},
+                ).json()
+                assert response_body['count'] is None
+                assert len(response_body['results']) <= 3
+                cursor_data.extend(response_body['results'])
+                next_link = response_body['links']['next']
+                cursor = parse_qs(urlparse(next_link).query)['cursor'][0] if next_link else None
+        assert [(elem['is_leaf'], elem['id']) for elem in expected_data] == [
+            (elem['is_leaf'], elem['id']) for elem in cursor_data
+        ]
+        authorized_superuser_client.send_request(
+            self.view_name_union,
+            query_params={**query_params, 'cursor': 'invalid'},
+            expected_status=HTTPStatus.NOT_FOUND,
+        )
+        authorized_superuser_client.send_request(
+            self.view_name_union,
+            query_params={**query_params, 'cursor': '', 'ordering': 'id'},
+            expected_status=HTTPStatus.BAD_REQUEST,
+        )
+
     @pytest.mark.parametrize('descending', [True, False], ids=['Descending', 'Ascending'])
     @pytest.mark.parametrize('order_by', ['id', 'started_at', 'created_at', 'name', 'assignee_username', 'suite_path'])
     def test_plan_union_order_by_filter(
@@ -29,9 +29,12 @@
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
 from http import HTTPStatus
+from unittest import mock
 
+import orjson
 import pytest
 from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
 from django.utils import timezone
 
 from tests import constants, error_messages
@@ -46,7 +49,10 @@ from tests.error_messages import (
 )
 from testy.core.choices import CustomFieldType
 from testy.tests_representation.api.v2.serializers import TestResultSerializer
-from testy.tests_representation.models import TestResult
+from testy.tests_representation.models import Test, TestResult
+from testy.tests_representation.services.results import TestResultService
+from testy.tests_representation.services.statistics import TestPlanStatisticsService
+from testy.tests_representation.signals import pre_create_result
 
 _ERRORS = 'errors'
 
@@ -58,6 +64,7 @@ class TestResultEndpoints:
     project_view_name_detail = 'api:v2:project-detail'
     plan_view_name_detail = 'api:v2:testplan-detail'
     view_name_attributes = 'api:v2:testresult-attributes'
+    view_name_ingest = 'api:v2:testresult-ingest'
 
     def test_list(self, api_client, authorized_superuser, test_result_factory, project, result_status_factory):
         test_results = []
@@ -774,3 +781,90 @@ class TestResultEndpoints:
             query_params=query_params,
         )
         assert response.json()['errors'][0] == ATTRIBUTES_PARAMETER_NOT_PASSED
+
+    def test_ingest(self, api_client, authorized_superuser, project, test_factory, result_status_factory):
+        tests = [test_factory(project=project) for _ in range(constants.NUMBER_OF_OBJECTS_TO_CREATE)]
+        archived_test = test_factory(project=project, is_archive=True)
+        other_project_test = test_factory()
+        passed, failed = result_status_factory(project=project), result_status_factory(project=project)
+        records = [{'test': test.pk, 'status': passed.pk, 'attributes': {'run': 1}} for test in tests]
+        records.append({'test': tests[0].pk, 'status': failed.pk, 'comment': constants.TEST_COMMENT})
+        invalid_records = [
+            {'test': archived_test.pk, 'status': passed.pk},
+            {'test': other_project_test.pk, 'status': passed.pk},
+            {'test': tests[1].pk, 'status': result_status_factory().pk},
+            {'test': tests[1].pk, 'status': passed.pk, 'execution_time': 'fast'},
+            {'status': passed.pk},
+        ]
+        lines = [orjson.dumps(record) for record in records + invalid_records]
+        lines.append(b'{not a json')
+        with mock.patch.object(pre_create_result, 'send', wraps=pre_create_result.send) as signal_send:
+            response = api_client.post(
+                f'{reverse(self.view_name_ingest)}?project={project.pk}',
+                data=b'\n'.join(lines),
+                content_type='application/x-ndjson',
+            )
+        assert response.status_code == HTTPStatus.OK, response.content
+        report = response.json()
+        assert report['created'] == len(records)
+        assert signal_send.call_count == len(records), 'Pre create signal was sent for discarded records'
+        for signal_call in signal_send.call_args_list:
+            assert isinstance(signal_call.kwargs['data']['test'], Test)
+            assert signal_call.kwargs['data']['status'] in {passed, failed}
+        error_lines = [error['line'] for error in report[_ERRORS]]
+        assert error_lines == list(range(len(records) + 1, len(lines) + 1))
+        assert TestResult.objects.count() == len(records)
+        assert TestResult.history.filter(history_type='+').count() == len(records)
+        assert set(TestResult.objects.values_list('user', flat=True)) == {authorized_superuser.pk}
+        assert not TestResult.objects.filter(test_case_version__isnull=True).exists()
+        assert Test.objects.get(pk=tests[0].pk).last_status == failed
+        assert Test.objects.get(pk=tests[1].pk).last_status == passed
+        assert not TestPlanStatisticsService.verify(project.pk), 'Plan statistics diverged after ingestion'
+
+    def test_ingest_required_attributes(
+        self, api_client, authorized_superuser, project, test_factory, result_status_factory, custom_attribute_factory,
+    ):
+        status = result_status_factory(project=project)
+        custom_attribute = custom_attribute_factory(
+            project=project,
+            applied_to={'testresult': {'is_required': True, 'status_specific': [status.pk]}},
+        )
+        test = test_factory(project=project)
+        records = [
+            {'test': test.pk, 'status': status.pk, 'attributes': {custom_attribute.name: 'value'}},
+            {'test': test.pk, 'status': status.pk},
+            {'test': test.pk, 'status': status.pk, 'attributes': {custom_attribute.name: ''}},
+        ]
+        with mock.patch.object(pre_create_result, 'send', wraps=pre_create_result.send) as signal_send:
+            response = api_client.post(
+                f'{reverse(self.view_name_ingest)}?project={project.pk}',
+                data=b'\n'.join(orjson.dumps(record) for record in records),
+                content_type='application/x-ndjson',
+            )
+        assert response.status_code == HTTPStatus.OK, response.content
+        report = response.json()
+        assert report['created'] == 1
+        assert [error['line'] for error in report[_ERRORS]] == [2, 3]
+        assert signal_send.call_count == 1, 'Pre create signal was not sent for ingested result'
+        assert TestResult.objects.get().attributes == {custom_attribute.name: 'value'}
+
+    def test_ingest_twice_in_transaction(self, project, user, test_factory, result_status_factory):
+        test = test_factory(project=project)
+        status = result_status_factory(project=project)
+        for _ in range(2):
+            created, errors = TestResultService.result_bulk_ingest(
+                project,
+                [(1, {'test': test.pk, 'status': status.pk, 'comment': '', 'execution_time': None, 'attributes': {}})],
+                user,
+            )
+            assert (created, errors) == (1, [])
+        assert TestResult.objects.filter(test=test).count() == 2
+
+    def test_ingest_archived_project_forbidden(self, api_client, authorized_superuser, project_factory):
+        project = project_factory(is_archive=True)
+        response = api_client.post(
+            f'{reverse(self.view_name_ingest)}?project={project.pk}',
+            data=b'',
+            content_type='application/x-ndjson',
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
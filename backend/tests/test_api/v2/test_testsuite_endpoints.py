@@ -34,6 +34,7 @@ from collections import defaultdict
 from copy import deepcopy
 from http import HTTPStatus
 from typing import Any, Iterable
+from urllib.parse import parse_qs, urlparse
 
 import allure
 import pytest
@@ -330,8 +331,8 @@ class TestSuiteEndpoints:
             self._validate_copied_objects(
                 attachments_section_2,
                 copied_attachments_sec_2,
-                changed_attr_names=['id', 'object_id', 'content_object', 'file'],
-                copied_attr_names=['name', 'filename', 'file_extension', 'size', 'content_type', 'comment'],
+                changed_attr_names=['id', 'object_id', 'content_object'],
+                copied_attr_names=['name', 'filename', 'file_extension', 'size', 'content_type', 'comment', 'file'],
                 project_id_changed=is_project_specified,
             )
         with allure.step('Validate steps copied in suite section_2'):
@@ -347,8 +348,8 @@ class TestSuiteEndpoints:
             self._validate_copied_objects(
                 attachments_steps_section_2,
                 copied_attachments_steps_sec_2,
-                changed_attr_names=['id', 'object_id', 'content_object', 'file'],
-                copied_attr_names=['name', 'filename', 'file_extension', 'size', 'content_type', 'comment'],
+                changed_attr_names=['id', 'object_id', 'content_object'],
+                copied_attr_names=['name', 'filename', 'file_extension', 'size', 'content_type', 'comment', 'file'],
                 project_id_changed=is_project_specified,
             )
 
@@ -522,6 +523,35 @@ class TestSuiteEndpoints:
             ).json_strip()
             assert child_suites[parent_id] == response_data
 
+    @allure.title('Test suite union cursor pagination')
+    def test_suite_union_cursor_pagination(
+        self,
+        test_suite_factory,
+        test_case_factory,
+        project,
+        authorized_superuser_client,
+    ):
+        root_suite = test_suite_factory(project=project)
+        for idx in range(5):
+            test_suite_factory(project=project, parent=root_suite, name=str(idx % 2))
+            test_case_factory(project=project, suite=root_suite, name=str(idx % 2))
+        query_params = {'project': project.pk, 'parent': root_suite.pk}
+        expected_data = authorized_superuser_client.send_request(
+            self.view_name_union,
+            query_params=query_params,
+        ).json_strip()
+        cursor_data = []
+        cursor = ''
+        while cursor is not None:
+            response_body = authorized_superuser_client.send_request(
+                self.view_name_union,
+                query_params={**query_params, 'cursor': cursor, 'page_size': 4},
+            ).json()
+            cursor_data.extend(response_body['results'])
+            next_link = response_body['links']['next']
+            cursor = parse_qs(urlparse(next_link).query)['cursor'][0] if next_link else None
+        assert expected_data == cursor_data
+
     @pytest.mark.parametrize('descending', [True, False], ids=['Descending', 'Ascending'])
     @pytest.mark.parametrize('order_by', ['id', 'created_at', 'name'])
     def test_suite_union_order_by_filter(
@@ -31,12 +31,21 @@
 from http import HTTPStatus
 
 import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from tests import constants
 from tests.commons import RequestType
+from testy.root.auth.auth_classes import TokenAuthenticationTTL
 from testy.root.auth.models import TTLToken
 
+_AUTH_HEADER = 'Token {token}'
+_VIEW_NAME_LIST = 'api:v2:project-list'
+
+UserModel = get_user_model()
+
 
 @pytest.mark.django_db
 class TestTokens:
@@ -109,6 +118,32 @@ class TestTokens:
             additional_error_msg='User could get private token info',
         )
 
+    def test_token_cached(self, api_client, user):
+        token = self.get_token(api_client, user.username, constants.PASSWORD)
+        headers = {'HTTP_AUTHORIZATION': _AUTH_HEADER.format(token=token)}
+        stats_before = TokenAuthenticationTTL.cache_stats()
+        api_client.send_request(_VIEW_NAME_LIST, headers=headers)
+        with CaptureQueriesContext(connection) as context:
+            api_client.send_request(_VIEW_NAME_LIST, headers=headers)
+        token_queries = [query for query in context.captured_queries if TTLToken._meta.db_table in query['sql']]
+        assert not token_queries, 'Token was fetched from database instead of cache'
+        assert TokenAuthenticationTTL.cache_stats() == {
+            'hits': stats_before['hits'] + 1,
+            'misses': stats_before['misses'] + 1,
+        }
+        assert token not in TokenAuthenticationTTL.token_cache_key(token), 'Raw token must not be used as cache key'
+
+    def test_cached_token_invalidation(self, api_client, user):
+        token = self.get_token(api_client, user.username, constants.PASSWORD)
+        headers = {'HTTP_AUTHORIZATION': _AUTH_HEADER.format(token=token)}
+        api_client.send_request(_VIEW_NAME_LIST, headers=headers)
+        UserModel.objects.filter(pk=user.pk).update(is_active=False)
+        api_client.send_request(_VIEW_NAME_LIST, headers=headers, expected_status=HTTPStatus.UNAUTHORIZED)
+        UserModel.objects.filter(pk=user.pk).update(is_active=True)
+        api_client.send_request(_VIEW_NAME_LIST, headers=headers)
+        TTLToken.objects.filter(key=token).delete()
+        api_client.send_request(_VIEW_NAME_LIST, headers=headers, expected_status=HTTPStatus.UNAUTHORIZED)
+
     @classmethod
     def get_token(cls, api_client, username, password):
         response = api_client.send_request(
@@ -0,0 +1,86 @@
+# TestY TMS - Test Management System
+# Copyright (C) 2024 KNS Group LLC (YADRO)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Also add information on how to contact you by electronic and paper mail.
+#
+# If your software can interact with users remotely through a computer
+# network, you should also make sure that it provides a way for users to
+# get its source.  For example, if your program is a web application, its
+# interface could display a "Source" link that leads users to an archive
+# of the code.  There are many ways you could offer source, and different
+# solutions will be better for different programs; see section 13 for the
+# specific requirements.
+#
+# You should also get your employer (if you work as a programmer) or school,
+# if any, to sign a "copyright disclaimer" for the program, if necessary.
+# For more information on this, and how to apply and follow the GNU AGPL, see
+# <http://www.gnu.org/licenses/>.
+import pytest
+from django.core.management import call_command
+
+from testy.tests_representation.models import Test, TestPlanStatistics
+from testy.tests_representation.services.statistics import TestPlanStatisticsService
+
+
+@pytest.mark.django_db
+class TestPlanStatisticsModel:
+
+    def test_statistics_follow_test_changes(
+        self,
+        project,
+        test_plan_factory,
+        test_factory,
+        test_case_factory,
+        test_result_factory,
+        result_status_factory,
+    ):
+        plan = test_plan_factory(project=project)
+        other_plan = test_plan_factory(project=project)
+        status = result_status_factory(project=project)
+        tests = [
+            test_factory(project=project, plan=plan, case=test_case_factory(project=project, estimate=estimate))
+            for estimate in (60, 120, None)
+        ]
+        test_result_factory(project=project, test=tests[0], status=status)
+        assert not TestPlanStatisticsService.verify(), 'Statistics diverged after results creation'
+
+        tests[1].case.estimate = 600
+        tests[1].case.save()
+        tests[2].is_archive = True
+        tests[2].save()
+        assert not TestPlanStatisticsService.verify(), 'Statistics diverged after estimate and archive update'
+
+        Test.objects.filter(pk=tests[0].pk).update(plan=other_plan)
+        Test.objects.filter(pk=tests[1].pk).delete()
+        assert not TestPlanStatisticsService.verify(), 'Statistics diverged after move and soft delete'
+
+        Test.deleted_objects.filter(pk=tests[1].pk).restore()
+        tests[2].hard_delete()
+        assert not TestPlanStatisticsService.verify(), 'Statistics diverged after restore and hard delete'
+
+        plan_rows = TestPlanStatistics.objects.filter(plan=plan, tests_count__gt=0)
+        assert plan_rows.count() == 1
+        assert plan_rows.get().estimates_sum == 600
+
+    def test_rebuild_command(self, project, test_factory, test_plan_factory):
+        plan = test_plan_factory(project=project)
+        for _ in range(3):
+            test_factory(project=project, plan=plan)
+        TestPlanStatistics.objects.all().delete()
+        assert TestPlanStatisticsService.verify(), 'Verification did not detect missing statistics'
+        call_command('plan_statistics', project_id=project.id)
+        assert not TestPlanStatisticsService.verify(project.id)
+        assert TestPlanStatistics.objects.get(plan=plan).tests_count == 3
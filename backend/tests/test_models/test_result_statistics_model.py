@@ -0,0 +1,112 @@
+# TestY TMS - Test Management System
+# Copyright (C) 2024 KNS Group LLC (YADRO)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Also add information on how to contact you by electronic and paper mail.
+#
+# If your software can interact with users remotely through a computer
+# network, you should also make sure that it provides a way for users to
+# get its source.  For example, if your program is a web application, its
+# interface could display a "Source" link that leads users to an archive
+# of the code.  There are many ways you could offer source, and different
+# solutions will be better for different programs; see section 13 for the
+# specific requirements.
+#
+# You should also get your employer (if you work as a programmer) or school,
+# if any, to sign a "copyright disclaimer" for the program, if necessary.
+# For more information on this, and how to apply and follow the GNU AGPL, see
+# <http://www.gnu.org/licenses/>.
+from datetime import timezone
+
+import pytest
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+from testy.tests_representation.models import Test, TestResult, TestResultDailyStatistics
+from testy.tests_representation.services.statistics import TestResultStatisticsService
+
+_BUCKET_FIELDS = ('project_id', 'plan_id', 'status_id', 'is_archive', 'day')
+
+
+def _expected_buckets():
+    rows = (
+        TestResult.objects
+        .annotate(day=TruncDate('created_at', tzinfo=timezone.utc))
+        .values('project_id', 'test__plan_id', 'status_id', 'is_archive', 'day')
+        .annotate(results_count=Count('id'))
+        .order_by()
+    )
+    return {
+        (row['project_id'], row['test__plan_id'], row['status_id'], row['is_archive'], row['day']): row['results_count']
+        for row in rows
+    }
+
+
+def _stored_buckets():
+    rows = (
+        TestResultDailyStatistics.objects
+        .values(*_BUCKET_FIELDS)
+        .annotate(total=Sum('results_count'))
+        .filter(total__gt=0)
+        .order_by()
+    )
+    return {tuple(row[field] for field in _BUCKET_FIELDS): row['total'] for row in rows}
+
+
+@pytest.mark.django_db
+class TestResultStatisticsModel:
+
+    def test_buckets_follow_result_changes(
+        self,
+        project,
+        test_plan_factory,
+        test_factory,
+        test_result_factory,
+        result_status_factory,
+    ):
+        plan = test_plan_factory(project=project)
+        other_plan = test_plan_factory(project=project)
+        passed, failed = result_status_factory(project=project), result_status_factory(project=project)
+        tests = [test_factory(project=project, plan=plan) for _ in range(3)]
+        results = [test_result_factory(project=project, test=test, status=passed) for test in tests]
+        test_result_factory(project=project, test=tests[0], status=failed)
+        assert _stored_buckets() == _expected_buckets(), 'Buckets diverged after results creation'
+
+        results[0].status = failed
+        results[0].save()
+        results[1].is_archive = True
+        results[1].save()
+        assert _stored_buckets() == _expected_buckets(), 'Buckets diverged after results update'
+
+        Test.objects.filter(pk=tests[0].pk).update(plan=other_plan)
+        TestResult.objects.filter(pk=results[2].pk).delete()
+        assert _stored_buckets() == _expected_buckets(), 'Buckets diverged after move and soft delete'
+
+        TestResult.deleted_objects.filter(pk=results[2].pk).restore()
+        results[1].hard_delete()
+        assert _stored_buckets() == _expected_buckets(), 'Buckets diverged after restore and hard delete'
+
+    def test_compaction(self, project, test_factory, test_result_factory, result_status_factory):
+        status = result_status_factory(project=project)
+        test = test_factory(project=project)
+        results = [test_result_factory(project=project, test=test, status=status) for _ in range(5)]
+        TestResult.objects.filter(pk=results[0].pk).delete()
+        expected = _stored_buckets()
+        assert TestResultDailyStatistics.objects.count() == 6
+
+        TestResultStatisticsService.compact()
+        assert _stored_buckets() == expected
+        bucket = TestResultDailyStatistics.objects.get()
+        assert bucket.results_count == 4
@@ -33,7 +33,7 @@ import pytest
 from django.db import IntegrityError
 
 from tests.error_messages import MODEL_VALUE_ERR_MSG, NOT_NULL_ERR_MSG
-from testy.tests_description.models import TestCase
+from testy.tests_description.models import TestCase, TestCaseVersions
 
 
 @pytest.mark.django_db
@@ -73,3 +73,14 @@ class TestCaseModel:
     def test_valid_model_creation(self, test_case):
         assert TestCase.objects.count() == 1
         assert TestCase.objects.get(id=test_case.id) == test_case
+
+    def test_versions_index_follows_history(self, test_case):
+        test_case.name = 'updated'
+        test_case.save()
+        history_ids = list(test_case.history.order_by('-history_id').values_list('history_id', flat=True))
+        index = TestCaseVersions.objects.get(case=test_case)
+        assert len(history_ids) == 2
+        assert index.versions == history_ids
+        assert index.current_version == history_ids[0]
+        test_case.hard_delete()
+        assert not TestCaseVersions.objects.filter(case_id=test_case.pk).exists()
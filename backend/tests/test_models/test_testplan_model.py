@@ -83,3 +83,61 @@ class TestPlanModel:
     def test_valid_model_creation(self, test_plan):
         assert TestPlan.objects.count() == 1
         assert TestPlan.objects.get(id=test_plan.id) == test_plan
+
+    def test_title_denormalized(self, test_plan_factory, parameter_factory):
+        plan = test_plan_factory(name='plan')
+        first_parameter = parameter_factory(data='b')
+        second_parameter = parameter_factory(data='a')
+        plan.refresh_from_db()
+        assert plan.title == 'plan'
+        assert not plan.parameter_ids
+        plan.parameters.add(first_parameter, second_parameter)
+        plan.refresh_from_db()
+        assert plan.title == 'plan [a, b]'
+        assert plan.parameter_ids == sorted([first_parameter.pk, second_parameter.pk])
+        first_parameter.data = 'c'
+        first_parameter.save()
+        plan.refresh_from_db()
+        assert plan.title == 'plan [a, c]'
+        plan.name = 'renamed'
+        plan.save()
+        plan.refresh_from_db()
+        assert plan.title == 'renamed [a, c]'
+        plan.parameters.remove(second_parameter)
+        plan.refresh_from_db()
+        assert plan.title == 'renamed [c]'
+        assert plan.parameter_ids == [first_parameter.pk]
+        assert list(TestPlan.objects.filter(parameter_ids__contains=[first_parameter.pk])) == [plan]
+
+    def test_plan_path_maintained(self, test_plan_factory, parameter_factory):
+        root = test_plan_factory(name='root')
+        child = test_plan_factory(name='child', parent=root)
+        grandchild = test_plan_factory(name='grandchild', parent=child)
+        other_root = test_plan_factory(name='other', project=root.project)
+        grandchild.refresh_from_db()
+        assert grandchild.plan_path == 'root/child/grandchild'
+        child.parameters.add(parameter_factory(data='param'))
+        grandchild.refresh_from_db()
+        assert grandchild.plan_path == 'root/child [param]/grandchild'
+        root.name = 'renamed'
+        root.save()
+        grandchild.refresh_from_db()
+        assert grandchild.plan_path == 'renamed/child [param]/grandchild'
+        child.refresh_from_db()
+        child.parent = other_root
+        child.save()
+        grandchild.refresh_from_db()
+        assert grandchild.plan_path == 'other/child [param]/grandchild'
+
+    def test_plan_path_not_overwritten_by_stale_instance(self, test_plan_factory):
+        root = test_plan_factory(name='root')
+        child = test_plan_factory(name='child', parent=root)
+        grandchild = test_plan_factory(name='grandchild', parent=child)
+        stale_child = TestPlan.objects.get(pk=child.pk)
+        root.name = 'renamed'
+        root.save()
+        stale_child.save()
+        stale_child.refresh_from_db()
+        grandchild.refresh_from_db()
+        assert stale_child.plan_path == 'renamed/child'
+        assert grandchild.plan_path == 'renamed/child/grandchild'
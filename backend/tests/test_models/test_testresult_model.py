@@ -32,9 +32,10 @@
 import pytest
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
+from django.utils import timezone
 
 from tests.error_messages import BOOL_VALUE_ERR_MSG, MODEL_VALUE_ERR_MSG, NOT_NULL_ERR_MSG
-from testy.tests_representation.models import TestResult
+from testy.tests_representation.models import Test, TestResult
 
 
 @pytest.mark.django_db
@@ -95,3 +96,37 @@ class TestResultModel:
     def test_valid_model_creation(self, test_result):
         assert TestResult.objects.count() == 1
         assert TestResult.objects.get(id=test_result.id) == test_result
+
+    def test_last_status_follows_latest_result(self, test, test_result_factory, result_status_factory):
+        passed, failed, retest = (result_status_factory(project=test.project) for _ in range(3))
+        latest_result = test_result_factory(test=test, project=test.project, status=passed)
+        test_result_factory(
+            test=test,
+            project=test.project,
+            status=failed,
+            created_at=timezone.now() - timezone.timedelta(days=1),
+        )
+        test.refresh_from_db()
+        assert test.last_status == passed, 'Result created out of order overwrote last status'
+
+        latest_result.status = retest
+        latest_result.save()
+        test.refresh_from_db()
+        assert test.last_status == retest
+
+        latest_result.delete()
+        test.refresh_from_db()
+        assert test.last_status == failed, 'Last status was not recalculated after latest result deletion'
+        assert not test.history.filter(history_type='~').exists(), 'Test history row was created by result write'
+
+    def test_last_status_bulk_create(self, test_factory, result_status_factory):
+        tests = [test_factory() for _ in range(3)]
+        statuses = [result_status_factory() for _ in range(2)]
+        TestResult.objects.bulk_create(
+            [
+                TestResult(test=test, project=test.project, status=status)
+                for test in tests
+                for status in statuses
+            ],
+        )
+        assert set(Test.objects.values_list('last_status', flat=True)) == {statuses[-1].pk}
@@ -83,3 +83,24 @@ class TestSuiteModel:
     def test_valid_model_creation(self, test_suite):
         assert TestSuite.objects.count() == 1
         assert TestSuite.objects.get(id=test_suite.id) == test_suite
+
+    def test_suite_path_maintained(self, test_suite_factory):
+        root = test_suite_factory(name='root')
+        child = test_suite_factory(name='child', parent=root)
+        grandchild = test_suite_factory(name='grandchild', parent=child)
+        other_root = test_suite_factory(name='other', project=root.project)
+        grandchild.refresh_from_db()
+        assert grandchild.suite_path == 'root/child/grandchild'
+        root.name = 'renamed'
+        root.save()
+        grandchild.refresh_from_db()
+        assert grandchild.suite_path == 'renamed/child/grandchild'
+        child.refresh_from_db()
+        child.parent = other_root
+        child.save()
+        grandchild.refresh_from_db()
+        assert grandchild.suite_path == 'other/child/grandchild'
+        child.parent = None
+        child.save()
+        grandchild.refresh_from_db()
+        assert grandchild.suite_path == 'child/grandchild'
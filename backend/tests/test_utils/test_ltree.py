@@ -32,9 +32,12 @@ from collections import defaultdict
 
 import allure
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from testy.root.ltree.querysets import LtreeQuerySet
 from testy.tests_representation.models import TestPlan
+from testy.utilities.tree import prefetch_tree
 
 
 @pytest.mark.django_db
@@ -196,3 +199,68 @@ class TestLtree:
         assert ancestors.count() == 1
         assert list(ancestors) == [root]
         assert ancestor not in list(ancestors)
+
+    @allure.title('Test descendants and ancestors of selection are fetched in a single query')
+    @pytest.mark.parametrize('method_name', ['get_descendants', 'get_ancestors'])
+    def test_selection_single_query(self, test_plan_factory, project, method_name):
+        parents = [test_plan_factory(project=project) for _ in range(3)]
+        nodes = [test_plan_factory(project=project, parent=parent) for parent in parents for _ in range(2)]
+        selection = TestPlan.objects.filter(pk__in=[node.pk for node in (*parents, *nodes)])
+        with CaptureQueriesContext(connection) as context:
+            related_nodes = list(getattr(selection, method_name)(include_self=True))
+        assert len(context.captured_queries) == 1, 'Paths of selection must not be fetched separately'
+        assert len(related_nodes) == len(parents) + len(nodes)
+
+    @allure.title('Test prefetch_tree attaches all levels of tree with constant number of queries')
+    @pytest.mark.parametrize('depth', [2, 6])
+    def test_prefetch_tree(self, test_plan_factory, project, depth):
+        root = test_plan_factory(project=project)
+        expected_ids = []
+        parent = root
+        for _ in range(depth):
+            siblings = [test_plan_factory(project=project, parent=parent) for _ in range(2)]
+            expected_ids.append([sibling.pk for sibling in siblings])
+            parent = siblings[0]
+        with CaptureQueriesContext(connection) as context:
+            node = TestPlan.objects.filter(pk=root.pk).prefetch_tree(TestPlan.objects.order_by('id')).get()
+            for level_ids in expected_ids:
+                children = list(node.child_test_plans.all())
+                assert level_ids == [child.pk for child in children]
+                node = children[0]
+            assert not node.child_test_plans.exists()
+        assert len(context.captured_queries) == 2, 'Tree must be fetched by roots query and single descendants query'
+
+    @allure.title('Test prefetch_tree reuses roots found among descendants')
+    def test_prefetch_tree_nested_roots(self, test_plan_factory, project):
+        root = test_plan_factory(project=project)
+        nested_root = test_plan_factory(project=project, parent=root)
+        leaf = test_plan_factory(project=project, parent=nested_root)
+        instances = list(TestPlan.objects.filter(pk__in=[root.pk, nested_root.pk]).order_by('id'))
+        with CaptureQueriesContext(connection) as context:
+            prefetch_tree(instances, TestPlan.objects.order_by('id'))
+        assert len(context.captured_queries) == 1, 'Descendants must be fetched by single query'
+        children = list(instances[0].child_test_plans.all())
+        assert children == [nested_root]
+        assert children[0] is instances[1], 'Nested root must not be duplicated as descendant'
+        assert [child.pk for child in instances[1].child_test_plans.all()] == [leaf.pk]
+
+    @allure.title('Test prefetched children are filtered by their parent')
+    def test_prefetch_tree_children_filter(self, test_plan_factory, project):
+        root, other_root = test_plan_factory(project=project), test_plan_factory(project=project)
+        child = test_plan_factory(project=project, parent=root, name='child')
+        test_plan_factory(project=project, parent=other_root, name='child')
+        node = TestPlan.objects.filter(pk=root.pk).prefetch_tree(TestPlan.objects.order_by('id')).get()
+        assert list(node.child_test_plans.filter(name='child')) == [child]
+        assert not node.child_test_plans.exclude(name='child').exists()
+
+    @allure.title('Test prefetch_tree is applied to chunks of iterator')
+    def test_prefetch_tree_iterator(self, test_plan_factory, project):
+        roots = [test_plan_factory(project=project) for _ in range(3)]
+        children = {root.pk: test_plan_factory(project=project, parent=root) for root in roots}
+        queryset = TestPlan.objects.filter(parent__isnull=True).prefetch_tree(TestPlan.objects.order_by('id'))
+        with CaptureQueriesContext(connection) as context:
+            nodes = list(queryset.order_by('id').iterator(chunk_size=2))
+            for node in nodes:
+                assert list(node.child_test_plans.all()) == [children[node.pk]]
+        assert len(context.captured_queries) == 3, 'Tree must be prefetched once per iterator chunk'
+
@@ -28,6 +28,7 @@
 # if any, to sign a "copyright disclaimer" for the program, if necessary.
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
+import orjson
 import pytest
 from django.db.models import Count
 
@@ -35,7 +36,12 @@ from tests import constants
 from tests.commons import RequestMock
 from testy.tests_representation.models import Test
 from testy.utilities.request import get_boolean
-from testy.utilities.tree import form_tree_prefetch_lookups, form_tree_prefetch_objects
+from testy.utilities.tree import (
+    form_tree_prefetch_lookups,
+    form_tree_prefetch_objects,
+    iter_tree_json,
+    stream_tree,
+)
 
 _TREEVIEW = 'treeview'
 
@@ -97,3 +103,24 @@ class TestTestyUtilities:
                                                                                                   'not applied'
             for instance in prefetch.queryset:
                 assert instance.results_count == number_of_results, 'Annotation did not work properly'
+
+    def test_stream_tree(self):
+        nodes = [
+            {'id': 1, 'name': 'root', 'parent': None},
+            {'id': 2, 'name': 'child', 'parent': 1},
+            {'id': 3, 'name': 'grandchild', 'parent': 2},
+            {'id': 4, 'name': 'second child', 'parent': 1},
+        ]
+        tree = orjson.loads(b''.join(stream_tree([dict(node) for node in nodes], omitted_ids={1})))
+        assert [node['id'] for node in tree] == [2, 4], 'Children of omitted node were not lifted'
+        assert tree[0]['parent'] == {'id': 1, 'name': 'root'}, 'Parent breadcrumb is invalid'
+        assert tree[0]['children'][0]['id'] == 3, 'Grandchild was not nested into child'
+        assert tree[0]['children'][0]['parent'] == {'id': 2, 'name': 'child'}, 'Parent breadcrumb is invalid'
+        assert not tree[1]['children'], 'Unexpected children found'
+
+    def test_iter_tree_json_chunks(self):
+        number_of_nodes = 1000
+        nodes = ((idx, None, orjson.dumps({'id': idx})) for idx in range(number_of_nodes))
+        chunks = list(iter_tree_json(nodes, chunk_size=1024))
+        assert len(chunks) > 1, 'Tree was not split into chunks'
+        assert len(orjson.loads(b''.join(chunks))) == number_of_nodes
@@ -147,7 +147,7 @@ class ProjectViewSet(TestyModelViewSet, TestyArchiveMixin, MediaViewMixin):
 
     def get_queryset(self):
         project_selector = ProjectSelector(self.request.user)
-        if self.action in {'recovery_list', 'restore', 'delete_permanently'}:
+        if self.action in {'recovery_list', 'restore', 'restore_async', 'delete_permanently'}:
             return project_selector.project_deleted_list()
         if self.action in {_LIST, 'retrieve'}:
             return project_selector.project_list_statistics()
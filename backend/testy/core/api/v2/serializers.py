@@ -284,6 +284,14 @@ class CopyDetailSerializer(Serializer):
     new_name = CharField(required=False)
 
 
+class TaskSerializer(Serializer):
+    task_id = CharField(read_only=True)
+    progress_url = SerializerMethodField()
+
+    def get_progress_url(self, instance) -> str:
+        return reverse('celery_progress:task_status', kwargs={'task_id': instance['task_id']})
+
+
 class AccessRequestSerializer(Serializer):
     reason = CharField(required=False, allow_blank=True, allow_null=True)
 
@@ -45,6 +45,7 @@ router.register('notifications', views.NotificationViewSet)
 urlpatterns = [
     path('system/messages/', views.SystemMessagesViewSet.as_view({'get': 'list'}), name='system-messages'),
     path('system/statistics/', views.SystemStatisticViewSet.as_view({'get': 'list'}), name='system-statistics'),
+    path('jobs/<str:task_id>/cancel/', views.SubtreeJobViewSet.as_view({'post': 'cancel'}), name='job-cancel'),
 ]
 
 websocket_urlpatterns = [
@@ -32,11 +32,11 @@ from pathlib import Path
 
 from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
-from drf_yasg.utils import swagger_auto_schema
+from drf_yasg.utils import no_body, swagger_auto_schema
 from notifications.models import Notification
 from rest_framework import mixins, status
 from rest_framework.decorators import action
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
@@ -85,6 +85,7 @@ from testy.core.services.custom_attribute import CustomAttributeService
 from testy.core.services.labels import LabelService
 from testy.core.services.notifications import NotificationService
 from testy.core.services.projects import ProjectService
+from testy.core.services.subtree_jobs import SubtreeJobService
 from testy.filters import TestyFilterBackend
 from testy.paginations import StandardSetPagination
 from testy.root.mixins import TestyArchiveMixin, TestyDestroyModelMixin, TestyModelViewSet, TestyRestoreModelMixin
@@ -132,7 +133,7 @@ class ProjectViewSet(TestyModelViewSet, TestyArchiveMixin, MediaViewMixin):
     def get_queryset(self):
         project_selector = ProjectSelector(self.request.user)
         match self.action:
-            case 'recovery_list' | 'restore' | 'delete_permanently':
+            case 'recovery_list' | 'restore' | 'restore_async' | 'delete_permanently':
                 return project_selector.project_deleted_list()
             case 'list' | 'retrieve':
                 return project_selector.project_list_statistics()
@@ -317,6 +318,17 @@ class SystemStatisticViewSet(mixins.ListModelMixin, GenericViewSet):
         return Response(serializer.data)
 
 
+class SubtreeJobViewSet(GenericViewSet):
+    queryset = Project.objects.none()
+    schema_tags = ['Jobs']
+
+    @swagger_auto_schema(request_body=no_body, responses={status.HTTP_204_NO_CONTENT: 'Cancellation requested'})
+    def cancel(self, request, task_id: str):
+        if not SubtreeJobService.cancel(task_id, request.user.pk, force=request.user.is_superuser):
+            raise NotFound('Job is not found or already finished')
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class CustomAttributeViewSet(TestyModelViewSet):
     queryset = CustomAttributeSelector.custom_attribute_list()
     serializer_class = CustomAttributeBaseSerializer
@@ -60,3 +60,10 @@ class ActionCode(models.IntegerChoices):
     TEST_UNASSIGNED = 1, 'Test unassigned'
     TEST_CASE_MODIFIED = 2, 'Test case modified'
     TEST_PLAN_MODIFIED = 3, 'Test plan modified'
+
+
+class SubtreeOperation(models.TextChoices):
+    DELETE = 'delete', 'Delete'
+    ARCHIVE = 'archive', 'Archive'
+    RESTORE_ARCHIVED = 'restore_archived', 'Restore archived'
+    RESTORE_DELETED = 'restore_deleted', 'Restore deleted'
@@ -29,39 +29,30 @@
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
 
-from asgiref.sync import async_to_sync
 from channels.consumer import SyncConsumer
-from channels.generic.websocket import JsonWebsocketConsumer
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
 
 from testy.core.choices import ActionCode
 from testy.core.constants import NOTIFICATION_COUNT_GROUP
 from testy.core.services.notifications import NotificationService
 from testy.core.tasks import notify_user
-from testy.users.selectors.users import UserSelector
 
 
-class WebsocketNotificationConsumer(JsonWebsocketConsumer):
-    def connect(self):
+class WebsocketNotificationConsumer(AsyncJsonWebsocketConsumer):
+    async def connect(self):
         self.user_id = self.scope['url_route']['kwargs']['user_id']
         self.notifications_count_receiver = NOTIFICATION_COUNT_GROUP.format(user_id=self.user_id)
+        await self.channel_layer.group_add(self.notifications_count_receiver, self.channel_name)
+        await self.accept()
+        count = await database_sync_to_async(NotificationService.unread_count)(self.user_id)
+        await self.send_json({'count': count})
 
-        async_to_sync(self.channel_layer.group_add)(
-            self.notifications_count_receiver,
-            self.channel_name,
-        )
-        user = UserSelector.user_by_id(self.user_id)
-        if user:
-            NotificationService.change_notifications_count(user=user)
-        self.accept()
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard(self.notifications_count_receiver, self.channel_name)
 
-    def disconnect(self, close_code):
-        async_to_sync(self.channel_layer.group_discard)(
-            self.notifications_count_receiver,
-            self.channel_name,
-        )
-
-    def notifications_count(self, event):
-        self.send_json({'count': event.get('count', 0)})
+    async def notifications_count(self, event):
+        await self.send_json({'count': event.get('count', 0)})
 
 
 class NotificationConsumer(SyncConsumer):
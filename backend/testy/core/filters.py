@@ -29,7 +29,8 @@
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
 from core.constants import CUSTOM_ATTRIBUTE_SUITE_SPECIFIC
-from django.db.models import Q
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Q, QuerySet
 from django_filters import rest_framework as filters
 from notifications.models import Notification
 from rest_framework.filters import OrderingFilter, SearchFilter
@@ -154,6 +155,18 @@ class NotificationSettingFilter(filters.FilterSet):
 
 class SearchFilterMixin(filters.FilterSet):
     search_fields: list[str] | None = None
+    search_rank_field: str | None = None
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        queryset = super().filter_queryset(queryset)
+        search = self.data.get('search')
+        if not self.search_rank_field or not search or self.data.get('treesearch') or self.data.get('ordering'):
+            return queryset
+        similarity = TrigramSimilarity(self.search_rank_field, search)
+        return queryset.order_by(
+            similarity.desc(),
+            *(queryset.query.order_by or queryset.model._meta.ordering),
+        )
 
     def filter_by_search(self, qs, field_name, value):
         if not self.search_fields:
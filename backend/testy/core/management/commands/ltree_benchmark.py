@@ -0,0 +1,123 @@
+# TestY TMS - Test Management System
+# Copyright (C) 2024 KNS Group LLC (YADRO)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Also add information on how to contact you by electronic and paper mail.
+#
+# If your software can interact with users remotely through a computer
+# network, you should also make sure that it provides a way for users to
+# get its source.  For example, if your program is a web application, its
+# interface could display a "Source" link that leads users to an archive
+# of the code.  There are many ways you could offer source, and different
+# solutions will be better for different programs; see section 13 for the
+# specific requirements.
+#
+# You should also get your employer (if you work as a programmer) or school,
+# if any, to sign a "copyright disclaimer" for the program, if necessary.
+# For more information on this, and how to apply and follow the GNU AGPL, see
+# <http://www.gnu.org/licenses/>.
+import logging
+import random
+import time
+
+from django.core.management import BaseCommand
+from django.db import connection, transaction
+from django.db.models import QuerySet
+
+from testy.core.models import Project
+from testy.tests_description.models import TestSuite
+
+logger = logging.getLogger(__name__)
+
+_STORE = 'store'
+_DEFAULT_NODES = 20000
+_DEFAULT_ROOTS = (1, 100, 10000)
+
+
+class Command(BaseCommand):
+    help = 'Measure ltree descendants/ancestors queries for selections of different size on synthetic suite tree.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--nodes',
+            action=_STORE,
+            help='Number of suites in synthetic tree',
+            type=int,
+            default=_DEFAULT_NODES,
+        )
+        parser.add_argument(
+            '--children',
+            action=_STORE,
+            help='Number of children of each suite',
+            type=int,
+            default=10,
+        )
+        parser.add_argument(
+            '--roots',
+            action=_STORE,
+            help='Selection sizes to measure',
+            nargs='+',
+            type=int,
+            default=_DEFAULT_ROOTS,
+        )
+        parser.add_argument(
+            '--repeat',
+            action=_STORE,
+            help='Number of measurements per selection size, best one is reported',
+            type=int,
+            default=3,
+        )
+
+    def handle(self, *args, **options) -> None:
+        with transaction.atomic():
+            suite_ids = self.create_tree(options['nodes'], options['children'])
+            for roots_count in options['roots']:
+                roots_ids = random.sample(suite_ids, min(roots_count, len(suite_ids)))  # noqa: S311
+                roots = TestSuite.objects.filter(pk__in=roots_ids)
+                descendants_time, descendants_count = self.measure(roots, 'get_descendants', options['repeat'])
+                ancestors_time, ancestors_count = self.measure(roots, 'get_ancestors', options['repeat'])
+                logger.info(
+                    f'roots={roots_count} descendants={descendants_count} in {descendants_time:.3f}s '
+                    + f'ancestors={ancestors_count} in {ancestors_time:.3f}s',
+                )
+            transaction.set_rollback(True)
+
+    @classmethod
+    def create_tree(cls, nodes_count: int, children_count: int) -> list[int]:
+        project = Project.objects.create(name='ltree benchmark')
+        level = TestSuite.objects.bulk_create([TestSuite(project=project, name='root')])
+        suite_ids = [level[0].pk]
+        while len(suite_ids) < nodes_count:
+            suites = [
+                TestSuite(project=project, parent=parent, name=f'suite {index}')
+                for parent in level
+                for index in range(children_count)
+            ]
+            level = TestSuite.objects.bulk_create(suites[:nodes_count - len(suite_ids)])
+            suite_ids.extend(suite.pk for suite in level)
+        table_name = TestSuite._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {table_name}')
+        return suite_ids
+
+    @classmethod
+    def measure(cls, roots: QuerySet[TestSuite], method_name: str, repeat: int) -> tuple[float, int]:
+        timings = []
+        get_nodes = getattr(roots, method_name)
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            nodes_count = len(get_nodes(include_self=True).values_list('pk', flat=True))
+            timings.append(time.perf_counter() - started_at)
+        return min(timings), nodes_count
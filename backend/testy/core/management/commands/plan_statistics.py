@@ -0,0 +1,73 @@
+# TestY TMS - Test Management System
+# Copyright (C) 2024 KNS Group LLC (YADRO)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Also add information on how to contact you by electronic and paper mail.
+#
+# If your software can interact with users remotely through a computer
+# network, you should also make sure that it provides a way for users to
+# get its source.  For example, if your program is a web application, its
+# interface could display a "Source" link that leads users to an archive
+# of the code.  There are many ways you could offer source, and different
+# solutions will be better for different programs; see section 13 for the
+# specific requirements.
+#
+# You should also get your employer (if you work as a programmer) or school,
+# if any, to sign a "copyright disclaimer" for the program, if necessary.
+# For more information on this, and how to apply and follow the GNU AGPL, see
+# <http://www.gnu.org/licenses/>.
+import logging
+
+from django.core.management import BaseCommand, CommandError
+
+from testy.tests_representation.services.statistics import TestPlanStatisticsService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Rebuild or verify per plan status statistics used by test plan pie chart.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project-id',
+            action='store',
+            help='Project to process, all projects are processed if not provided',
+            type=int,
+        )
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Only compare stored statistics with actual tests without rebuilding',
+            default=False,
+        )
+
+    def handle(self, *args, **options) -> None:
+        project_id = options.get('project_id')
+        if options.get('verify'):
+            self.verify(project_id)
+            return
+        rows_count = TestPlanStatisticsService.rebuild(project_id)
+        logger.info(f'Plan statistics rebuilt, {rows_count} rows created')
+        self.verify(project_id)
+
+    @classmethod
+    def verify(cls, project_id: int | None) -> None:
+        mismatches = TestPlanStatisticsService.verify(project_id)
+        for mismatch in mismatches:
+            logger.error(f'Plan statistics mismatch: {mismatch}')
+        if mismatches_count := len(mismatches):
+            raise CommandError(f'Found {mismatches_count} mismatched plan statistics rows')
+        logger.info('Plan statistics are consistent')
@@ -0,0 +1,112 @@
+# TestY TMS - Test Management System
+# Copyright (C) 2024 KNS Group LLC (YADRO)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Also add information on how to contact you by electronic and paper mail.
+#
+# If your software can interact with users remotely through a computer
+# network, you should also make sure that it provides a way for users to
+# get its source.  For example, if your program is a web application, its
+# interface could display a "Source" link that leads users to an archive
+# of the code.  There are many ways you could offer source, and different
+# solutions will be better for different programs; see section 13 for the
+# specific requirements.
+#
+# You should also get your employer (if you work as a programmer) or school,
+# if any, to sign a "copyright disclaimer" for the program, if necessary.
+# For more information on this, and how to apply and follow the GNU AGPL, see
+# <http://www.gnu.org/licenses/>.
+import logging
+import time
+import uuid
+
+from django.core.management import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from testy.core.models import Project
+from testy.tests_description.models import TestCase, TestSuite
+
+logger = logging.getLogger(__name__)
+
+_STORE = 'store'
+_DEFAULT_CASES = 100000
+_DEFAULT_TERMS = ('case 4242', '4242', 'missing term')
+_BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = 'Measure test case search filter queries on synthetic dataset.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--cases',
+            action=_STORE,
+            help='Number of test cases in synthetic dataset',
+            type=int,
+            default=_DEFAULT_CASES,
+        )
+        parser.add_argument(
+            '--terms',
+            action=_STORE,
+            help='Search terms to measure',
+            nargs='+',
+            default=_DEFAULT_TERMS,
+        )
+        parser.add_argument(
+            '--repeat',
+            action=_STORE,
+            help='Number of measurements per search term, best one is reported',
+            type=int,
+            default=3,
+        )
+
+    def handle(self, *args, **options) -> None:
+        with transaction.atomic():
+            self.create_cases(options['cases'])
+            for term in options['terms']:
+                search_time, cases_count = self.measure(term, options['repeat'])
+                logger.info('term="%s" found=%d in %.3fs', term, cases_count, search_time)
+            transaction.set_rollback(True)
+
+    @classmethod
+    def create_cases(cls, cases_count: int) -> None:
+        project = Project.objects.create(name='search benchmark')
+        suite = TestSuite.objects.create(project=project, name='search benchmark')
+        for offset in range(0, cases_count, _BATCH_SIZE):
+            TestCase.objects.bulk_create(
+                [
+                    TestCase(
+                        project=project,
+                        suite=suite,
+                        name=f'{uuid.uuid4().hex} case {index}',  # noqa: WPS237
+                        scenario='scenario',
+                    )
+                    for index in range(offset, min(offset + _BATCH_SIZE, cases_count))
+                ],
+            )
+        table_name = TestCase._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {table_name}')
+
+    @classmethod
+    def measure(cls, term: str, repeat: int) -> tuple[float, int]:
+        timings = []
+        cases = TestCase.objects.filter(Q(name__icontains=term) | Q(id__icontains=term))
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            cases_count = len(cases.values_list('pk', flat=True))
+            timings.append(time.perf_counter() - started_at)
+        return min(timings), cases_count
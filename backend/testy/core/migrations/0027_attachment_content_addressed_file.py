@@ -0,0 +1,22 @@
+# Generated by Django 4.2.13 on 2026-10-18 03:50
+
+from django.db import migrations, models
+import functools
+import testy.core.storages
+import testy.utils
+import testy.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_remove_customattribute_content_types_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='attachment',
+            name='file',
+            field=models.FileField(db_index=True, max_length=150, storage=testy.core.storages.ContentAddressedStorage(), upload_to=functools.partial(testy.utils.get_media_file_path, *(), **{'media_name': 'attachments'}), validators=[testy.validators.ExtensionValidator()]),
+        ),
+    ]
@@ -30,7 +30,6 @@
 # <http://www.gnu.org/licenses/>.
 from copy import deepcopy
 from functools import partial
-from pathlib import Path
 from typing import Any
 
 import pgtrigger
@@ -39,7 +38,6 @@ from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.fields import ArrayField
-from django.core.files.base import ContentFile
 from django.db import models
 from django.utils.translation import gettext_lazy
 from django.utils.translation import gettext_lazy as _
@@ -48,6 +46,7 @@ from simple_history.models import HistoricalRecords
 
 from testy.core.choices import AccessRequestStatus, ActionCode, CustomFieldType, LabelTypes, SystemMessageLevel
 from testy.core.constraints import unique_soft_delete_constraint
+from testy.core.storages import ContentAddressedStorage
 from testy.raw_sql import DELETE_LABELED_ITEM_TRIGGER, INSERT_LABELED_ITEM_TRIGGER
 from testy.root.models import BaseModel, DeletedManager, SoftDeleteManager, SoftDeleteMixin
 from testy.users.models import Membership, User
@@ -147,7 +146,9 @@ class Attachment(BaseModel):
     file = models.FileField(
         max_length=settings.FILEPATH_MAX_LEN,
         upload_to=partial(get_media_file_path, media_name='attachments'),
+        storage=ContentAddressedStorage(),
         validators=[ExtensionValidator()],
+        db_index=True,
     )
     content_object_history_ids = ArrayField(models.IntegerField(), default=list, blank=True)
 
@@ -169,12 +170,7 @@ class Attachment(BaseModel):
             attrs.update(common_attrs_to_change)
         for attr_name, attr_value in attrs.items():
             setattr(self_copy, attr_name, attr_value)
-        new_file = None
-        if self.file and Path(self.file.path).exists():
-            new_file = ContentFile(self.file.read())
         self_copy._state.adding = True
-        if new_file:
-            self_copy.file.save(self.filename, new_file, save=False)
         self_copy.save()
         return self_copy
 
@@ -63,6 +63,10 @@ class AttachmentSelector:
         content_type = ContentType.objects.get_for_model(model)
         return Attachment.objects.filter(content_type=content_type, object_id__in=ids)
 
+    @classmethod
+    def attachment_exists_by_file(cls, file_name: str) -> bool:
+        return QuerySet(Attachment).filter(file=file_name).exists()
+
     @classmethod
     def attachment_list_by_parent_object_and_history_ids(  # noqa: WPS118
         cls,
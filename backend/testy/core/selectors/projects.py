@@ -29,7 +29,7 @@
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
 
-from django.db.models import Case, Count, Exists, F, IntegerField, OuterRef, Q, QuerySet, Value, When
+from django.db.models import Case, Exists, F, IntegerField, OuterRef, Q, QuerySet, Value, When
 from rest_framework.generics import get_object_or_404
 
 from testy.core.exceptions import UserMissingError
@@ -43,6 +43,7 @@ from testy.users.selectors.roles import RoleSelector
 from testy.utilities.request import PeriodDateTime
 
 _PK = 'pk'
+_TREE_ID = 'tree_id'
 
 
 class ProjectSelector:
@@ -104,24 +105,16 @@ class ProjectSelector:
         }
 
     def project_progress(self, project_id: int, period: PeriodDateTime):
-        root_plans = (
-            TestPlan
-            .objects
-            .filter(parent=None, project=project_id, is_archive=False)
-            .prefetch_related('parameters')
+        root_plans = TestPlan.objects.filter(parent=None, project=project_id, is_archive=False)
+        progress = TestPlanSelector.tests_progress(
+            Test.objects.filter(plan__tree_id__in=root_plans.values(_TREE_ID)),
+            F(f'plan__{_TREE_ID}'),
+            period,
         )
-        root_plans = TestPlanSelector.annotate_title(root_plans).order_by('-id')
-        tests_count_filter_mapping = {
-            'tests_total': None,
-            'tests_progress_period': [
-                Q(results__created_at__range=(period.start, period.end)),
-                Q(last_status_id__isnull=False),
-            ],
-            'tests_progress_total': [Q(last_status_id__isnull=False)],
-        }
+        root_plans = root_plans.order_by('-id')
         for plan in root_plans:
-            for test_field, test_filter in tests_count_filter_mapping.items():
-                setattr(plan, test_field, self._test_count(plan, test_filter))
+            for field_name, tests_count in progress[plan.tree_id].items():
+                setattr(plan, field_name, tests_count)
         return root_plans
 
     @classmethod
@@ -132,27 +125,6 @@ class ProjectSelector:
             output_field=IntegerField(),
         )
 
-    @classmethod
-    def _get_tests_subquery(cls, last_status_subquery):
-        return Test.objects.filter(
-            plan__tree_id=OuterRef('tree_id'),
-            last_status__isnull=False,
-        ).values(_PK)
-
-    @classmethod
-    def _test_count(cls, plan: TestPlan, filter_conditions: list[Q] | None = None) -> int:
-        if not filter_conditions:
-            filter_conditions = []
-        return (
-            Test.objects
-            .filter(*filter_conditions, plan__tree_id=plan.tree_id)
-            .values('plan__tree_id')
-            .annotate(count=Count('id', distinct=True))
-            .values_list('count', flat=True)
-            .order_by('count')
-            .first() or 0
-        )
-
     def _user_project_qs(self, manager_name: str = 'objects') -> QuerySet[Project]:
         if not self._user:
             raise UserMissingError('User must be set to get queryset')
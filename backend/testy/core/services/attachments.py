@@ -30,17 +30,23 @@
 # <http://www.gnu.org/licenses/>.
 import logging
 import os
+from collections import defaultdict
 from pathlib import Path
 from typing import Any
 
+from django.db import transaction
 from django.db.models import Model
+from django.db.models.fields.files import FieldFile
 
 from testy.core.models import Attachment
 from testy.core.selectors.attachments import AttachmentSelector
 from testy.core.services.media import MediaService
+from testy.core.storages import ContentAddressedStorage
 
 logger = logging.getLogger(__name__)
 
+AttachmentsByObject = list[tuple[Model, list[Attachment]]]
+
 
 class AttachmentService(MediaService):
     non_side_effect_fields = [
@@ -48,6 +54,7 @@ class AttachmentService(MediaService):
         'url',
     ]
 
+    @transaction.atomic
     def attachment_create(self, data: dict[str, Any], request) -> list[Attachment] | str:
         attachments_instances = []
         for file in request.data.getlist('file'):
@@ -100,6 +107,35 @@ class AttachmentService(MediaService):
         for attachment in attachments:
             self.add_history_to_attachment(attachment, history_id)
 
+    def bulk_attachments_update_content_objects(
+        self,
+        attachments_by_object: AttachmentsByObject,
+        history_ids: dict[int, int],
+    ) -> None:
+        if not attachments_by_object:
+            return
+        model = type(attachments_by_object[0][0])
+        object_ids = [content_object.id for content_object, _ in attachments_by_object]
+        old_attachments = defaultdict(list)
+        for old_attachment in AttachmentSelector.attachment_list_by_ids(object_ids, model):
+            old_attachments[old_attachment.object_id].append(old_attachment)
+
+        stale_ids = []
+        attachments_to_update = []
+        for content_object, attachments in attachments_by_object:
+            current_attachments = old_attachments[content_object.id]
+            for attachment in attachments:
+                if attachment not in current_attachments:
+                    attachment = self.attachment_set_content_object(attachment, content_object)
+                attachment.content_object_history_ids.append(history_ids[content_object.id])
+                attachments_to_update.append(attachment)
+            stale_ids.extend(
+                old_attachment.id for old_attachment in current_attachments if old_attachment not in attachments
+            )
+
+        Attachment.objects.filter(pk__in=stale_ids).delete()
+        Attachment.objects.bulk_update(attachments_to_update, ['content_object_history_ids'])
+
     def restore_by_version(self, content_object: type[Model], history_id: int):
         old_attachments = AttachmentSelector.attachment_list_by_parent_object_and_history_ids(
             content_object, content_object.id, [history_id],
@@ -113,6 +149,24 @@ class AttachmentService(MediaService):
         for attachment in AttachmentSelector.attachment_list_from_object_with_excluding(content_object, exclude_ids):
             attachment.delete()
 
+    @classmethod
+    def remove_unreferenced_media(cls, file: FieldFile) -> None:
+        """
+        Remove attachment blob and its thumbnails once no attachment references it.
+
+        Clones share blob with source attachment, so file is kept until the last reference is hard deleted.
+        Blob lock is held while checking references, so concurrent upload of the same content either
+        commits its row before the check or writes the blob again after removal.
+
+        Args:
+            file: field file of hard deleted attachment.
+        """
+        with transaction.atomic():
+            ContentAddressedStorage.lock_blob(file.name)
+            if AttachmentSelector.attachment_exists_by_file(file.name):
+                return
+            cls.remove_media(Path(file.path))
+
     def copy_attachment(self, attachment: Attachment) -> Attachment:
         logger.info(f'Copying attachment {attachment}')
         return Attachment(
@@ -31,14 +31,16 @@
 import re
 from collections import defaultdict
 from copy import deepcopy
-from typing import Any, Callable, Generator, Iterable, TypeAlias
+from datetime import datetime
+from typing import Any, Callable, Iterable, TypeAlias
 
-from django.db import transaction
+from celery import Task
+from django.db import connection, transaction
 from django.db.models import Model, QuerySet
 from mptt.querysets import TreeQuerySet
 from simple_history.utils import bulk_create_with_history
 
-from testy.core.models import Label, LabeledItem, Project
+from testy.core.models import Attachment, Label, LabeledItem, Project
 from testy.core.selectors.attachments import AttachmentSelector
 from testy.core.selectors.labeled_items import LabeledItemSelector
 from testy.core.selectors.labels import LabelSelector
@@ -47,6 +49,8 @@ from testy.tests_description.selectors.cases import TestCaseSelector, TestCaseSt
 from testy.tests_description.selectors.suites import TestSuiteSelector
 from testy.tests_representation.models import Test, TestPlan
 from testy.tests_representation.selectors.testplan import TestPlanSelector
+from testy.utilities.sql import get_history_insert_columns
+from testy.utils import ProgressRecorderContext
 
 _Mapping: TypeAlias = dict[int, int]
 _PROJECT_ID = 'project_id'
@@ -57,49 +61,118 @@ _NEW_NAME = 'new_name'
 _TEST_CASE_ID = 'test_case_id'
 _SCENARIO = 'scenario'
 _EXPECTED = 'expected'
+_COPY_BATCH_SIZE = 1000
+
+_ALLOCATE_PLAN_IDS_SQL = """
+SELECT nextval(pg_get_serial_sequence('tests_representation_testplan', 'id')) FROM generate_series(1, %s)
+"""
+
+# Values of historical record fields that are not copied from copied test, other columns are taken from test
+_COPY_TESTS_HISTORY_VALUES = {
+    'history_date': 'now()',
+    'history_type': "'+'",
+    'history_user_id': '%(user_id)s',
+    'history_change_reason': 'NULL',
+}
+
+_COPY_TESTS_SQL = """
+WITH plans_mapping AS (
+    SELECT * FROM unnest(%(src_ids)s::bigint[], %(dst_ids)s::bigint[]) AS m(src_id, dst_id)
+), copied_tests AS (
+    INSERT INTO tests_representation_test (
+        project_id, case_id, plan_id, assignee_id, is_archive, last_status_id, created_at, updated_at, is_deleted
+    )
+    SELECT t.project_id, t.case_id, m.dst_id, CASE WHEN %(keep_assignee)s THEN t.assignee_id END, t.is_archive,
+           NULL, now(), now(), false
+    FROM tests_representation_test t
+    JOIN plans_mapping m ON m.src_id = t.plan_id
+    WHERE NOT t.is_deleted AND NOT t.is_archive
+    ORDER BY t.id
+    RETURNING *
+)
+INSERT INTO {history_table} ({history_columns})
+SELECT {history_values}
+FROM copied_tests t
+"""
+
+_COPY_PLAN_PARAMETERS_SQL = """
+INSERT INTO tests_representation_testplan_parameters (testplan_id, parameter_id)
+SELECT m.dst_id, p.parameter_id
+FROM tests_representation_testplan_parameters p
+JOIN unnest(%(src_ids)s::bigint[], %(dst_ids)s::bigint[]) AS m(src_id, dst_id) ON m.src_id = p.testplan_id
+"""
 
 
 class CopyService:
     @classmethod
     @transaction.atomic
-    def plans_copy(cls, payload: dict[str, Any]) -> QuerySet[Model]:
+    def plans_copy(
+        cls,
+        payload: dict[str, Any],
+        task: Task | None = None,
+        user_id: int | None = None,
+    ) -> QuerySet[Model]:
+        """
+        Copy plan trees with tests and parameters in constant number of queries per tree.
+
+        Args:
+            payload: validated copy payload.
+            task: celery task to report progress to.
+            user_id: id of user recorded in history of copied tests.
+
+        Returns:
+            queryset of copied plans.
+        """
+        progress_recorder = ProgressRecorderContext(
+            task,
+            total=len(payload['plans']) + 3,
+            debug=task is None,
+            description='Copying plans',
+        )
         dst_plan = payload.get('dst_plan')
         plans_mapping = {}
         for plan_details in payload['plans']:
             plan_to_copy = plan_details.get('plan')
-            copied_objects_generator = cls._create_tree_objects(
-                dst_plan,
-                [plan_to_copy],
+            with progress_recorder.progress_context(f'Copying plan tree {plan_to_copy.name}'):
+                plans_mapping.update(
+                    cls._copy_plan_tree(
+                        plan_to_copy,
+                        dst_plan,
+                        name=plan_details.get(_NEW_NAME, plan_to_copy.name),
+                        started_at=plan_details.get('started_at', plan_to_copy.started_at),
+                        due_date=plan_details.get('due_date', plan_to_copy.due_date),
+                    ),
+                )
+
+        src_ids, dst_ids = list(plans_mapping.keys()), list(plans_mapping.values())
+        history_columns, history_values = get_history_insert_columns(Test, _COPY_TESTS_HISTORY_VALUES)
+        with connection.cursor() as cursor:
+            with progress_recorder.progress_context('Copying tests'):
+                cursor.execute(
+                    _COPY_TESTS_SQL.format(
+                        history_table=Test.history.model._meta.db_table,
+                        history_columns=', '.join(history_columns),
+                        history_values=', '.join(history_values),
+                    ),
+                    {
+                        'src_ids': src_ids,
+                        'dst_ids': dst_ids,
+                        'keep_assignee': bool(payload.get('keep_assignee')),
+                        'user_id': user_id,
+                    },
+                )
+            with progress_recorder.progress_context('Copying parameters'):
+                cursor.execute(_COPY_PLAN_PARAMETERS_SQL, {'src_ids': src_ids, 'dst_ids': dst_ids})
+        with progress_recorder.progress_context('Copying attachments'):
+            cls._copy_attachments(
                 TestPlan,
-                name=plan_details.get(_NEW_NAME, plan_to_copy.name),
-                started_at=plan_details.get('started_at', plan_to_copy.started_at),
-                due_date=plan_details.get('due_date', plan_to_copy.due_date),
-                finished_at=None,
+                src_ids,
+                plans_mapping,
+                None,
+                ['description'],
+                TestPlanSelector.plans_by_ids,
             )
-            mapping = {}
-            for src_instance, cpy_instance in list(copied_objects_generator):
-                cpy_instance.save()
-                mapping[src_instance.pk] = cpy_instance.pk
-            plans_mapping.update(mapping)
-
-        tests_to_copy = Test.objects.filter(plan__in=plans_mapping.keys(), is_archive=False)
-        mapped_fields = defaultdict(dict)
-
-        for test in tests_to_copy:
-            mapped_fields['plan_id'][test.pk] = plans_mapping.get(test.plan_id)
-            mapped_fields['assignee_id'][test.pk] = test.assignee_id if payload.get('keep_assignee') else None
-            mapped_fields['last_status'][test.pk] = None
-
-        cls._copy_objects(tests_to_copy, Test, mapped_fields)
-        cls._copy_attachments(
-            TestPlan,
-            list(plans_mapping.keys()),
-            plans_mapping,
-            None,
-            ['description'],
-            TestPlanSelector.plans_by_ids,
-        )
-        return TestPlanSelector.plans_by_ids(plans_mapping.values())
+        return TestPlanSelector.plans_by_ids(dst_ids)
 
     @classmethod
     @transaction.atomic
@@ -328,30 +401,41 @@ class CopyService:
         return label_mappings
 
     @classmethod
-    def _create_tree_objects(
+    def _copy_plan_tree(
         cls,
-        new_parent: Model | None,
-        instances: Iterable[Model],
-        model: type[Model],
-        parent_field_name: str = 'parent',
-        **kwargs,
-    ) -> Generator[tuple[int, int], None, None]:
-        inherited_attrs = {'started_at', 'due_date', 'finished_at'}
-        for instance in instances:
-            copied_instance = deepcopy(instance)
-            copied_instance.pk = None
-            setattr(copied_instance, parent_field_name, new_parent)
-            for field_name, field_value in kwargs.items():
-                setattr(copied_instance, field_name, field_value)
-            child_instances = list(model.objects.filter(**{parent_field_name: instance.pk}))
-            yield instance, copied_instance
-            yield from cls._create_tree_objects(
-                copied_instance,
-                child_instances,
-                model,
-                parent_field_name,
-                **{key: value for key, value in kwargs.items() if key in inherited_attrs},
-            )
+        plan_to_copy: TestPlan,
+        dst_plan: TestPlan | None,
+        name: str,
+        started_at: datetime,
+        due_date: datetime,
+    ) -> _Mapping:
+        subtree = TestPlanSelector.testplan_list_raw().filter(path__descendant=plan_to_copy.path).order_by('path')
+        plans = []
+        copied_ids = set()
+        for plan in subtree:
+            if plan.pk == plan_to_copy.pk or plan.parent_id in copied_ids:
+                plans.append(plan)
+                copied_ids.add(plan.pk)
+        with connection.cursor() as cursor:
+            cursor.execute(_ALLOCATE_PLAN_IDS_SQL, [len(plans)])
+            new_ids = [row[0] for row in cursor.fetchall()]
+        plans_mapping = dict(zip((plan.pk for plan in plans), new_ids))
+        copied_plans = []
+        for plan in plans:
+            copied_plan = deepcopy(plan)
+            copied_plan.pk = plans_mapping[plan.pk]
+            copied_plan.parent_id = plans_mapping.get(plan.parent_id)
+            copied_plan.path = None
+            copied_plan.tree_id = None
+            copied_plan.started_at = started_at
+            copied_plan.due_date = due_date
+            copied_plan.finished_at = None
+            copied_plans.append(copied_plan)
+        root_plan = copied_plans[0]
+        root_plan.name = name
+        root_plan.parent_id = dst_plan.pk if dst_plan else None
+        TestPlan.objects.bulk_create(copied_plans, batch_size=_COPY_BATCH_SIZE)
+        return plans_mapping
 
     @classmethod
     def _copy_attachments(
@@ -363,13 +447,20 @@ class CopyService:
         attachment_references_fields: list[str],
         selector_method: Callable[[list[int], str], QuerySet[Any]],
     ) -> None:
-        attachments = AttachmentSelector.attachment_list_by_ids(obj_ids, model)
-        attachments_mapping = {}
+        attachments = list(AttachmentSelector.attachment_list_by_ids(obj_ids, model))
+        copied_attachments = []
         for attachment in attachments:
-            attrs_to_change = {'object_id': mapping.get(attachment.object_id)}
+            copied_attachment = deepcopy(attachment)
+            copied_attachment.pk = None
+            copied_attachment.object_id = mapping.get(attachment.object_id)
             if project_id:
-                attrs_to_change[_PROJECT_ID] = project_id
-            attachments_mapping[attachment.id] = attachment.model_clone(common_attrs_to_change=attrs_to_change).id
+                copied_attachment.project_id = project_id
+            copied_attachments.append(copied_attachment)
+        Attachment.objects.bulk_create(copied_attachments, batch_size=_COPY_BATCH_SIZE)
+        attachments_mapping = {
+            attachment.id: copied_attachment.id
+            for attachment, copied_attachment in zip(attachments, copied_attachments)
+        }
         updated_objs = []
         objs_to_update = selector_method(list(mapping.values()), _PK)
         for obj in objs_to_update.filter(attachments__isnull=False):
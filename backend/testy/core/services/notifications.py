@@ -28,11 +28,15 @@
 # if any, to sign a "copyright disclaimer" for the program, if necessary.
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
-from typing import Iterable
+from collections import Counter
+from itertools import islice
+from typing import Any, Iterable, NamedTuple
 
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
-from django.db.models import Model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models import Count, Model, Q
 from notifications.models import Notification
 from notifications.signals import notify
 
@@ -43,6 +47,19 @@ from testy.users.models import User
 
 channel_layer = get_channel_layer()
 
+_NOTIFICATIONS_BATCH_SIZE = 1000
+_UNREAD_COUNT_KEY = 'notifications_unread_{user_id}'
+_UNREAD_COUNT_TTL = 60 * 60  # counters are reconciled with database at least hourly
+_RECONCILE_BATCH_SIZE = 1000
+
+
+class NotificationEvent(NamedTuple):
+    target_id: int
+    target_content_type_id: int
+    receiver_id: int
+    action_code: ActionCode
+    context: dict[str, Any]
+
 
 class NotificationService:
 
@@ -71,21 +88,142 @@ class NotificationService:
         )
 
     @classmethod
-    def change_notifications_count(cls, user: User) -> None:
-        async_to_sync(channel_layer.group_send)(
-            NOTIFICATION_COUNT_GROUP.format(user_id=user.id),
-            {
-                'type': 'notifications.count',
-                'count': user.notifications.unread().count(),
-            },
+    def notify_users_bulk(cls, events: Iterable[NotificationEvent], actor: User) -> list[Notification]:
+        """
+        Create notifications for events of single actor with constant number of queries.
+
+        Settings and subscriptions of all receivers are fetched at once, notifications are inserted in bulk
+        and every receiver gets single unread notifications count update.
+
+        Args:
+            events: notification events.
+            actor: user that caused events.
+
+        Returns:
+            List of created notifications.
+        """
+        events = list(events)
+        action_settings = NotificationSetting.objects.in_bulk({event.action_code for event in events})
+        subscriptions = set(
+            NotificationSetting.subscribers.through.objects.filter(
+                notificationsetting__in=action_settings.keys(),
+                user_id__in={event.receiver_id for event in events},
+            ).values_list('notificationsetting_id', 'user_id'),
         )
+        actor_content_type = ContentType.objects.get_for_model(actor)
+        notifications = []
+        for event in events:
+            if (event.action_code, event.receiver_id) not in subscriptions:
+                continue
+            action = action_settings[event.action_code]
+            context = {**event.context, 'actor': actor.username}
+            notifications.append(
+                Notification(
+                    recipient_id=event.receiver_id,
+                    actor_content_type=actor_content_type,
+                    actor_object_id=actor.pk,
+                    target_content_type_id=event.target_content_type_id,
+                    target_object_id=event.target_id,
+                    verb=action.message.format(**context),
+                    data={
+                        'template': action.message.format(**context),
+                        'placeholder_text': action.placeholder_text.format(**context),
+                        'placeholder_link': action.placeholder_link.format(**context),
+                    },
+                ),
+            )
+        Notification.objects.bulk_create(notifications, batch_size=_NOTIFICATIONS_BATCH_SIZE)
+        created_counts = Counter(notification.recipient_id for notification in notifications)
+        for user_id, created_count in created_counts.items():
+            cls.adjust_unread_count(user_id, created_count)
+        cls.change_notifications_counts(created_counts.keys())
+        return notifications
+
+    @classmethod
+    def change_notifications_counts(cls, user_ids: Iterable[int]) -> None:
+        for user_id, count in cls.unread_counts(user_ids).items():
+            async_to_sync(channel_layer.group_send)(
+                NOTIFICATION_COUNT_GROUP.format(user_id=user_id),
+                {
+                    'type': 'notifications.count',
+                    'count': count,
+                },
+            )
+
+    @classmethod
+    def change_notifications_count(cls, user: User) -> None:
+        cls.change_notifications_counts([user.id])
+
+    @classmethod
+    def unread_count(cls, user_id: int) -> int:
+        return cls.unread_counts([user_id])[user_id]
+
+    @classmethod
+    def unread_counts(cls, user_ids: Iterable[int]) -> dict[int, int]:
+        """
+        Get unread notifications counters of users from cache, counters missing in cache are counted in database.
+
+        Args:
+            user_ids: ids of users to get counters for.
+
+        Returns:
+            Mapping of user id to number of unread notifications.
+        """
+        keys = {user_id: _UNREAD_COUNT_KEY.format(user_id=user_id) for user_id in user_ids}
+        cached = cache.get_many(keys.values())
+        counts = {user_id: cached.get(key) for user_id, key in keys.items()}
+        missing_ids = {user_id for user_id, count in counts.items() if count is None}
+        if missing_ids:
+            missing_counts = dict.fromkeys(missing_ids, 0)
+            missing_counts.update(cls._count_unread(Notification.objects.filter(recipient_id__in=missing_ids)))
+            for user_id, count in missing_counts.items():
+                # counter set concurrently is kept, it may already include increments made after counting
+                cache.add(keys[user_id], count, _UNREAD_COUNT_TTL)
+            counts.update(missing_counts)
+        return counts
+
+    @classmethod
+    def adjust_unread_count(cls, user_id: int, delta: int) -> None:
+        if not delta:
+            return
+        try:
+            cache.incr(_UNREAD_COUNT_KEY.format(user_id=user_id), delta)
+        except ValueError:
+            # counter is not cached, it is counted in database on next read
+            return
 
     @classmethod
-    def mark_as(cls, unread: bool, user: User, notifications: list[Notification] | None = None) -> list[int]:
-        qs = Notification.objects.filter(recipient=user)
+    def invalidate_unread_count(cls, user_id: int) -> None:
+        cache.delete(_UNREAD_COUNT_KEY.format(user_id=user_id))
+
+    @classmethod
+    def reconcile_unread_counts(cls) -> None:
+        """
+        Drop cached unread counters that differ from database, they are counted again on next read.
+
+        Only users with cached counters are counted. Counters are read before counting and dropped instead of
+        being overwritten, so increments made while counting are not lost.
+        """
+        user_ids = User.objects.order_by('pk').values_list('pk', flat=True).iterator()
+        while batch := list(islice(user_ids, _RECONCILE_BATCH_SIZE)):
+            keys = {user_id: _UNREAD_COUNT_KEY.format(user_id=user_id) for user_id in batch}
+            cached = cache.get_many(keys.values())
+            cached_counts = {user_id: cached[key] for user_id, key in keys.items() if key in cached}
+            if not cached_counts:
+                continue
+            counts = cls._count_unread(Notification.objects.filter(recipient_id__in=cached_counts.keys()))
+            cache.delete_many([
+                keys[user_id] for user_id, cached_count in cached_counts.items()
+                if counts.get(user_id, 0) != cached_count
+            ])
+
+    @classmethod
+    def mark_as(cls, unread: bool, user: User, notifications: list[Notification] | None = None) -> int:
+        qs = Notification.objects.filter(recipient=user, unread=not unread)
         if notifications:
             qs = qs.filter(pk__in=[notification.pk for notification in notifications])
         updated = qs.update(unread=unread)
+        cls.adjust_unread_count(user.id, updated if unread else -updated)
         cls.change_notifications_count(user)
         return updated
 
@@ -99,3 +237,12 @@ class NotificationService:
     def disable_notifications(cls, user: User, settings: Iterable[NotificationSetting]) -> None:
         through_model = NotificationSetting.subscribers.through
         through_model.objects.filter(user_id=user.id, notificationsetting__in=settings).delete()
+
+    @classmethod
+    def _count_unread(cls, queryset) -> dict[int, int]:
+        return dict(
+            queryset
+            .values('recipient_id')
+            .annotate(count=Count('id', filter=Q(unread=True)))
+            .values_list('recipient_id', 'count'),
+        )
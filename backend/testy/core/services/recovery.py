@@ -39,8 +39,7 @@ class RecoveryService:
 
     @classmethod
     def restore_objects(cls, queryset: DeletedQuerySet | DeletedTreeQuerySet, data):
-        for instance in queryset.filter(id__in=data[_INSTANCE_IDS]):
-            instance.restore()
+        queryset.restore(id__in=data[_INSTANCE_IDS])
 
     @classmethod
     def delete_permanently(cls, queryset: DeletedQuerySet | DeletedTreeQuerySet, data):
@@ -0,0 +1,172 @@
+# TestY TMS - Test Management System
+# Copyright (C) 2024 KNS Group LLC (YADRO)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Also add information on how to contact you by electronic and paper mail.
+#
+# If your software can interact with users remotely through a computer
+# network, you should also make sure that it provides a way for users to
+# get its source.  For example, if your program is a web application, its
+# interface could display a "Source" link that leads users to an archive
+# of the code.  There are many ways you could offer source, and different
+# solutions will be better for different programs; see section 13 for the
+# specific requirements.
+#
+# You should also get your employer (if you work as a programmer) or school,
+# if any, to sign a "copyright disclaimer" for the program, if necessary.
+# For more information on this, and how to apply and follow the GNU AGPL, see
+# <http://www.gnu.org/licenses/>.
+import logging
+from typing import Iterable, TypedDict
+
+from celery import Task
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model, QuerySet
+
+from testy.core.choices import SubtreeOperation
+from testy.core.services.recovery import RecoveryService
+from testy.root.models import DeletedQuerySet, SoftDeleteQuerySet
+from testy.root.relations import RelationTreeMixin
+from testy.tests_description.models import TestSuite
+from testy.tests_description.services.suites import TestSuiteService
+from testy.utils import ProgressRecorderContext
+
+logger = logging.getLogger(__name__)
+
+_PK = 'pk'
+_CHUNK_SIZE = 1000
+_JOB_TTL = 60 * 60 * 24
+_JOB_OWNER_KEY = 'subtree_job_owner_{task_id}'
+_JOB_CANCEL_KEY = 'subtree_job_cancel_{task_id}'
+
+
+class SubtreeJobResult(TypedDict):
+    processed: int
+    cancelled: bool
+
+
+class SubtreeJobService:
+    chunk_size = _CHUNK_SIZE
+
+    @classmethod
+    def run(
+        cls,
+        operation: SubtreeOperation,
+        model: type[Model],
+        instance_ids: Iterable[int],
+        task: Task | None = None,
+    ) -> SubtreeJobResult:
+        """
+        Apply operation to instances and all their related objects in chunked set-based updates.
+
+        Args:
+            operation: operation to apply.
+            model: model of instances.
+            instance_ids: ids of instances, descendants of ltree instances are included.
+            task: celery task to report progress to and to check cancellation for.
+
+        Returns:
+            number of processed rows and whether job was cancelled.
+        """
+        task_id = task.request.id if task is not None else None
+        querysets = cls._get_querysets(operation, model, list(instance_ids))
+        progress_recorder = ProgressRecorderContext(
+            task,
+            total=len(querysets),
+            debug=task is None,
+            description=f'{operation.label} started',
+        )
+        result = SubtreeJobResult(processed=0, cancelled=False)
+        for queryset in querysets:
+            with progress_recorder.progress_context(f'{operation.label}: {queryset.model._meta.verbose_name_plural}'):
+                processed, cancelled = cls._apply_in_chunks(operation, queryset, task_id)
+            result['processed'] += processed
+            if cancelled:
+                logger.info(f'{operation.label} job {task_id} was cancelled')
+                result['cancelled'] = True
+                break
+        if task_id is not None:
+            cache.delete_many([_JOB_OWNER_KEY.format(task_id=task_id), _JOB_CANCEL_KEY.format(task_id=task_id)])
+        return result
+
+    @classmethod
+    def register(cls, task_id: str, user_id: int) -> None:
+        cache.set(_JOB_OWNER_KEY.format(task_id=task_id), user_id, timeout=_JOB_TTL)
+
+    @classmethod
+    def cancel(cls, task_id: str, user_id: int, force: bool = False) -> bool:
+        owner_id = cache.get(_JOB_OWNER_KEY.format(task_id=task_id))
+        if owner_id is None or (owner_id != user_id and not force):
+            return False
+        cache.set(_JOB_CANCEL_KEY.format(task_id=task_id), True, timeout=_JOB_TTL)
+        return True
+
+    @classmethod
+    def is_cancelled(cls, task_id: str | None) -> bool:
+        if task_id is None:
+            return False
+        return bool(cache.get(_JOB_CANCEL_KEY.format(task_id=task_id)))
+
+    @classmethod
+    def _get_querysets(cls, operation: SubtreeOperation, model: type[Model], instance_ids: list[int]) -> list[QuerySet]:
+        deleted = operation == SubtreeOperation.RESTORE_DELETED
+        manager = model.deleted_objects if deleted else model.objects
+        queryset = RecoveryService.get_objects_by_ids(manager.all(), {'instance_ids': instance_ids})
+        relations = RelationTreeMixin()
+        archiving = operation in {SubtreeOperation.ARCHIVE, SubtreeOperation.RESTORE_ARCHIVED}
+        querysets = relations.get_ordered_related_querysets(
+            queryset,
+            deleted=deleted,
+            ignore_on_delete_property=archiving,
+        )
+        if archiving:
+            querysets = [qs for qs in querysets if relations.is_archivable(qs.model)]
+        return querysets
+
+    @classmethod
+    def _apply_in_chunks(
+        cls,
+        operation: SubtreeOperation,
+        queryset: QuerySet,
+        task_id: str | None,
+    ) -> tuple[int, bool]:
+        # queryset of ltree model selects descendants by paths of roots filtered by soft delete state, roots are
+        # updated by first chunks, so pks are fetched once before update instead of paging over queryset
+        pks = list(queryset.order_by(_PK).values_list(_PK, flat=True))
+        processed = 0
+        while not cls.is_cancelled(task_id):
+            chunk = pks[processed:processed + cls.chunk_size]
+            if not chunk:
+                return processed, False
+            with transaction.atomic():
+                cls._apply(operation, queryset.model, chunk)
+            processed += len(chunk)
+        return processed, True
+
+    @classmethod
+    def _apply(cls, operation: SubtreeOperation, model: type[Model], pks: list[int]) -> None:
+        match operation:
+            case SubtreeOperation.DELETE:
+                queryset = SoftDeleteQuerySet(model=model).filter(pk__in=pks)
+                if model == TestSuite:
+                    TestSuiteService.unlink_custom_attributes(queryset)
+                queryset.delete()
+            case SubtreeOperation.ARCHIVE:
+                SoftDeleteQuerySet(model=model).filter(pk__in=pks).update(is_archive=True)
+            case SubtreeOperation.RESTORE_ARCHIVED:
+                SoftDeleteQuerySet(model=model).filter(pk__in=pks).update(is_archive=False)
+            case SubtreeOperation.RESTORE_DELETED:
+                DeletedQuerySet(model=model).restore(pk__in=pks)
@@ -30,14 +30,15 @@
 # <http://www.gnu.org/licenses/>.
 import os
 from functools import partial
-from pathlib import Path
 
 from django.db import transaction
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
+from notifications.models import Notification
 
 from testy.core.models import Attachment
-from testy.core.services.media import MediaService
+from testy.core.services.attachments import AttachmentService
+from testy.core.services.notifications import NotificationService
 
 
 @receiver(post_delete, sender=Attachment)
@@ -46,5 +47,10 @@ def auto_delete_file_on_delete(sender, instance, **kwargs):
         return False
     if os.path.isfile(instance.file.path):
         transaction.on_commit(
-            partial(MediaService.remove_media, src_file_path=Path(instance.file.path)),
+            partial(AttachmentService.remove_unreferenced_media, file=instance.file),
         )
+
+
+@receiver(post_delete, sender=Notification)
+def invalidate_unread_count_on_delete(sender, instance, **kwargs):
+    transaction.on_commit(partial(NotificationService.invalidate_unread_count, instance.recipient_id))
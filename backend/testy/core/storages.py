@@ -0,0 +1,100 @@
+# TestY TMS - Test Management System
+# Copyright (C) 2024 KNS Group LLC (YADRO)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Also add information on how to contact you by electronic and paper mail.
+#
+# If your software can interact with users remotely through a computer
+# network, you should also make sure that it provides a way for users to
+# get its source.  For example, if your program is a web application, its
+# interface could display a "Source" link that leads users to an archive
+# of the code.  There are many ways you could offer source, and different
+# solutions will be better for different programs; see section 13 for the
+# specific requirements.
+#
+# You should also get your employer (if you work as a programmer) or school,
+# if any, to sign a "copyright disclaimer" for the program, if necessary.
+# For more information on this, and how to apply and follow the GNU AGPL, see
+# <http://www.gnu.org/licenses/>.
+from hashlib import sha256
+from pathlib import PurePath
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import connection, transaction
+from django.utils.deconstruct import deconstructible
+
+from testy.utilities.string import strip_suffixes
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that keys saved files by the SHA-256 digest of their content.
+
+    Saving content that is already stored returns the existing name instead of writing a new file,
+    so identical files share a single blob on disk. Blobs are never overwritten, removing them is
+    up to the caller once nothing references them anymore.
+
+    Reuse of existing blob and removal of unreferenced one are serialized by lock_blob, so blob could
+    not be removed between reuse and commit of the row that references it.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.get_blob_name(name, content)
+        with transaction.atomic():
+            self.lock_blob(name)
+            if self.exists(name):
+                return name
+            return super().save(name, content, max_length=max_length)
+
+    @classmethod
+    def lock_blob(cls, name: str) -> None:
+        """
+        Take transaction level advisory lock on blob name.
+
+        Lock is held until outermost transaction ends, so row referencing the blob must be saved
+        in the same transaction to be visible to concurrent removal.
+
+        Args:
+            name: relative path to blob in storage.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(hashtextextended(%s, 0))', [name])
+
+    @classmethod
+    def get_blob_name(cls, name: str, content: File) -> str:
+        """
+        Get blob name for content keeping top-level media folder and suffixes of provided name.
+
+        Args:
+            name: name generated by upload_to of field.
+            content: file content to be saved.
+
+        Returns:
+            Relative path to blob in storage.
+        """
+        content_hash = sha256()
+        for chunk in content.chunks():
+            content_hash.update(chunk)
+        content.seek(0)
+        digest = content_hash.hexdigest()
+        _, suffixes = strip_suffixes(name)
+        media_name = PurePath(name).parts[0]
+        return str(PurePath(media_name, digest[:2], f'{digest}{suffixes}'))
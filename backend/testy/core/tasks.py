@@ -29,9 +29,12 @@
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
 from celery import shared_task
+from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
 
+from testy.core.choices import SubtreeOperation
 from testy.core.services.notifications import NotificationService
+from testy.core.services.subtree_jobs import SubtreeJobResult, SubtreeJobService
 from testy.users.models import User
 
 
@@ -44,3 +47,37 @@ def notify_user(event):
         actor=User.objects.get(pk=event.get('actor_id')),
         **event,
     )
+
+
+@shared_task()
+def reconcile_unread_notifications_counts():
+    NotificationService.reconcile_unread_counts()
+
+
+@shared_task(bind=True)
+def run_subtree_job(
+    self,
+    operation: str,
+    app_label: str,
+    model_name: str,
+    instance_ids: list[int],
+) -> SubtreeJobResult:
+    """
+    Delete, archive or restore instances with all related objects.
+
+    Args:
+        self: bound task reporting progress.
+        operation: SubtreeOperation value.
+        app_label: app label of instances model.
+        model_name: name of instances model.
+        instance_ids: ids of instances to apply operation to.
+
+    Returns:
+        number of processed rows and whether job was cancelled.
+    """
+    return SubtreeJobService.run(
+        SubtreeOperation(operation),
+        apps.get_model(app_label=app_label, model_name=model_name),
+        instance_ids,
+        task=self,
+    )
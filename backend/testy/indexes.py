@@ -0,0 +1,57 @@
+# TestY TMS - Test Management System
+# Copyright (C) 2024 KNS Group LLC (YADRO)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Also add information on how to contact you by electronic and paper mail.
+#
+# If your software can interact with users remotely through a computer
+# network, you should also make sure that it provides a way for users to
+# get its source.  For example, if your program is a web application, its
+# interface could display a "Source" link that leads users to an archive
+# of the code.  There are many ways you could offer source, and different
+# solutions will be better for different programs; see section 13 for the
+# specific requirements.
+#
+# You should also get your employer (if you work as a programmer) or school,
+# if any, to sign a "copyright disclaimer" for the program, if necessary.
+# For more information on this, and how to apply and follow the GNU AGPL, see
+# <http://www.gnu.org/licenses/>.
+from django.contrib.postgres.indexes import GinIndex, OpClass, PostgresIndex
+from django.db.models import TextField
+from django.db.models.functions import Cast, Upper
+
+_TRIGRAM_OPCLASS = 'gin_trgm_ops'
+
+
+def get_search_indexes(name: str, *fields: str) -> list[PostgresIndex]:
+    """
+    Get trigram indexes for fields used by search filters.
+
+    Index expression repeats the one produced by icontains lookup, so substring search is served by index.
+
+    Args:
+        name: prefix for index names.
+        fields: model fields that are searched.
+
+    Returns:
+        List of GIN indexes with pg_trgm operator class.
+    """
+    return [
+        GinIndex(
+            OpClass(Upper(Cast(field, output_field=TextField())), name=_TRIGRAM_OPCLASS),
+            name=f'{name}_{field}_trgm_idx',
+        )
+        for field in fields
+    ]
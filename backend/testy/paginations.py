@@ -28,9 +28,16 @@
 # if any, to sign a "copyright disclaimer" for the program, if necessary.
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Any
+
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
-from rest_framework.utils.urls import replace_query_param
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from testy.utilities.sql import UnionPosition
 
 
 class StandardSetPagination(PageNumberPagination):
@@ -60,3 +67,69 @@ class StandardSetPagination(PageNumberPagination):
         url = self.request.build_absolute_uri()
         page_number = self.page.previous_page_number()
         return replace_query_param(url, self.page_query_param, page_number)
+
+
+class UnionCursorPagination(StandardSetPagination):
+    """
+    Keyset pagination for plan and suite union listings.
+
+    Page is selected by position of last row from previous page in (is_leaf, name, id) ordering instead of offset,
+    total count is not calculated. Pagination is enabled by passing cursor query parameter, empty value means first
+    page.
+    """
+
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self):
+        super().__init__()
+        self.request = None
+        self.next_position = None
+
+    @classmethod
+    def is_requested(cls, request) -> bool:
+        return cls.cursor_query_param in request.query_params
+
+    def get_position(self, request) -> UnionPosition | None:
+        if request.query_params.get(self.ordering_query_param):
+            raise ValidationError('Cursor pagination supports default ordering only')
+        encoded_position = request.query_params.get(self.cursor_query_param)
+        if not encoded_position:
+            return None
+        try:
+            position = UnionPosition(*json.loads(urlsafe_b64decode(encoded_position.encode())))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        field_types = (bool, str, int)
+        if not all(map(isinstance, position, field_types)):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def paginate_queryset(self, queryset, request, view=None) -> list[dict[str, Any]]:
+        self.request = request
+        page_size = self.get_page_size(request)
+        rows = list(queryset[:page_size + 1])
+        page = rows[:page_size]
+        self.next_position = None
+        if len(rows) > page_size:
+            last_row = page[-1]
+            self.next_position = UnionPosition(last_row['is_leaf'], last_row['name'], last_row['id'])
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'links': {
+                'next': self.get_next_link(),
+                'previous': None,
+            },
+            'count': None,
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        encoded_position = urlsafe_b64encode(json.dumps(self.next_position).encode()).decode()
+        return replace_query_param(url, self.cursor_query_param, encoded_position)
@@ -61,3 +61,18 @@ DELETE_LABELED_ITEM_TRIGGER = pgtrigger.Func(
 RETURN OLD;
 END;"""
 )
+INSERT_TEST_CASE_VERSION_TRIGGER = pgtrigger.Func(
+"""BEGIN
+    INSERT INTO tests_description_testcaseversions AS versions_index (case_id, current_version, versions)
+    SELECT NEW.id, NEW.history_id, ARRAY [NEW.history_id]
+    WHERE EXISTS (SELECT 1 FROM tests_description_testcase WHERE id = NEW.id)
+    ON CONFLICT (case_id) DO UPDATE
+    SET current_version = GREATEST(versions_index.current_version, EXCLUDED.current_version),
+        versions = ARRAY(
+            SELECT version
+            FROM unnest(array_append(versions_index.versions, EXCLUDED.current_version)) AS version
+            ORDER BY version DESC
+        );
+    RETURN NULL;
+END;"""
+)
@@ -28,26 +28,87 @@
 # if any, to sign a "copyright disclaimer" for the program, if necessary.
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
+from hashlib import sha256
+from typing import Iterable, TypedDict
+
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
 from testy.root.auth.models import TTLToken
+from testy.root.selectors import TTLTokenSelector
+from testy.users.selectors.users import UserSelector
+from testy.utilities.cache import increment_counter
 
+_TOKEN_CACHE_KEY = 'auth_token_{digest}'  # noqa: S105
+_TOKEN_CACHE_HITS_KEY = 'auth_token_cache_hits'  # noqa: S105
+_TOKEN_CACHE_MISSES_KEY = 'auth_token_cache_misses'  # noqa: S105
 
-class TokenAuthenticationTTL(TokenAuthentication):
 
+class TokenCacheStats(TypedDict):
+    hits: int
+    misses: int
+
+
+class TokenAuthenticationTTL(TokenAuthentication):
     def authenticate_credentials(self, key):
-        try:
-            token = TTLToken.objects.get(key=key)
-        except TTLToken.DoesNotExist:
+        token = self.token_by_key(key)
+        if token is None:
             raise AuthenticationFailed('Invalid Token')
 
         if not token.user.is_active:
             raise AuthenticationFailed('User is not active')
 
         if timezone.now() >= token.expiration_date:
-            token.delete()
+            TTLToken.objects.filter(key=key).delete()
             raise AuthenticationFailed('The Token is expired')
 
         return token.user, token
+
+    @classmethod
+    def token_by_key(cls, key: str) -> TTLToken | None:
+        """
+        Get token with fresh user, token lookup is served from cache.
+
+        Cache holds only user id and expiration date under digest of key, user is loaded on every call
+        so changes of user made by queryset updates apply right away.
+
+        Args:
+            key: raw token key.
+
+        Returns:
+            Token or None if token or its user does not exist.
+        """
+        cache_key = cls.token_cache_key(key)
+        cached_credentials = cache.get(cache_key)
+        if cached_credentials is None:
+            increment_counter(_TOKEN_CACHE_MISSES_KEY)
+            token = TTLTokenSelector.token_by_key(key)
+            if token is not None:
+                timeout = (token.expiration_date - timezone.now()).total_seconds()
+                cache.set(cache_key, (token.user_id, token.expiration_date), min(settings.CACHE_TTL, timeout))
+            return token
+        increment_counter(_TOKEN_CACHE_HITS_KEY)
+        user_id, expiration_date = cached_credentials
+        user = UserSelector.user_by_id(user_id)
+        if user is None:
+            return None
+        return TTLToken(key=key, user=user, expiration_date=expiration_date)
+
+    @classmethod
+    def token_cache_key(cls, key: str) -> str:
+        return _TOKEN_CACHE_KEY.format(digest=sha256(key.encode()).hexdigest())
+
+    @classmethod
+    def invalidate_cached_tokens(cls, keys: Iterable[str]) -> None:
+        cache.delete_many([cls.token_cache_key(key) for key in keys])
+
+    @classmethod
+    def cache_stats(cls) -> TokenCacheStats:
+        counters = cache.get_many([_TOKEN_CACHE_HITS_KEY, _TOKEN_CACHE_MISSES_KEY])
+        return TokenCacheStats(
+            hits=counters.get(_TOKEN_CACHE_HITS_KEY, 0),
+            misses=counters.get(_TOKEN_CACHE_MISSES_KEY, 0),
+        )
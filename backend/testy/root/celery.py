@@ -49,4 +49,12 @@ app.conf.beat_schedule = {
         'task': 'testy.root.tasks.delete_expired_tokens',
         'schedule': crontab(hour=0, minute=0),
     },
+    'compact-result-statistics-hourly': {
+        'task': 'testy.tests_representation.tasks.compact_result_statistics',
+        'schedule': crontab(minute=30),  # noqa: WPS432
+    },
+    'reconcile-unread-notifications-counts-hourly': {
+        'task': 'testy.core.tasks.reconcile_unread_notifications_counts',
+        'schedule': crontab(minute=45),  # noqa: WPS432
+    },
 }
@@ -30,6 +30,13 @@
 # <http://www.gnu.org/licenses/>.
 from django.db.models import Lookup, TextField
 
+_RELATIVE_OF_ANY_SQL = """
+{lhs} IN (
+    SELECT node.{column} FROM {table} node
+    JOIN {rhs} AS selected(path) ON node.{column} {operator} selected.path
+)
+"""
+
 
 class LtreeField(TextField):
     description = 'ltree'
@@ -64,5 +71,39 @@ class Descendant(Lookup):
         return '%s <@ %s' % (lhs, rhs), params
 
 
+class _RelativeOfAny(Lookup):
+    """
+    Match nodes related to any path returned by subquery on the right hand side.
+
+    Subquery is joined to the same table on path so that each selected path is resolved with its own
+    GiST index scan, instead of comparing every row with every selected path.
+    """
+
+    operator = None
+
+    def as_sql(self, qn, connection):
+        lhs, lhs_params = self.process_lhs(qn, connection)
+        rhs, rhs_params = self.process_rhs(qn, connection)
+        field = self.lhs.output_field
+        table = connection.ops.quote_name(field.model._meta.db_table)
+        column = connection.ops.quote_name(field.column)
+        sql = _RELATIVE_OF_ANY_SQL.format(  # noqa: S608
+            lhs=lhs, rhs=rhs, table=table, column=column, operator=self.operator,
+        )
+        return sql, (*lhs_params, *rhs_params)
+
+
+class AncestorAny(_RelativeOfAny):
+    lookup_name = 'ancestor_any'
+    operator = '@>'
+
+
+class DescendantAny(_RelativeOfAny):
+    lookup_name = 'descendant_any'
+    operator = '<@'
+
+
 LtreeField.register_lookup(Descendant)
 LtreeField.register_lookup(Ancestor)
+LtreeField.register_lookup(DescendantAny)
+LtreeField.register_lookup(AncestorAny)
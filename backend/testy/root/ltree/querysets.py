@@ -28,12 +28,38 @@
 # if any, to sign a "copyright disclaimer" for the program, if necessary.
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
+from itertools import islice
+
 from django.db import models
 
+from testy.utilities.tree import prefetch_tree
+
 _PATH = 'path'
+_ITERATOR_CHUNK_SIZE = 2000
 
 
 class LtreeQuerySet(models.QuerySet):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._tree_queryset = None
+        self._tree_prefetch_done = False
+
+    def prefetch_tree(self, queryset: models.QuerySet | None = None):
+        """
+        Attach whole subtree of every fetched node as prefetched children, using one query for all levels.
+
+        With iterator() tree is prefetched for every chunk of nodes, so one descendants query is made per chunk.
+
+        Args:
+            queryset: queryset to get descendants from, default manager is used if not provided.
+
+        Returns:
+            Queryset with tree prefetch.
+        """
+        clone = self._chain()
+        clone._tree_queryset = queryset if queryset is not None else self.model._default_manager.all()
+        return clone
+
     def get_ancestors(self, include_self=False):
         return self.get_ancestors_for_qs(self, include_self).order_by(_PATH)
 
@@ -41,23 +67,39 @@ class LtreeQuerySet(models.QuerySet):
         return self.get_descendants_for_qs(self, include_self).order_by(_PATH)
 
     def get_descendants_for_qs(self, qs, include_self=False, manager_name: str = 'objects'):
-        lookup = models.Q()
-        for node_path in qs.values_list(_PATH, flat=True):
-            lookup |= models.Q(path__descendant=node_path)
-            if not include_self:
-                lookup &= ~models.Q(path=node_path)
-        if not len(lookup):
-            return qs
-        manager = getattr(qs.model, manager_name)
-        return manager.filter(lookup).order_by(_PATH)
+        return self._filter_by_paths(qs, 'path__descendant_any', include_self, manager_name)
 
     def get_ancestors_for_qs(self, qs, include_self=False, manager_name: str = 'objects'):
-        lookup = models.Q()
-        for node_path in qs.values_list(_PATH, flat=True):
-            lookup |= models.Q(path__ancestor=node_path)
-            if not include_self:
-                lookup &= ~models.Q(path=node_path)
-        if not len(lookup):
-            return qs
+        return self._filter_by_paths(qs, 'path__ancestor_any', include_self, manager_name)
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._tree_queryset = self._tree_queryset
+        return clone
+
+    def iterator(self, chunk_size=None):
+        if self._tree_queryset is None or not issubclass(self._iterable_class, models.query.ModelIterable):
+            yield from super().iterator(chunk_size)
+            return
+        chunk_size = chunk_size or _ITERATOR_CHUNK_SIZE
+        nodes = super().iterator(chunk_size)
+        while chunk := list(islice(nodes, chunk_size)):
+            prefetch_tree(chunk, self._tree_queryset)
+            yield from chunk
+
+    def _fetch_all(self):
+        super()._fetch_all()
+        if self._tree_queryset is None or self._tree_prefetch_done:
+            return
+        if issubclass(self._iterable_class, models.query.ModelIterable):
+            prefetch_tree(self._result_cache, self._tree_queryset)
+        self._tree_prefetch_done = True
+
+    @classmethod
+    def _filter_by_paths(cls, qs, lookup: str, include_self: bool, manager_name: str):
+        paths = qs.order_by().values(_PATH)
         manager = getattr(qs.model, manager_name)
-        return manager.filter(lookup).order_by(_PATH)
+        nodes = manager.filter(**{lookup: paths})
+        if not include_self:
+            nodes = nodes.exclude(path__in=paths)
+        return nodes.order_by(_PATH)
@@ -52,8 +52,49 @@ _INSERT_UPDATE_FUNC = pgtrigger.Func(
     'RETURN NEW;',
 )
 
+_TITLE_PATH_FUNC = (
+    'NEW.{path_field} = COALESCE('
+    "(SELECT {path_field} || '/' FROM {{meta.db_table}} WHERE id = NEW.parent_id), ''"
+    ') || NEW.{title_field}; '
+    'RETURN NEW;'
+)
+# Rows updated by descendants trigger already have their path set, their parent is not visible yet
+_TITLE_PATH_CASCADE_GUARD = (
+    'IF pg_trigger_depth() > 1 '
+    'AND OLD.parent_id IS NOT DISTINCT FROM NEW.parent_id '
+    'AND OLD.{title_field} IS NOT DISTINCT FROM NEW.{title_field} THEN '
+    '    RETURN NEW; '
+    'END IF; '
+)
+_TITLE_PATH_DESCENDANTS_FUNC = (
+    'UPDATE {{meta.db_table}} '
+    'SET {path_field} = NEW.{path_field} || substr({path_field}, char_length(OLD.{path_field}) + 1) '
+    'WHERE ({{columns.path}} <@ OLD.path OR {{columns.path}} <@ NEW.path) AND id != NEW.id; '
+    'RETURN NEW;'
+)
+
 
-def get_triggers(name: str) -> list[pgtrigger.Trigger]:
+def get_triggers(name: str, title_field: str = 'name') -> list[pgtrigger.Trigger]:
+    """
+    Get triggers maintaining ltree path and human-readable path of titles joined by slash.
+
+    Human-readable path is stored in {name}_path field. Postgres runs triggers of the same event in
+    alphabetical order, so title path triggers run after other triggers named {name}_title_* that may
+    change title_field. Path written by save of stale instance is recalculated as well.
+
+    Args:
+        name: model prefix for trigger names.
+        title_field: field, values of which form human-readable path.
+
+    Returns:
+        list of triggers for ltree model.
+    """
+    path_field = f'{name}_path'
+    title_changed = {f'old__{title_field}__df': pgtrigger.F(f'new__{title_field}')}
+    title_path_changed = _PARENT_DISTINCT | pgtrigger.Q(**title_changed)
+    path_changed = {f'old__{path_field}__df': pgtrigger.F(f'new__{path_field}')}
+    title_path_sql = _TITLE_PATH_FUNC.format(path_field=path_field, title_field=title_field)
+    guard_sql = _TITLE_PATH_CASCADE_GUARD.format(title_field=title_field)
     return [
         pgtrigger.Trigger(
             name=f'{name}_insert_trg',
@@ -75,4 +116,24 @@ def get_triggers(name: str) -> list[pgtrigger.Trigger]:
             condition=_PATH_DISTINCT,
             func=_DESCENDANTS_FUNC,
         ),
+        pgtrigger.Trigger(
+            name=f'{name}_title_path_insert_trg',
+            operation=pgtrigger.Insert,
+            when=pgtrigger.Before,
+            func=pgtrigger.Func(title_path_sql),
+        ),
+        pgtrigger.Trigger(
+            name=f'{name}_title_path_change_trg',
+            operation=pgtrigger.Update,
+            when=pgtrigger.Before,
+            condition=title_path_changed | pgtrigger.Q(**path_changed),
+            func=pgtrigger.Func(f'{guard_sql}{title_path_sql}'),
+        ),
+        pgtrigger.Trigger(
+            name=f'{name}_title_path_descendants_trg',
+            operation=pgtrigger.Update,
+            when=pgtrigger.After,
+            condition=title_path_changed,
+            func=pgtrigger.Func(_TITLE_PATH_DESCENDANTS_FUNC.format(path_field=path_field)),
+        ),
     ]
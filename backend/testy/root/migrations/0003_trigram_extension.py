@@ -0,0 +1,14 @@
+# Generated by Django 4.2.13 on 2026-10-18 09:12
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('testy', '0002_added_ltree'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+    ]
@@ -28,212 +28,71 @@
 # if any, to sign a "copyright disclaimer" for the program, if necessary.
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
-from typing import Any, TypedDict
 from uuid import uuid4
 
 from django.apps import apps
 from django.conf import settings
-from django.contrib.contenttypes.fields import GenericRelation
-from django.contrib.contenttypes.models import ContentType
-from django.core.cache import cache
 from django.core.exceptions import FieldDoesNotExist
-from django.db.models import CASCADE, ManyToManyRel, ManyToOneRel, Model
-from django.db.models.sql import Query
+from django.db.models import Model
+from drf_yasg.utils import swagger_auto_schema
 from rest_framework import mixins, status
 from rest_framework.decorators import action
-from rest_framework.generics import QuerySet
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from testy.core.api.v2.serializers import TaskSerializer
+from testy.core.choices import SubtreeOperation
 from testy.core.services.recovery import RecoveryService
+from testy.core.services.subtree_jobs import SubtreeJobService
+from testy.core.tasks import run_subtree_job
 from testy.paginations import StandardSetPagination
 from testy.root.api.v2.serializers import RecoveryInputSerializer
-from testy.root.ltree.models import LtreeModel
 from testy.root.models import DeletedQuerySet, SoftDeleteQuerySet
+from testy.root.relations import CacheReadyQuerySet, QuerySetInfo, QuerySetMeta, RelationTreeMixin
 from testy.swagger.core import preview_schema
 from testy.tests_description.models import TestSuite
 from testy.tests_description.services.suites import TestSuiteService
 
-UniqueRelationSet = set[ManyToOneRel | GenericRelation | ManyToManyRel]
-_TARGET_OBJECT = 'target_object'
+_DELETE_CACHE = 'delete_cache'
+_ARCHIVE_CACHE = 'archive_cache'
 _POST = 'post'
 
 
-class TargetObject(TypedDict):
-    app_label: str
-    model: str
-    pk: Any
-
-
-class QuerySetMeta(TypedDict):
-    app_label: str
-    model: str
-    query: Query
-
-
-class QuerySetInfo(TypedDict):
-    verbose_name: str
-    verbose_name_related_model: str
-    count: int
-
-
-class MetaForCaching(TypedDict):
-    target_object: TargetObject
-    querysets_meta: list[QuerySetMeta]
-
-
-CacheReadyQuerySet = tuple[list[QuerySetMeta], list[QuerySetInfo]]
-
-
-class RelationTreeMixin:
-    def build_relation_tree(self, model, tree: list | None = None) -> UniqueRelationSet:  # noqa: WPS231
-        """
-        Build tree of relations by model to prevent duplicate recursive queries gathering.
-
-        Args:
-            model: model class.
-            tree: list of gathered relations.
-
-        Returns:
-            set of different gathered relations.
-        """
-        if not tree:
-            tree = []
-        related_objects = list(model._meta.related_objects)
-        related_objects.extend(model._meta.private_fields)
-        for single_object in related_objects:
-            if not isinstance(single_object, GenericRelation):
-                # on_delete option is kept in identity with index 6
-                if not single_object.identity[6] == CASCADE:  # noqa: WPS508
-                    continue
-            if single_object.model == single_object.related_model:
-                continue
-            self._check_for_relation(single_object, tree)
-            if single_object.related_model._meta.related_objects:
-                self.build_relation_tree(single_object.related_model, tree)
-        return set(tree)
-
-    def get_all_related_querysets(  # noqa: WPS231
+class SubtreeJobMixin:
+    def dispatch_subtree_job(
         self,
-        qs,
-        model,
-        qs_info_list: list[QuerySetInfo] | None = None,
-        qs_meta_list: list[QuerySetMeta] | None = None,
-        deleted: bool = False,
-        relation_tree=None,
-        ignore_on_delete_property: bool = False,
-    ) -> CacheReadyQuerySet:
-        """
-        Recursive function to get all related objects of instance as list of querysets.
-
-        Args:
-            qs: queryset or instance to find related objects for.
-            model: model in which we are looking for relations.
-            qs_info_list: list of descriptions of elements to be deleted.
-            qs_meta_list: meta information to restore querysets from cache.
-            deleted: defines which manager to use for getting querysets.
-            relation_tree: List of relations to avoid duplicate querysets.
-            ignore_on_delete_property: ignore on_delete property in gathering related querysets.
-
-        Returns:
-            List of querysets.
-        """
-        manager = 'deleted_objects' if deleted else 'objects'
-        if qs_info_list is None:
-            qs_info_list = []
-        if qs_meta_list is None:
-            qs_meta_list = []
-        related_objects = list(model._meta.related_objects)
-        related_objects.extend(model._meta.private_fields)
-        for single_object in related_objects:
-            if not isinstance(single_object, GenericRelation):
-                if not single_object.identity[6] == CASCADE and not ignore_on_delete_property:  # noqa: WPS508
-                    continue
-            if single_object.model == single_object.related_model:
-                continue
-            if single_object not in relation_tree:
-                continue
-            if isinstance(single_object, GenericRelation):
-                filter_option = {
-                    f'{single_object.object_id_field_name}__in': [instance.id for instance in qs],
-                    f'{single_object.content_type_field_name}': ContentType.objects.get_for_model(model),
-                }
-            else:
-                filter_option = {f'{single_object.field.attname}__in': [instance.id for instance in qs]}  # noqa: WPS237
-
-            if isinstance(single_object.related_model, LtreeModel):
-                new_qs = getattr(single_object.related_model, manager).filter(**filter_option).get_descendants(
-                    include_self=True,
-                )
-            else:
-                new_qs = getattr(single_object.related_model, manager).filter(**filter_option)
-            model_meta_data = single_object.related_model._meta
-            qs_info_list.append(
-                QuerySetInfo(
-                    verbose_name=model_meta_data.verbose_name,
-                    verbose_name_related_model=single_object.model._meta.verbose_name_plural,
-                    count=new_qs.count(),
-                ),
-            )
-            qs_meta_list.append(
-                QuerySetMeta(
-                    app_label=model_meta_data.app_label,
-                    model=model_meta_data.model_name,
-                    query=new_qs.query,
-                ),
-            )
-            if single_object.related_model._meta.related_objects:
-                self.get_all_related_querysets(
-                    qs=new_qs,
-                    model=single_object.related_model,
-                    qs_info_list=qs_info_list,
-                    qs_meta_list=qs_meta_list,
-                    deleted=deleted,
-                    relation_tree=relation_tree,
-                    ignore_on_delete_property=ignore_on_delete_property,
-                )
-        return qs_meta_list, qs_info_list
-
-    @classmethod
-    def _check_for_relation(cls, new_relation: GenericRelation | ManyToManyRel | ManyToOneRel, relations):
-        """
-        Decide if new gathered relation clashes with previously found relations.
-
-        Args:
-            new_relation: newly found relation
-            relations: already gathered relations
-        """
-        if isinstance(new_relation, GenericRelation):
-            relations.append(new_relation)
-            return
-        for idx, relation in enumerate(relations):
-            if new_relation.related_model != relation.related_model:
-                continue
-            if new_relation.model == relation.model:
-                return
-            if new_relation.model.ModelHierarchyWeightMeta.weight > relation.model.ModelHierarchyWeightMeta.weight:
-                relations[idx] = new_relation
-        relations.append(new_relation)
-
-    @classmethod
-    def _get_instance_from_metadata(cls, meta_data: TargetObject) -> Model:
-        model = apps.get_model(app_label=meta_data.get('app_label'), model_name=meta_data.get('model'))
-        return model.objects.get(pk=meta_data.get('pk'))
+        operation: SubtreeOperation,
+        model: type[Model],
+        instance_ids: list[int],
+    ) -> Response:
+        task_id = uuid4().hex
+        SubtreeJobService.register(task_id, self.request.user.pk)
+        run_subtree_job.apply_async(
+            kwargs={
+                'operation': operation.value,
+                'app_label': model._meta.app_label,
+                'model_name': model._meta.model_name,
+                'instance_ids': instance_ids,
+            },
+            task_id=task_id,
+        )
+        return Response(TaskSerializer({'task_id': task_id}).data, status=status.HTTP_202_ACCEPTED)
 
-    @classmethod
-    def _get_qs_from_meta_data(cls, meta_data: QuerySetMeta, qs_class: type[QuerySet]) -> QuerySet[Model]:
-        model = apps.get_model(app_label=meta_data.get('app_label'), model_name=meta_data.get('model'))
-        return qs_class(model=model, query=meta_data.get('query'))
+    def get_recovery_instance_ids(self) -> list[int]:
+        serializer = RecoveryInputSerializer(data=self.request.data)
+        serializer.is_valid(raise_exception=True)
+        instance_ids = serializer.validated_data['instance_ids']
+        return list(self.get_queryset().filter(pk__in=instance_ids).values_list('pk', flat=True))
 
 
-class TestyDestroyModelMixin(RelationTreeMixin):
+class TestyDestroyModelMixin(RelationTreeMixin, SubtreeJobMixin):
 
     def destroy(self, request, pk, *args, **kwargs):  # noqa: WPS231
         """
         Replace default destroy method.
 
-        Replacement for default destroy action, if user retrieved deleted objects, we save gathered querysets to
-        cache and if he submits deletion within time gap use user cookie to retrieve cache and delete objects.
+        Replacement for default destroy action, if user retrieved deleted objects, preview plan is cached and
+        objects are gathered from plan if it still matches target object, otherwise from target object itself.
 
         Args:
             request: Django request object
@@ -244,27 +103,29 @@ class TestyDestroyModelMixin(RelationTreeMixin):
         Returns:
             Response with no content status code
         """
-        querysets_to_delete: list[QuerySet] = []
         target_object = self.get_object()
-        cache_key = request.COOKIES.get('delete_cache')
-        if cache_key and cache.get(cache_key):
-            meta_to_delete: MetaForCaching = cache.get(cache_key)
-            if self._get_instance_from_metadata(meta_to_delete.get(_TARGET_OBJECT)) == target_object:
-                for elem in meta_to_delete['querysets_meta']:
-                    querysets_to_delete.append(
-                        self._get_qs_from_meta_data(elem, qs_class=SoftDeleteQuerySet),
-                    )
-            cache.delete(cache_key)
-        if not querysets_to_delete:
-            meta_querysets, _ = self.get_deleted_objects()
-            for meta_data in meta_querysets:
-                querysets_to_delete.append(self._get_qs_from_meta_data(meta_data, SoftDeleteQuerySet))
-        for related_qs in querysets_to_delete:
+        plan = self.pop_preview_plan(request.COOKIES.get(_DELETE_CACHE), target_object)
+        if plan is None:
+            qs = RecoveryService.get_objects_by_instance(target_object)
+        else:
+            qs = self.get_plan_queryset(plan)
+        for related_qs in self.get_ordered_related_querysets(qs):
             if related_qs.model == TestSuite:
                 TestSuiteService.unlink_custom_attributes(related_qs)
             related_qs.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @swagger_auto_schema(responses={status.HTTP_202_ACCEPTED: TaskSerializer()})
+    @action(
+        methods=['delete'],
+        url_path='delete/async',
+        url_name='delete-async',
+        detail=True,
+    )
+    def destroy_async(self, request, pk):
+        target_object = self.get_object()
+        return self.dispatch_subtree_job(SubtreeOperation.DELETE, type(target_object), [target_object.pk])
+
     @preview_schema
     @action(
         methods=['get'],
@@ -274,7 +135,7 @@ class TestyDestroyModelMixin(RelationTreeMixin):
     )
     def delete_preview(self, request, pk):
         """
-        Get preview of objects to delete, retrieved querysets are cached.
+        Get preview of objects to delete, plan of deletion is cached.
 
         Args:
             request: django request
@@ -283,20 +144,10 @@ class TestyDestroyModelMixin(RelationTreeMixin):
         Returns:
             Tuple of querysets to be deleted and response info
         """
-        qs_meta_list, qs_info_list = self.get_deleted_objects()
-        target_object = self.get_object()
-        meta_for_deletion = MetaForCaching(
-            target_object=TargetObject(
-                model=target_object._meta.model_name,
-                app_label=target_object._meta.app_label,
-                pk=target_object.pk,
-            ),
-            querysets_meta=qs_meta_list,
-        )
-        cache_key = uuid4().hex
-        cache.set(cache_key, meta_for_deletion)
+        _, qs_info_list = self.get_deleted_objects()
+        plan = self.build_preview_plan(self.get_object(), [info['count'] for info in qs_info_list])
         response = Response(data=qs_info_list)
-        response.set_cookie('delete_cache', cache_key, max_age=settings.CACHE_TTL)
+        response.set_cookie(_DELETE_CACHE, self.cache_preview_plan(plan), max_age=settings.CACHE_TTL)
         return response
 
     @action(
@@ -338,7 +189,7 @@ class TestyDestroyModelMixin(RelationTreeMixin):
         return qs_meta_list, qs_info_list
 
 
-class TestyArchiveMixin(RelationTreeMixin):
+class TestyArchiveMixin(RelationTreeMixin, SubtreeJobMixin):
 
     @preview_schema
     @action(
@@ -348,20 +199,10 @@ class TestyArchiveMixin(RelationTreeMixin):
         detail=True,
     )
     def archive_preview(self, request, pk):
-        target_object = self.get_object()
-        qs_meta_list, qs_info_list = self.get_objects_to_archive()
-        meta_for_caching = MetaForCaching(
-            target_object=TargetObject(
-                model=target_object._meta.model_name,
-                app_label=target_object._meta.app_label,
-                pk=target_object.pk,
-            ),
-            querysets_meta=qs_meta_list,
-        )
-        cache_key = uuid4().hex
-        cache.set(cache_key, meta_for_caching)
+        _, qs_info_list = self.get_objects_to_archive()
+        plan = self.build_preview_plan(self.get_object(), [info['count'] for info in qs_info_list])
         response = Response(data=qs_info_list)
-        response.set_cookie('archive_cache', cache_key, max_age=settings.CACHE_TTL)
+        response.set_cookie(_ARCHIVE_CACHE, self.cache_preview_plan(plan), max_age=settings.CACHE_TTL)
         return response
 
     @action(
@@ -371,24 +212,28 @@ class TestyArchiveMixin(RelationTreeMixin):
         detail=True,
     )
     def archive_objects(self, request, pk):
-        querysets_to_archive: list[QuerySet[Model]] = []
         target_object = self.get_object()
-        cache_key = request.COOKIES.get('archive_cache')
-        if cache_key and cache.get(cache_key):
-            meta_to_archive: MetaForCaching = cache.get(cache_key, {})
-            if self._get_instance_from_metadata(meta_to_archive.get(_TARGET_OBJECT)) == target_object:
-                querysets_to_archive = [
-                    self._get_qs_from_meta_data(elem, SoftDeleteQuerySet) for elem in meta_to_archive['querysets_meta']
-                ]
-            cache.delete(cache_key)
-        if not querysets_to_archive:
-            meta_objects, _ = self.get_objects_to_archive()
-            for meta_data in meta_objects:
-                querysets_to_archive.append(self._get_qs_from_meta_data(meta_data, SoftDeleteQuerySet))
-        for related_qs in querysets_to_archive:
-            related_qs.update(is_archive=True)
+        plan = self.pop_preview_plan(request.COOKIES.get(_ARCHIVE_CACHE), target_object)
+        if plan is None:
+            qs = RecoveryService.get_objects_by_instance(target_object)
+        else:
+            qs = self.get_plan_queryset(plan)
+        for related_qs in self.get_ordered_related_querysets(qs, ignore_on_delete_property=True):
+            if self.is_archivable(related_qs.model):
+                related_qs.update(is_archive=True)
         return Response(status=status.HTTP_200_OK)
 
+    @swagger_auto_schema(responses={status.HTTP_202_ACCEPTED: TaskSerializer()})
+    @action(
+        methods=[_POST],
+        url_path='archive/async',
+        url_name='archive-async',
+        detail=True,
+    )
+    def archive_async(self, request, pk):
+        target_object = self.get_object()
+        return self.dispatch_subtree_job(SubtreeOperation.ARCHIVE, type(target_object), [target_object.pk])
+
     @action(
         methods=[_POST],
         url_path='archive/restore',
@@ -417,6 +262,20 @@ class TestyArchiveMixin(RelationTreeMixin):
         qs.update(is_archive=False)
         return Response(status=status.HTTP_200_OK)
 
+    @swagger_auto_schema(responses={status.HTTP_202_ACCEPTED: TaskSerializer()})
+    @action(
+        methods=[_POST],
+        url_path='archive/restore/async',
+        url_name='archive-restore-async',
+        detail=False,
+    )
+    def restore_archived_async(self, request):
+        return self.dispatch_subtree_job(
+            SubtreeOperation.RESTORE_ARCHIVED,
+            self.get_queryset().model,
+            self.get_recovery_instance_ids(),
+        )
+
     def get_objects_to_archive(self) -> CacheReadyQuerySet:
         instance = self.get_object()
         qs = RecoveryService.get_objects_by_instance(instance)
@@ -446,19 +305,14 @@ class TestyArchiveMixin(RelationTreeMixin):
         result_meta_list = []
         result_info_list = []
         for meta, info in zip(qs_meta_list, qs_info_list):
-            try:
-                apps.get_model(
-                    meta.get('app_label'),
-                    meta.get('model'),
-                )._meta.get_field('is_archive')
-            except FieldDoesNotExist:
+            if not self.is_archivable(apps.get_model(meta.get('app_label'), meta.get('model'))):
                 continue
             result_meta_list.append(meta)
             result_info_list.append(info)
         return result_meta_list, result_info_list
 
 
-class TestyRestoreModelMixin(RelationTreeMixin):
+class TestyRestoreModelMixin(RelationTreeMixin, SubtreeJobMixin):
 
     @action(
         methods=[_POST],
@@ -481,6 +335,20 @@ class TestyRestoreModelMixin(RelationTreeMixin):
             related_qs.restore()
         return Response(status=status.HTTP_200_OK)
 
+    @swagger_auto_schema(responses={status.HTTP_202_ACCEPTED: TaskSerializer()})
+    @action(
+        methods=[_POST],
+        url_path='deleted/recover/async',
+        url_name='deleted-recover-async',
+        detail=False,
+    )
+    def restore_async(self, request):
+        return self.dispatch_subtree_job(
+            SubtreeOperation.RESTORE_DELETED,
+            self.get_queryset().model,
+            self.get_recovery_instance_ids(),
+        )
+
     @action(
         methods=['get'],
         url_path='deleted',
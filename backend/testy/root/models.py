@@ -37,6 +37,8 @@ from typing import Any, TypeVar
 from django.db import models, transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from pgtrigger import Trigger
+from simple_history.models import HistoricalRecords
 
 from testy.root.ltree.managers import LtreeManager
 from testy.root.ltree.models import LtreeModel
@@ -247,3 +249,16 @@ class LtreeBaseModel(LtreeModel, BaseModel):
 
     class Meta:
         abstract = True
+
+
+class TriggeredHistoricalRecords(HistoricalRecords):
+    """Historical records whose generated model declares database triggers in its Meta."""
+
+    def __init__(self, *args, triggers: list[Trigger] | None = None, **kwargs):
+        self.triggers = triggers or []
+        super().__init__(*args, **kwargs)
+
+    def get_meta_options(self, model):
+        meta_fields = super().get_meta_options(model)
+        meta_fields['triggers'] = self.triggers
+        return meta_fields
@@ -29,13 +29,18 @@
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
 from django.db import models
+from django.dispatch import Signal
 from django.utils import timezone
 
 from testy.root.ltree.querysets import LtreeQuerySet
 
+# Sent with queryset before its rows are soft deleted or restored, queryset update does not send model signals
+pre_soft_delete_change = Signal()
+
 
 class SoftDeleteQuerySet(models.query.QuerySet):
     def delete(self, cascade=None):
+        pre_soft_delete_change.send(sender=self.model, queryset=self)
         return self.update(is_deleted=True, deleted_at=timezone.now())
 
     def hard_delete(self):
@@ -49,6 +54,7 @@ class SoftDeleteTreeQuerySet(LtreeQuerySet, SoftDeleteQuerySet):
 class DeletedQuerySet(models.query.QuerySet):
     def restore(self, *args, **kwargs):
         qs = self.filter(*args, **kwargs)
+        pre_soft_delete_change.send(sender=self.model, queryset=qs)
         qs.update(is_deleted=False, deleted_at=None)
 
     def hard_delete(self):
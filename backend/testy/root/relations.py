@@ -0,0 +1,333 @@
+# TestY TMS - Test Management System
+# Copyright (C) 2024 KNS Group LLC (YADRO)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Also add information on how to contact you by electronic and paper mail.
+#
+# If your software can interact with users remotely through a computer
+# network, you should also make sure that it provides a way for users to
+# get its source.  For example, if your program is a web application, its
+# interface could display a "Source" link that leads users to an archive
+# of the code.  There are many ways you could offer source, and different
+# solutions will be better for different programs; see section 13 for the
+# specific requirements.
+#
+# You should also get your employer (if you work as a programmer) or school,
+# if any, to sign a "copyright disclaimer" for the program, if necessary.
+# For more information on this, and how to apply and follow the GNU AGPL, see
+# <http://www.gnu.org/licenses/>.
+import logging
+from typing import Any, TypedDict
+from uuid import uuid4
+
+import orjson
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import CASCADE, ManyToManyRel, ManyToOneRel, Model
+from django.db.models.sql import Query
+from rest_framework.generics import QuerySet
+
+from testy.root.ltree.models import LtreeModel
+from testy.root.querysets import DeletedQuerySet, SoftDeleteQuerySet
+from testy.utilities.cache import increment_counter
+
+logger = logging.getLogger(__name__)
+
+UniqueRelationSet = set[ManyToOneRel | GenericRelation | ManyToManyRel]
+
+_PREVIEW_HITS_KEY = 'relation_preview_cache_hits'
+_PREVIEW_MISSES_KEY = 'relation_preview_cache_misses'
+
+
+class PreviewPlan(TypedDict):
+    model: str
+    pk: Any
+    path: str | None
+    counts: list[int]
+
+
+class PreviewCacheStats(TypedDict):
+    hits: int
+    misses: int
+
+
+class QuerySetMeta(TypedDict):
+    app_label: str
+    model: str
+    query: Query
+
+
+class QuerySetInfo(TypedDict):
+    verbose_name: str
+    verbose_name_related_model: str
+    count: int | None
+
+
+CacheReadyQuerySet = tuple[list[QuerySetMeta], list[QuerySetInfo]]
+
+
+class RelationTreeMixin:
+    def build_relation_tree(self, model, tree: list | None = None) -> UniqueRelationSet:  # noqa: WPS231
+        """
+        Build tree of relations by model to prevent duplicate recursive queries gathering.
+
+        Args:
+            model: model class.
+            tree: list of gathered relations.
+
+        Returns:
+            set of different gathered relations.
+        """
+        if not tree:
+            tree = []
+        related_objects = list(model._meta.related_objects)
+        related_objects.extend(model._meta.private_fields)
+        for single_object in related_objects:
+            if not isinstance(single_object, GenericRelation):
+                # on_delete option is kept in identity with index 6
+                if not single_object.identity[6] == CASCADE:  # noqa: WPS508
+                    continue
+            if single_object.model == single_object.related_model:
+                continue
+            self._check_for_relation(single_object, tree)
+            if single_object.related_model._meta.related_objects:
+                self.build_relation_tree(single_object.related_model, tree)
+        return set(tree)
+
+    def get_all_related_querysets(  # noqa: WPS231
+        self,
+        qs,
+        model,
+        qs_info_list: list[QuerySetInfo] | None = None,
+        qs_meta_list: list[QuerySetMeta] | None = None,
+        deleted: bool = False,
+        relation_tree=None,
+        ignore_on_delete_property: bool = False,
+        lazy: bool = False,
+    ) -> CacheReadyQuerySet:
+        """
+        Recursive function to get all related objects of instance as list of querysets.
+
+        Args:
+            qs: queryset or instance to find related objects for.
+            model: model in which we are looking for relations.
+            qs_info_list: list of descriptions of elements to be deleted.
+            qs_meta_list: meta information to restore querysets from cache.
+            deleted: defines which manager to use for getting querysets.
+            relation_tree: List of relations to avoid duplicate querysets.
+            ignore_on_delete_property: ignore on_delete property in gathering related querysets.
+            lazy: filter related querysets by subqueries and skip counting, nothing is fetched while gathering.
+                Querysets have to be processed from the last one, because related querysets depend on previous ones.
+
+        Returns:
+            List of querysets.
+        """
+        manager = 'deleted_objects' if deleted else 'objects'
+        if qs_info_list is None:
+            qs_info_list = []
+        if qs_meta_list is None:
+            qs_meta_list = []
+        related_objects = list(model._meta.related_objects)
+        related_objects.extend(model._meta.private_fields)
+        for single_object in related_objects:
+            if not isinstance(single_object, GenericRelation):
+                if not single_object.identity[6] == CASCADE and not ignore_on_delete_property:  # noqa: WPS508
+                    continue
+            if single_object.model == single_object.related_model:
+                continue
+            if single_object not in relation_tree:
+                continue
+            if isinstance(single_object, GenericRelation):
+                filter_option = {
+                    f'{single_object.object_id_field_name}__in': self._get_parent_ids(qs, lazy),
+                    f'{single_object.content_type_field_name}': ContentType.objects.get_for_model(model),
+                }
+            else:
+                filter_option = {f'{single_object.field.attname}__in': self._get_parent_ids(qs, lazy)}  # noqa: WPS237
+
+            if isinstance(single_object.related_model, LtreeModel):
+                new_qs = getattr(single_object.related_model, manager).filter(**filter_option).get_descendants(
+                    include_self=True,
+                )
+            else:
+                new_qs = getattr(single_object.related_model, manager).filter(**filter_option)
+            model_meta_data = single_object.related_model._meta
+            qs_info_list.append(
+                QuerySetInfo(
+                    verbose_name=model_meta_data.verbose_name,
+                    verbose_name_related_model=single_object.model._meta.verbose_name_plural,
+                    count=None if lazy else new_qs.count(),
+                ),
+            )
+            qs_meta_list.append(
+                QuerySetMeta(
+                    app_label=model_meta_data.app_label,
+                    model=model_meta_data.model_name,
+                    query=new_qs.query,
+                ),
+            )
+            if single_object.related_model._meta.related_objects:
+                self.get_all_related_querysets(
+                    qs=new_qs,
+                    model=single_object.related_model,
+                    qs_info_list=qs_info_list,
+                    qs_meta_list=qs_meta_list,
+                    deleted=deleted,
+                    relation_tree=relation_tree,
+                    ignore_on_delete_property=ignore_on_delete_property,
+                    lazy=lazy,
+                )
+        return qs_meta_list, qs_info_list
+
+    def get_ordered_related_querysets(
+        self,
+        qs: QuerySet[Model],
+        deleted: bool = False,
+        ignore_on_delete_property: bool = False,
+    ) -> list[QuerySet[Model]]:
+        """
+        Get querysets of qs objects and all their related objects without fetching anything.
+
+        Related querysets are filtered by subqueries of their parents, so they are ordered from the deepest relation
+        to qs itself and have to be updated or deleted in this order.
+
+        Args:
+            qs: queryset of source objects.
+            deleted: defines which manager to use for getting querysets.
+            ignore_on_delete_property: ignore on_delete property in gathering related querysets.
+
+        Returns:
+            List of querysets, qs is the last one.
+        """
+        qs_meta_list, _ = self.get_all_related_querysets(
+            qs,
+            qs.model,
+            deleted=deleted,
+            relation_tree=self.build_relation_tree(qs.model),
+            ignore_on_delete_property=ignore_on_delete_property,
+            lazy=True,
+        )
+        qs_class = DeletedQuerySet if deleted else SoftDeleteQuerySet
+        querysets = [self._get_qs_from_meta_data(meta_data, qs_class) for meta_data in reversed(qs_meta_list)]
+        querysets.append(qs)
+        return querysets
+
+    @classmethod
+    def build_preview_plan(cls, instance: Model, counts: list[int]) -> PreviewPlan:
+        return PreviewPlan(
+            model=instance._meta.label_lower,
+            pk=instance.pk,
+            path=instance.path if isinstance(instance, LtreeModel) else None,
+            counts=counts,
+        )
+
+    @classmethod
+    def cache_preview_plan(cls, plan: PreviewPlan) -> str:
+        cache_key = uuid4().hex
+        cache.set(cache_key, orjson.dumps(plan), timeout=settings.CACHE_TTL)
+        return cache_key
+
+    @classmethod
+    def pop_preview_plan(cls, cache_key: str | None, instance: Model) -> PreviewPlan | None:
+        """
+        Get preview plan of instance from cache, plan is removed from cache to be used once.
+
+        Plan made for other instance or for instance that was moved in tree after preview is a miss.
+
+        Args:
+            cache_key: key of plan set to cookie by preview.
+            instance: instance that is going to be processed.
+
+        Returns:
+            plan if it was found and matches instance, None otherwise.
+        """
+        cached_plan = cache.get(cache_key) if cache_key else None
+        if cached_plan is not None:
+            cache.delete(cache_key)
+            plan: PreviewPlan = orjson.loads(cached_plan)
+            if plan == cls.build_preview_plan(instance, plan['counts']):
+                increment_counter(_PREVIEW_HITS_KEY)
+                logger.info(f'Processing previewed {plan["model"]} {plan["pk"]} with {sum(plan["counts"])} objects')
+                return plan
+        increment_counter(_PREVIEW_MISSES_KEY)
+        return None
+
+    @classmethod
+    def get_plan_queryset(cls, plan: PreviewPlan) -> QuerySet[Model]:
+        """
+        Rebuild queryset of previewed objects from plan without fetching target object paths again.
+
+        Args:
+            plan: plan returned by pop_preview_plan, so its pk and path match current target object.
+
+        Returns:
+            Queryset of target object and its descendants for ltree models.
+        """
+        model = apps.get_model(plan['model'])
+        if plan['path'] is None:
+            return model.objects.filter(pk=plan['pk'])
+        return model.objects.filter(path__descendant=plan['path'])
+
+    @classmethod
+    def preview_cache_stats(cls) -> PreviewCacheStats:
+        counters = cache.get_many([_PREVIEW_HITS_KEY, _PREVIEW_MISSES_KEY])
+        return PreviewCacheStats(
+            hits=counters.get(_PREVIEW_HITS_KEY, 0),
+            misses=counters.get(_PREVIEW_MISSES_KEY, 0),
+        )
+
+    @classmethod
+    def is_archivable(cls, model: type[Model]) -> bool:
+        try:
+            model._meta.get_field('is_archive')
+        except FieldDoesNotExist:
+            return False
+        return True
+
+    @classmethod
+    def _get_parent_ids(cls, qs, lazy: bool):
+        if lazy:
+            return qs.values('pk')
+        return [instance.id for instance in qs]
+
+    @classmethod
+    def _check_for_relation(cls, new_relation: GenericRelation | ManyToManyRel | ManyToOneRel, relations):
+        """
+        Decide if new gathered relation clashes with previously found relations.
+
+        Args:
+            new_relation: newly found relation
+            relations: already gathered relations
+        """
+        if isinstance(new_relation, GenericRelation):
+            relations.append(new_relation)
+            return
+        for idx, relation in enumerate(relations):
+            if new_relation.related_model != relation.related_model:
+                continue
+            if new_relation.model == relation.model:
+                return
+            if new_relation.model.ModelHierarchyWeightMeta.weight > relation.model.ModelHierarchyWeightMeta.weight:
+                relations[idx] = new_relation
+        relations.append(new_relation)
+
+    @classmethod
+    def _get_qs_from_meta_data(cls, meta_data: QuerySetMeta, qs_class: type[QuerySet]) -> QuerySet[Model]:
+        model = apps.get_model(app_label=meta_data.get('app_label'), model_name=meta_data.get('model'))
+        return qs_class(model=model, query=meta_data.get('query'))
@@ -38,3 +38,7 @@ class TTLTokenSelector:
     @classmethod
     def token_list_by_user_id(cls, user_id: int) -> QuerySet[TTLToken]:
         return TTLToken.objects.filter(user__pk=user_id)
+
+    @classmethod
+    def token_by_key(cls, key: str) -> TTLToken | None:
+        return TTLToken.objects.select_related('user').filter(key=key).first()
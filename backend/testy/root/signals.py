@@ -31,8 +31,12 @@
 import logging
 
 from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from testy.root.auth.auth_classes import TokenAuthenticationTTL
+from testy.root.auth.models import TTLToken
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,3 +54,9 @@ def unsuccessful_login(credentials, *args, **kwargs):
 @receiver(user_logged_out)
 def user_logout(user, *args, **kwargs):
     logger.info(f'User logged out. Username = {user.username}')
+
+
+@receiver(post_save, sender=TTLToken)
+@receiver(post_delete, sender=TTLToken)
+def reset_cached_token(sender, instance, **kwargs):
+    TokenAuthenticationTTL.invalidate_cached_tokens([instance.key])
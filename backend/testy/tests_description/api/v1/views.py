@@ -121,9 +121,9 @@ class TestCaseViewSet(TestyModelViewSet, TestyArchiveMixin):
             return TestCaseHistoryFilter
 
     def get_queryset(self):
-        if self.action in {'recovery_list', 'restore', 'delete_permanently'}:
+        if self.action in {'recovery_list', 'restore', 'restore_async', 'delete_permanently'}:
             return TestCaseSelector().case_deleted_list()
-        if self.action == 'restore_archived':
+        if self.action in {'restore_archived', 'restore_archived_async'}:
             return TestCaseSelector().case_list({_IS_ARCHIVE: True})
         if self.action == 'cases_search':
             return TestCaseSelector().case_list_with_label_names()
@@ -317,7 +317,7 @@ class TestSuiteViewSet(TestyModelViewSet):
 
     def get_queryset(self):
         treeview = get_boolean(self.request, 'treeview')
-        if self.action in {'recovery_list', 'restore', 'delete_permanently'}:
+        if self.action in {'recovery_list', 'restore', 'restore_async', 'delete_permanently'}:
             return TestSuiteSelector().suite_deleted_list()
         if treeview and self.action == _LIST:
             parent = self.request.query_params.get('parent')
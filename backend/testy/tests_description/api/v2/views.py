@@ -28,12 +28,11 @@
 # if any, to sign a "copyright disclaimer" for the program, if necessary.
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
-import logging
 from functools import partial
 
-import orjson
-from django.db.models import F
-from django.http import HttpResponse
+from django.db.models import BigIntegerField, F
+from django.db.models.functions import Cast
+from django.http import StreamingHttpResponse
 from django_filters import CharFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg.utils import swagger_auto_schema
@@ -45,7 +44,7 @@ from simple_history.utils import get_history_model_for_model
 
 from testy.core.services.copy import CopyService
 from testy.filters import TestyFilterBackend
-from testy.paginations import StandardSetPagination
+from testy.paginations import StandardSetPagination, UnionCursorPagination
 from testy.root.mixins import TestyArchiveMixin, TestyModelViewSet
 from testy.swagger.serializers import TestWithBreadcrumbsSerializer
 from testy.swagger.v2.cases import (
@@ -98,7 +97,8 @@ from testy.tests_representation.models import Test
 from testy.tests_representation.selectors.testplan import TestPlanSelector
 from testy.tests_representation.selectors.tests import TestSelector
 from testy.utilities.request import get_boolean, get_integer, validate_query_params_data
-from testy.utilities.tree import get_breadcrumbs_treeview
+from testy.utilities.sql import ArrayPosition
+from testy.utilities.tree import get_breadcrumbs_treeview, order_depth_first, stream_tree_with_leaves
 
 _USER = 'user'
 _GET = 'get'
@@ -109,8 +109,6 @@ _IS_ARCHIVE = 'is_archive'
 _NAME = 'name'
 _ID = 'id'
 
-logger = logging.getLogger(__name__)
-
 
 class TestCaseViewSet(TestyModelViewSet, TestyArchiveMixin):
     queryset = TestCaseSelector().case_list()
@@ -136,9 +134,9 @@ class TestCaseViewSet(TestyModelViewSet, TestyArchiveMixin):
 
     def get_queryset(self):
         match self.action:
-            case 'recovery_list' | 'restore' | 'delete_permanently':
+            case 'recovery_list' | 'restore' | 'restore_async' | 'delete_permanently':
                 return TestCaseSelector().case_deleted_list()
-            case 'restore_archived':
+            case 'restore_archived' | 'restore_archived_async':
                 return TestCaseSelector().case_list({_IS_ARCHIVE: True})
             case 'cases_search':
                 return TestCaseSelector().case_list_with_label_names()
@@ -148,7 +146,7 @@ class TestCaseViewSet(TestyModelViewSet, TestyArchiveMixin):
                 return Test.objects.none()
 
         qs = TestCaseSelector().case_list()
-        return TestSuiteSelector.annotate_suite_path(qs, 'suite__path')
+        return TestSuiteSelector.annotate_suite_path(qs, 'suite')
 
     def get_serializer_class(self):
         match self.action:
@@ -221,7 +219,7 @@ class TestCaseViewSet(TestyModelViewSet, TestyArchiveMixin):
     @action(methods=[_GET], url_path='tests', url_name='tests', detail=True, suffix='List')
     def get_tests(self, request, pk):
         qs = TestSelector().test_list_with_last_status(filter_condition={'case_id': pk})
-        qs = TestSuiteSelector.annotate_suite_path(qs, 'case__suite__path')
+        qs = TestSuiteSelector.annotate_suite_path(qs, 'case__suite')
         page = self.paginate_queryset(self.filter_queryset(qs))
         serializer = TestSerializer(page, many=True, context=self.get_serializer_context())
         response_tests = []
@@ -265,27 +263,14 @@ class TestCaseViewSet(TestyModelViewSet, TestyArchiveMixin):
             include_self=True,
         ).annotate(
             title=F(_NAME),
-        ).values(_ID, _NAME, 'title', 'parent_id').order_by('name')
-        suite_map = {}
-        tree = {}
-        for suite in suites:
-            suite['children'] = []
-            suite['test_cases'] = []
-            suite_map[suite['id']] = suite
-            if suite['parent_id'] is None:
-                tree[suite['id']] = suite
-        for suite in suites:
-            if parent_id := suite['parent_id']:
-                parent = suite_map.get(parent_id)
-                parent['children'].append(suite)
-        for case in cases.values(_ID, _NAME, 'suite_id', 'labels', 'is_archive').order_by('name'):
-            suite_id = case['suite_id']
-            if suite_id not in suite_map:
-                logger.error(f'Suite {suite_id} from case {case[_ID]} was not found, probably suite was deleted')
-                continue
-            suite_map[suite_id]['test_cases'].append(case)
-        data = orjson.dumps(list(tree.values()))
-        return HttpResponse(content=data, content_type='application/json')
+        ).values(_ID, _NAME, 'title', 'parent_id').order_by(_NAME, _ID)
+        suites = order_depth_first(suites)
+        cases = cases.values(_ID, _NAME, 'suite_id', 'labels', 'is_archive').order_by(
+            ArrayPosition([suite[_ID] for suite in suites], Cast('suite_id', BigIntegerField())),
+            _NAME,
+        )
+        content = stream_tree_with_leaves(suites, cases.iterator(), 'test_cases', 'suite_id')
+        return StreamingHttpResponse(streaming_content=content, content_type='application/json')
 
 
 @suite_list_schema
@@ -313,7 +298,7 @@ class TestSuiteViewSet(TestyModelViewSet):
                 return TestCaseListSerializer
             case 'retrieve':
                 return TestSuiteRetrieveSerializer
-            case 'recovery_list' | 'restore' | 'delete_permanently':
+            case 'recovery_list' | 'restore' | 'restore_async' | 'delete_permanently':
                 return TestSuiteBaseSerializer
             case 'descendants_tree' | 'descendants_tree_by_root':
                 return TestSuiteTreeBreadcrumbsSerializer
@@ -327,7 +312,7 @@ class TestSuiteViewSet(TestyModelViewSet):
                 return TestSuiteSelector.suite_list_raw()
             case 'retrieve':
                 return TestSuiteSelector.suite_list_retrieve()
-            case 'recovery_list' | 'restore' | 'delete_permanently':
+            case 'recovery_list' | 'restore' | 'restore_async' | 'delete_permanently':
                 return TestSuiteSelector.suite_deleted_list()
         return TestSuiteSelector.list_qs(TestSuiteSelector.suite_list_raw()).order_by(_NAME)
 
@@ -366,9 +351,8 @@ class TestSuiteViewSet(TestyModelViewSet):
     def descendants_tree_by_root(self, request, *args, **kwargs):
         suites = self.filter_queryset(self.get_queryset())
         parent_id = get_integer(request, 'parent')
-        suites = TestSuiteSelector.suites_breadcrumbs_by_root(suites, parent_id)
-        content = orjson.dumps(suites)
-        return HttpResponse(content=content, content_type='application/json')
+        content = TestSuiteSelector.suites_breadcrumbs_by_root(suites, parent_id)
+        return StreamingHttpResponse(streaming_content=content, content_type='application/json')
 
     @action(methods=[_GET], url_path='descendants-tree', url_name='descendants-tree', detail=True)
     def descendants_tree(self, request, *args, **kwargs):
@@ -384,7 +368,7 @@ class TestSuiteViewSet(TestyModelViewSet):
         if get_boolean(request, 'show_descendants'):
             suite_ids = suite.get_descendants(include_self=True).values_list('id', flat=True)
         cases = TestCaseSelector.case_list_by_suite_ids(suite_ids)
-        cases = TestSuiteSelector.annotate_suite_path(cases, 'suite__path')
+        cases = TestSuiteSelector.annotate_suite_path(cases, 'suite')
         cases = CasesBySuiteFilter(request.query_params, request=request, queryset=cases).qs
         page = self.paginate_queryset(cases)
         serializer = self.get_serializer(page, many=True)
@@ -434,21 +418,28 @@ class TestSuiteViewSet(TestyModelViewSet):
         if has_common_filters:
             suites = suites | self.filter_queryset(self.get_queryset())
 
+        paginator = self.paginator
+        position = None
+        if UnionCursorPagination.is_requested(request):
+            paginator = UnionCursorPagination()
+            position = paginator.get_position(request)
+
         suites_union = TestSuiteSelector.suites_cases_union(
             cases,
             parent_id,
             suites,
+            position,
         )
         suites_union = SuiteUnionOrderingFilter(request.query_params, queryset=suites_union).qs
 
-        page = self.paginate_queryset(suites_union)
+        page = paginator.paginate_queryset(suites_union, request, view=self)
         context = self.get_serializer_context()
         data = TestSuiteSelector().get_union_data(
             page,
             partial(TestSuiteUnionSerializer, context=context),
             partial(TestCaseUnionSerializer, context=context),
         )
-        return self.get_paginated_response(data)
+        return paginator.get_paginated_response(data)
 
     @action(methods=[_GET], url_path='breadcrumbs', url_name='breadcrumbs', detail=True)
     def breadcrumbs(self, request, *args, **kwargs):
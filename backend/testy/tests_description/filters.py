@@ -73,6 +73,7 @@ class TestCaseFilter(SearchFilterMixin, ArchiveFilterMixin, metaclass=LabelsFilt
     test_case_created_before = filters.DateTimeFilter(field_name='created_at', lookup_expr='lte')
 
     search_fields = ['name', 'id']
+    search_rank_field = 'name'
     labels_outer_ref_prefix = None
 
     def filter_by_suite(self, queryset, field_name, suite_ids):
@@ -152,6 +153,7 @@ class TestSuiteFilter(SearchFilterMixin):
     path = filters.CharFilter(field_name='suite_path', lookup_expr='icontains')
     path_exact = filters.CharFilter(field_name='suite_path', lookup_expr='iexact')
     search_fields = ['name', 'id']
+    search_rank_field = 'name'
 
     def filter_by_treesearch(self, qs, field_name, value):
         qs = self.filter_by_search(qs, field_name, value)
@@ -212,6 +214,7 @@ class CasesBySuiteFilter(TestCaseFilter):
 class SuiteUnionFilterNoSearch(TestSuiteFilter):
     search = None
     ordering = None
+    search_rank_field = None
 
     class Meta(TestSuiteFilter.Meta):
         fields = ('project', 'parent')
@@ -230,13 +233,12 @@ class TestSuiteSearchFilter(TreeSearchBaseFilter):
         qs = super().get_ancestors(valid_options)
         qs = TestSuiteSelector.annotate_cases_count(qs)
         qs = TestSuiteSelector.annotate_descendants_count(qs)
-        qs = TestSuiteSelector.annotate_suite_path(qs)
         return TestSuiteSelector.annotate_estimates(qs)
 
     def custom_filter(self, queryset, filter_conditions, request):
         valid_options = self.get_valid_options(filter_conditions, request)
         if get_boolean(request, 'is_flat'):
-            return TestSuiteSelector.annotate_suite_path(valid_options)
+            return valid_options
         max_level = self.max_level_method()
         ancestors = self.get_ancestors(valid_options)
         parent_id = parse_int(request.query_params.get('parent', ''))
@@ -246,5 +248,4 @@ class TestSuiteSearchFilter(TreeSearchBaseFilter):
         )
         qs = TestSuiteSelector.annotate_cases_count(qs)
         qs = TestSuiteSelector.annotate_estimates(qs)
-        qs = TestSuiteSelector.annotate_suite_path(qs)
         return TestSuiteSelector.annotate_descendants_count(qs)
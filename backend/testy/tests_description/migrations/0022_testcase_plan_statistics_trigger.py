@@ -0,0 +1,20 @@
+# Generated by Django 4.2.13 on 2026-10-18 03:06
+
+from django.db import migrations
+import pgtrigger.compiler
+import pgtrigger.migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests_description', '0021_testsuite_attributes'),
+        ('tests_representation', '0036_testplanstatistics'),
+    ]
+
+    operations = [
+        pgtrigger.migrations.AddTrigger(
+            model_name='testcase',
+            trigger=pgtrigger.compiler.Trigger(name='plan_statistics_on_estimate_update', sql=pgtrigger.compiler.UpsertTriggerSql(condition='WHEN (OLD."estimate" IS DISTINCT FROM (NEW."estimate"))', func='\nUPDATE tests_representation_testplanstatistics\nSET estimates_sum = tests_representation_testplanstatistics.estimates_sum\n        + (COALESCE(NEW.estimate, 0) - COALESCE(OLD.estimate, 0)) * t.tests_count,\n    empty_estimates_count = tests_representation_testplanstatistics.empty_estimates_count\n        + ((NEW.estimate IS NULL)::int - (OLD.estimate IS NULL)::int) * t.tests_count\nFROM (\n    SELECT plan_id, last_status_id, is_archive, COUNT(*) AS tests_count\n    FROM tests_representation_test\n    WHERE case_id = NEW.id AND NOT is_deleted\n    GROUP BY plan_id, last_status_id, is_archive\n) t\nWHERE tests_representation_testplanstatistics.plan_id = t.plan_id\n  AND COALESCE(tests_representation_testplanstatistics.status_id, 0) = COALESCE(t.last_status_id, 0)\n  AND tests_representation_testplanstatistics.is_archive = t.is_archive;\nRETURN NULL;\n', hash='756ec39cbc17bd5a203655d4fe3c42e9d845bba9', operation='UPDATE', pgid='pgtrigger_plan_statistics_on_estimate_update_9b418', table='tests_description_testcase', when='AFTER')),
+        ),
+    ]
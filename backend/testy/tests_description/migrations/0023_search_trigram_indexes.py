@@ -0,0 +1,35 @@
+# Generated by Django 4.2.13 on 2026-10-18 06:39
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+from django.db import migrations, models
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('testy', '0003_trigram_extension'),
+        ('tests_description', '0022_testcase_plan_statistics_trigger'),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='testcase',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('name', output_field=models.TextField())), name='gin_trgm_ops'), name='case_name_trgm_idx'),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='testcase',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('id', output_field=models.TextField())), name='gin_trgm_ops'), name='case_id_trgm_idx'),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='testsuite',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('name', output_field=models.TextField())), name='gin_trgm_ops'), name='suite_name_trgm_idx'),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='testsuite',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('id', output_field=models.TextField())), name='gin_trgm_ops'), name='suite_id_trgm_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.13 on 2026-10-18 07:19
+
+from django.db import migrations, models
+import pgtrigger.compiler
+import pgtrigger.migrations
+
+BACKFILL_PATH_SQL = """
+UPDATE tests_description_testsuite node
+SET suite_path = titles.suite_path
+FROM (
+    SELECT descendant.id, string_agg(ancestor.name, '/' ORDER BY ancestor.path) AS suite_path
+    FROM tests_description_testsuite descendant
+    JOIN tests_description_testsuite ancestor ON ancestor.tree_id = descendant.tree_id AND ancestor.path @> descendant.path
+    GROUP BY descendant.id
+) titles
+WHERE node.id = titles.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests_description', '0023_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testsuite',
+            name='suite_path',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunSQL(BACKFILL_PATH_SQL, migrations.RunSQL.noop),
+        pgtrigger.migrations.AddTrigger(
+            model_name='testsuite',
+            trigger=pgtrigger.compiler.Trigger(name='suite_title_path_insert_trg', sql=pgtrigger.compiler.UpsertTriggerSql(func="NEW.suite_path = COALESCE((SELECT suite_path || '/' FROM tests_description_testsuite WHERE id = NEW.parent_id), '') || NEW.name; RETURN NEW;", hash='bd43fc95dd97ea37391ef051a705ff70141a44f3', operation='INSERT', pgid='pgtrigger_suite_title_path_insert_trg_bc968', table='tests_description_testsuite', when='BEFORE')),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='testsuite',
+            trigger=pgtrigger.compiler.Trigger(name='suite_title_path_change_trg', sql=pgtrigger.compiler.UpsertTriggerSql(condition='WHEN (OLD."parent_id" IS DISTINCT FROM (NEW."parent_id") OR OLD."name" IS DISTINCT FROM (NEW."name") OR OLD."suite_path" IS DISTINCT FROM (NEW."suite_path"))', func="IF pg_trigger_depth() > 1 AND OLD.parent_id IS NOT DISTINCT FROM NEW.parent_id AND OLD.name IS NOT DISTINCT FROM NEW.name THEN     RETURN NEW; END IF; NEW.suite_path = COALESCE((SELECT suite_path || '/' FROM tests_description_testsuite WHERE id = NEW.parent_id), '') || NEW.name; RETURN NEW;", hash='f10c32b934f3bf5c486c6058e0640092e3133233', operation='UPDATE', pgid='pgtrigger_suite_title_path_change_trg_3a7e2', table='tests_description_testsuite', when='BEFORE')),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='testsuite',
+            trigger=pgtrigger.compiler.Trigger(name='suite_title_path_descendants_trg', sql=pgtrigger.compiler.UpsertTriggerSql(condition='WHEN (OLD."parent_id" IS DISTINCT FROM (NEW."parent_id") OR OLD."name" IS DISTINCT FROM (NEW."name"))', func='UPDATE tests_description_testsuite SET suite_path = NEW.suite_path || substr(suite_path, char_length(OLD.suite_path) + 1) WHERE (path <@ OLD.path OR path <@ NEW.path) AND id != NEW.id; RETURN NEW;', hash='b686fe2ce83d38d66b083e2eac6fd2f103157fb2', operation='UPDATE', pgid='pgtrigger_suite_title_path_descendants_trg_0f711', table='tests_description_testsuite', when='AFTER')),
+        ),
+    ]
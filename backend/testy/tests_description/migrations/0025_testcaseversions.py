@@ -0,0 +1,38 @@
+# Generated by Django 4.2.13 on 2026-10-18 08:06
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+import pgtrigger.compiler
+import pgtrigger.migrations
+
+BACKFILL_VERSIONS_SQL = """
+INSERT INTO tests_description_testcaseversions (case_id, current_version, versions)
+SELECT history.id, max(history.history_id), array_agg(history.history_id ORDER BY history.history_id DESC)
+FROM tests_description_historicaltestcase history
+JOIN tests_description_testcase case_row ON case_row.id = history.id
+GROUP BY history.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests_description', '0024_testsuite_suite_path'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestCaseVersions',
+            fields=[
+                ('case', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', related_query_name='version_index', serialize=False, to='tests_description.testcase')),
+                ('current_version', models.IntegerField()),
+                ('versions', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), default=list, size=None)),
+            ],
+        ),
+        migrations.RunSQL(BACKFILL_VERSIONS_SQL, migrations.RunSQL.noop),
+        pgtrigger.migrations.AddTrigger(
+            model_name='historicaltestcase',
+            trigger=pgtrigger.compiler.Trigger(name='historicaltestcase_versions_trigger', sql=pgtrigger.compiler.UpsertTriggerSql(func='BEGIN\n    INSERT INTO tests_description_testcaseversions AS versions_index (case_id, current_version, versions)\n    SELECT NEW.id, NEW.history_id, ARRAY [NEW.history_id]\n    WHERE EXISTS (SELECT 1 FROM tests_description_testcase WHERE id = NEW.id)\n    ON CONFLICT (case_id) DO UPDATE\n    SET current_version = GREATEST(versions_index.current_version, EXCLUDED.current_version),\n        versions = ARRAY(\n            SELECT version\n            FROM unnest(array_append(versions_index.versions, EXCLUDED.current_version)) AS version\n            ORDER BY version DESC\n        );\n    RETURN NULL;\nEND;', hash='91589850db3b9abbc462fde985dc57d267c965eb', operation='INSERT', pgid='pgtrigger_historicaltestcase_versions_trigger_8ab79', table='tests_description_historicaltestcase', when='AFTER')),
+        ),
+    ]
@@ -33,17 +33,20 @@ from typing import Any
 import pgtrigger
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
 from simple_history.models import HistoricalRecords
 
 from testy.comments.models import Comment
 from testy.core.models import Attachment, LabeledItem, LabelIds, Project
 from testy.fields import IntegerEstimateField
+from testy.indexes import get_search_indexes
+from testy.raw_sql import INSERT_TEST_CASE_VERSION_TRIGGER
 from testy.root.ltree.indexes import get_indexes
 from testy.root.ltree.managers import LtreeManager
 from testy.root.ltree.triggers import get_triggers
-from testy.root.models import BaseModel, LtreeBaseModel
-from testy.triggers import get_statistic_triggers
+from testy.root.models import BaseModel, LtreeBaseModel, TriggeredHistoricalRecords
+from testy.triggers import get_plan_statistic_estimate_triggers, get_statistic_triggers
 
 
 class TestSuite(LtreeBaseModel):
@@ -59,6 +62,8 @@ class TestSuite(LtreeBaseModel):
     description = models.TextField('description', default='', blank=True)
     comments = GenericRelation(Comment)
     attributes = models.JSONField(default=dict, blank=True)
+    # Names of ancestors joined by slash, maintained by triggers
+    suite_path = models.TextField(default='', editable=False)
     objects: LtreeManager
 
     class Meta:
@@ -68,7 +73,7 @@ class TestSuite(LtreeBaseModel):
             pgtrigger.Q(new__is_deleted=True, old__is_deleted=False),
             pgtrigger.Q(new__is_deleted=False, old__is_deleted=True),
         )
-        indexes = get_indexes('suite')
+        indexes = get_indexes('suite') + get_search_indexes('suite', 'name', 'id')
 
     def __str__(self):
         return self.name
@@ -100,7 +105,16 @@ class TestCase(BaseModel):
     teardown = models.TextField(blank=True)
     estimate = IntegerEstimateField(null=True, blank=True)
     attachments = GenericRelation(Attachment)
-    history = HistoricalRecords()
+    history = TriggeredHistoricalRecords(
+        triggers=[
+            pgtrigger.Trigger(
+                name='historicaltestcase_versions_trigger',
+                when=pgtrigger.After,
+                operation=pgtrigger.Insert,
+                func=INSERT_TEST_CASE_VERSION_TRIGGER,
+            ),
+        ],
+    )
     description = models.TextField('description', default='', blank=True)
     is_steps = models.BooleanField(default=False)
     is_archive = models.BooleanField(default=False)
@@ -112,7 +126,8 @@ class TestCase(BaseModel):
 
     class Meta:
         default_related_name = 'test_cases'
-        triggers = get_statistic_triggers('cases_count')
+        triggers = get_statistic_triggers('cases_count') + get_plan_statistic_estimate_triggers()
+        indexes = get_search_indexes('case', 'name', 'id')
 
     def __str__(self):
         return self.name
@@ -136,6 +151,20 @@ class TestCase(BaseModel):
         )
 
 
+class TestCaseVersions(models.Model):
+    # History ids of a test case, maintained by triggers on its historical records.
+    # Reverse relation is hidden so relation walks of deletion, archiving and recovery skip the index.
+    case = models.OneToOneField(
+        TestCase,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='+',
+        related_query_name='version_index',
+    )
+    current_version = models.IntegerField()
+    versions = ArrayField(models.IntegerField(), default=list)
+
+
 class TestCaseStep(BaseModel):
     name = models.CharField(max_length=settings.CHAR_FIELD_MAX_LEN)
     scenario = models.TextField()
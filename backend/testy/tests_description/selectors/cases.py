@@ -33,15 +33,15 @@ import logging
 from typing import Any, Iterable
 
 from django.contrib.postgres.aggregates import ArrayAgg
-from django.db.models import F, OuterRef, Q, QuerySet, Subquery, Value
+from django.db.models import F, Q, QuerySet, Value
 from django.shortcuts import get_object_or_404
 from rest_framework.exceptions import ValidationError
 
 from testy.core.selectors.attachments import AttachmentSelector
 from testy.root.ltree.querysets import LtreeQuerySet
 from testy.root.models import DeletedQuerySet
-from testy.tests_description.models import TestCase, TestCaseStep, TestSuite
-from testy.tests_representation.models import TestPlan, TestStepResult
+from testy.tests_description.models import TestCase, TestCaseStep, TestCaseVersions, TestSuite
+from testy.tests_representation.models import TestPlan, TestResult, TestStepResult
 from testy.tests_representation.selectors.tests import TestSelector
 
 logger = logging.getLogger(__name__)
@@ -59,10 +59,7 @@ class TestCaseSelector:  # noqa: WPS214
             filter_condition = {}
         return TestCase.objects.filter(**filter_condition).prefetch_related(
             'attachments', _STEPS, 'steps__attachments', 'labeled_items', 'labeled_items__label',
-        ).select_related(_SUITE).annotate(
-            current_version=self._current_version_subquery(),
-            versions=self._versions_subquery(),
-        ).order_by('name')
+        ).select_related(_SUITE).annotate(**self._version_annotations()).order_by('name')
 
     def case_list_with_label_names(self, filter_condition: dict[str, Any] | None = None) -> QuerySet[TestCase]:
         return self.case_list(filter_condition=filter_condition).annotate(
@@ -75,14 +72,10 @@ class TestCaseSelector:  # noqa: WPS214
         return get_object_or_404(TestCase, pk=case_id)
 
     def case_deleted_list(self) -> DeletedQuerySet[TestCase]:
-        return TestCase.deleted_objects.all().prefetch_related().annotate(
-            current_version=self._current_version_subquery(),
-            versions=self._versions_subquery(),
-        )
+        return TestCase.deleted_objects.all().prefetch_related().annotate(**self._version_annotations())
 
     def case_version(self, case: TestCase) -> int:
-        history = case.history.first()
-        return history.history_id
+        return self.get_latest_version_by_id(case.pk)
 
     def get_steps_ids_by_testcase(self, case: TestCase) -> list[int]:
         return case.steps.values_list(_ID, flat=True)
@@ -133,7 +126,7 @@ class TestCaseSelector:  # noqa: WPS214
 
     @classmethod
     def get_latest_version_by_id(cls, pk: int):
-        return TestCase.history.filter(id=pk).latest().history_id
+        return TestCaseVersions.objects.values_list('current_version', flat=True).get(case_id=pk)
 
     @classmethod
     def version_exists(cls, pk: int, version: int):
@@ -169,23 +162,7 @@ class TestCaseSelector:  # noqa: WPS214
 
     @classmethod
     def annotate_versions(cls, qs: QuerySet[TestCase]) -> QuerySet[TestCase]:
-        current_version_subq = (
-            TestCase.history
-            .filter(id=OuterRef(_ID))
-            .order_by(_HISTORY_ID_DESC)
-            .values_list(_HISTORY_ID, flat=True)[:1]
-        )
-        versions_subq = (
-            TestCase.history
-            .filter(id=OuterRef(_ID))
-            .values(_ID)
-            .annotate(temp=ArrayAgg(_HISTORY_ID, ordering=_HISTORY_ID_DESC))
-            .values('temp')
-        )
-        return qs.annotate(
-            current_version=Subquery(current_version_subq),
-            versions=Subquery(versions_subq),
-        )
+        return qs.annotate(**cls._version_annotations())
 
     @classmethod
     def case_list_by_suite_ids(cls, suite_ids: Iterable[int]) -> QuerySet[TestCase]:
@@ -200,23 +177,11 @@ class TestCaseSelector:  # noqa: WPS214
         return cases.order_by('name')
 
     @classmethod
-    def _current_version_subquery(cls):
-        return (
-            TestCase.history
-            .filter(id=OuterRef(_ID))
-            .order_by(_HISTORY_ID_DESC)
-            .values_list(_HISTORY_ID, flat=True)[:1]
-        )
-
-    @classmethod
-    def _versions_subquery(cls):
-        return Subquery(
-            TestCase.history
-            .filter(id=OuterRef(_ID))
-            .values(_ID)
-            .annotate(temp=ArrayAgg(_HISTORY_ID, ordering=_HISTORY_ID_DESC))
-            .values('temp'),
-        )
+    def _version_annotations(cls) -> dict[str, F]:
+        return {
+            'current_version': F('version_index__current_version'),
+            'versions': F('version_index__versions'),
+        }
 
 
 class TestCaseStepSelector:
@@ -235,6 +200,10 @@ class TestCaseStepSelector:
     def get_latest_version_by_id(cls, pk: int):
         return TestCaseStep.history.filter(id=pk).latest().history_id
 
+    @classmethod
+    def latest_history_by_ids(cls, ids: Iterable[int]) -> QuerySet:
+        return TestCaseStep.history.filter(id__in=ids).order_by(_ID, _HISTORY_ID_DESC).distinct(_ID)
+
     @classmethod
     def get_attachments_by_case_version(cls, step: TestCaseStep, version: int):
         step_versions = list(
@@ -257,3 +226,22 @@ class TestCaseStepSelector:
                 f'case step {step.id} has one more history records with same case history id {test_case_history_id}',
             )
         return steps.first()
+
+    @classmethod
+    def steps_by_step_results(cls, results: Iterable[TestResult]) -> dict[int, TestCaseStep | None]:
+        step_versions = {
+            step_result.id: (step_result.step_id, result.test_case_version)
+            for result in results
+            for step_result in result.steps_results.all()
+        }
+        if not step_versions:
+            return {}
+        step_ids, versions = zip(*step_versions.values())
+        historical_steps = {}
+        for historical_step in TestCaseStep.history.filter(id__in=step_ids, test_case_history_id__in=versions):
+            # history is ordered from newest record, same as step.history.first() in get_step_by_step_result
+            historical_steps.setdefault((historical_step.id, historical_step.test_case_history_id), historical_step)
+        return {
+            step_result_id: historical_steps.get(step_version)
+            for step_result_id, step_version in step_versions.items()
+        }
@@ -29,7 +29,7 @@
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
 import warnings
-from typing import TYPE_CHECKING, Any, Iterable, Mapping, TypeVar
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping, TypeVar
 
 from django.db.models import (
     BooleanField,
@@ -52,8 +52,8 @@ from mptt.querysets import TreeQuerySet
 from testy.tests_description.models import TestCase, TestSuite
 from testy.tests_description.selectors.cases import TestCaseSelector
 from testy.tests_representation.models import Test, TestPlan
-from testy.utilities.sql import ConcatSubquery, SubCount, get_max_level
-from testy.utilities.tree import build_tree, form_tree_prefetch_lookups, form_tree_prefetch_objects
+from testy.utilities.sql import SubCount, UnionPosition, filter_after_position, get_max_level
+from testy.utilities.tree import form_tree_prefetch_lookups, form_tree_prefetch_objects, stream_tree
 
 if TYPE_CHECKING:
     from django.db.models.query import ValuesQuerySet
@@ -67,8 +67,9 @@ _ID = 'id'
 _PARENT = 'parent'
 _TREE_ID = 'tree_id'
 _PK = 'pk'
+_PATH = 'path'
 _OUTER_REF_PK = OuterRef(_PK)
-_OUTER_REF_PATH = OuterRef('path')
+_OUTER_REF_PATH = OuterRef(_PATH)
 _DB_TRUE = Value(True)
 _MT = TypeVar('_MT', bound=Model)
 _SUITE = 'suite'
@@ -88,16 +89,7 @@ class TestSuiteSelector:  # noqa: WPS214
 
     @classmethod
     def suite_deleted_list(cls):
-        max_level = get_max_level(TestSuite)
-        return TestSuite.deleted_objects.all().select_related(_PARENT).prefetch_related(
-            *form_tree_prefetch_objects(
-                nested_prefetch_field=_CHILD_TEST_SUITES,
-                prefetch_field=_CHILD_TEST_SUITES,
-                tree_depth=max_level,
-                queryset_class=TestSuite,
-                manager_name='deleted_objects',
-            ),
-        )
+        return TestSuite.deleted_objects.all().select_related(_PARENT).prefetch_tree(TestSuite.deleted_objects.all())
 
     @classmethod
     def list_qs(cls, qs: QuerySet[TestSuite], search: str | None = None) -> QuerySet[TestSuite]:
@@ -105,7 +97,6 @@ class TestSuiteSelector:  # noqa: WPS214
             cls.annotate_cases_count,
             cls.annotate_descendants_count,
             cls.annotate_estimates,
-            cls.annotate_suite_path,
         ]
         if not search:
             annotation_methods.append(cls.annotate_has_children_with_cases)
@@ -119,7 +110,6 @@ class TestSuiteSelector:  # noqa: WPS214
             cls.annotate_cases_count,
             cls.annotate_descendants_count,
             cls.annotate_estimates,
-            cls.annotate_suite_path,
             cls.annotate_has_children,
         ]
         for method in annotation_methods:
@@ -146,7 +136,7 @@ class TestSuiteSelector:  # noqa: WPS214
         self,
         plans: QuerySet[TestPlan],
         parent: int | None,
-    ) -> list[dict[str, Any]]:
+    ) -> Iterator[bytes]:
         plan_ids = list(plans.values_list(_ID, flat=True))
         tests = Test.objects.filter(plan__in=plan_ids)
         suite_ids = tests.values_list('case__suite__id', flat=True).distinct()
@@ -158,7 +148,7 @@ class TestSuiteSelector:  # noqa: WPS214
 
         qs = self.annotate_has_children_with_cases(qs, child_subq)
         qs = self.annotate_is_used(qs, suite_ids)
-        return build_tree(qs.values(_ID, _NAME, _PARENT, 'has_children', 'is_used'))
+        return stream_tree(qs.values(_ID, _NAME, _PARENT, 'has_children', 'is_used').order_by(_PATH).iterator())
 
     @classmethod
     def annotate_is_used(cls, qs: QuerySet[TestSuite], used_ids: Iterable[int]) -> QuerySet[TestSuite]:
@@ -178,37 +168,26 @@ class TestSuiteSelector:  # noqa: WPS214
         cls,
         suites: QuerySet[TestSuite],
         parent_id: int | None,
-    ) -> list[dict[str, Any]]:
+    ) -> Iterator[bytes]:
         if parent_id is None:
             suites = cls.suite_list_by_tree_ids(suites.values_list('tree_id', flat=True))
         else:
             suites = suites.get_descendants(include_self=True)
         qs = cls.annotate_has_children_with_cases(suites, Subquery(suites.filter(parent_id=_OUTER_REF_PK)))
-        return build_tree(
-            qs.values('id', 'name', 'has_children', 'parent'),
+        return stream_tree(
+            qs.values('id', 'name', 'has_children', 'parent').order_by(_PATH).iterator(),
             omitted_ids={parent_id} if parent_id else None,
         )
 
     @classmethod
     def suites_breadcrumbs(cls, suites: QuerySet[TestSuite]) -> QuerySet[TestSuite]:
-        max_level = get_max_level(TestSuite)
         suites = cls.annotate_has_children_with_cases(suites)
         annotated_qs = cls.annotate_has_children_with_cases(cls.suite_list_raw())
-        return suites.prefetch_related(
-            *form_tree_prefetch_objects(
-                'child_test_suites',
-                'child_test_suites',
-                tree_depth=max_level,
-                queryset=annotated_qs,
-            ),
-        ).order_by(_NAME)
+        return suites.prefetch_tree(annotated_qs).order_by(_NAME)
 
     @classmethod
-    def annotate_suite_path(cls, qs: QuerySet[_MT], outer_ref_key: str = 'path') -> QuerySet[_MT]:
-        ancestor_paths = TestSuite.objects.filter(
-            Q(path__ancestor=OuterRef(outer_ref_key)),
-        ).order_by('path').values(_NAME)
-        return qs.annotate(suite_path=ConcatSubquery(ancestor_paths, separator='/'))
+    def annotate_suite_path(cls, qs: QuerySet[_MT], suite_lookup: str) -> QuerySet[_MT]:
+        return qs.annotate(suite_path=F(f'{suite_lookup}__suite_path'))
 
     @classmethod
     def suite_list_retrieve(cls):
@@ -216,7 +195,6 @@ class TestSuiteSelector:  # noqa: WPS214
             cls.annotate_cases_count,
             cls.annotate_descendants_count,
             cls.annotate_estimates,
-            cls.annotate_suite_path,
         ]
         qs = cls.suite_list_raw()
         for method in annotation_methods:
@@ -273,28 +251,28 @@ class TestSuiteSelector:  # noqa: WPS214
         cases: QuerySet[TestCase],
         parent_id: int | None,
         suites: QuerySet[TestSuite],
+        position: UnionPosition | None = None,
     ) -> 'ValuesQuerySet[TestSuite, dict[str, Any]]':
         fields = (_ID, 'created_at', _NAME, _IS_LEAF, _TYPE)
 
         cases_for_display = TestCase.objects.none()
+        suites_values = suites.annotate(
+            is_leaf=Value(False),
+            type=Value(_SUITE),
+        ).values(*fields)
+        suites_values = filter_after_position(suites_values, position, is_leaf=False)
         if parent_id is None:
-            return suites.annotate(
-                is_leaf=Value(False),
-                type=Value(_SUITE),
-            ).values(*fields).order_by(_IS_LEAF, _NAME)
+            return suites_values.order_by(_IS_LEAF, _NAME, _ID)
         cases_for_display = cases.filter(suite=parent_id, pk__in=cases)
 
         cases_for_display = cases_for_display.annotate(
             is_leaf=Value(True),
             type=Value('case'),
         ).values(*fields)
+        cases_for_display = filter_after_position(cases_for_display, position, is_leaf=True)
 
-        suites_values = suites.annotate(
-            is_leaf=Value(False),
-            type=Value(_SUITE),
-        ).values(*fields)
         suites_values = suites_values.union(cases_for_display).values(*fields).order_by(_IS_LEAF)
-        return suites_values.order_by(_IS_LEAF, _NAME)
+        return suites_values.order_by(_IS_LEAF, _NAME, _ID)
 
     def get_union_data(
         self,
@@ -312,7 +290,7 @@ class TestSuiteSelector:  # noqa: WPS214
                 case_ids.append(elem[_ID])
 
         db_cases = TestCaseSelector.cases_for_union_data(case_ids)
-        db_cases = TestSuiteSelector.annotate_suite_path(db_cases, 'suite__path').select_related(_SUITE)
+        db_cases = TestSuiteSelector.annotate_suite_path(db_cases, _SUITE).select_related(_SUITE)
 
         db_suites = self.suites_by_ids(suite_ids, _PK)
         db_suites = self.suite_list_union(db_suites)
@@ -366,7 +344,6 @@ class TestSuiteSelector:  # noqa: WPS214
         qs = cls.suite_list_raw()
         qs = cls.annotate_estimates(qs)
         qs = cls.annotate_descendants_count(qs)
-        qs = cls.annotate_suite_path(qs)
         return form_tree_prefetch_objects(
             nested_prefetch_field=_CHILD_TEST_SUITES,
             prefetch_field=_CHILD_TEST_SUITES,
@@ -389,14 +366,12 @@ class TestSuiteSelector:  # noqa: WPS214
         )
         qs = self.annotate_estimates(qs)
         qs = self.annotate_cases_count(qs)
-        qs = self.annotate_suite_path(qs)
-        qs = self.annotate_suite_path(qs)
         return self.annotate_descendants_count(qs)
 
     def suite_list(self) -> QuerySet[TestSuite]:
         warnings.warn('Deprecated in 2.0', DeprecationWarning, stacklevel=2)
         max_level = get_max_level(TestSuite)
-        qs = (
+        return (
             TestSuite.objects.all()
             .order_by(_NAME)
             .prefetch_related(
@@ -413,7 +388,6 @@ class TestSuiteSelector:  # noqa: WPS214
                 ),
             )
         )
-        return self.annotate_suite_path(qs)
 
     @classmethod
     def suites_tree_prefetch_cases(cls, max_level: int):
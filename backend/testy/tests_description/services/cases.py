@@ -29,11 +29,13 @@
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
 from logging import getLogger
-from typing import Any
+from typing import Any, NamedTuple
 
 from django.db import transaction
+from django.utils import timezone
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
 
-from testy.core.services.attachments import AttachmentService
+from testy.core.services.attachments import AttachmentsByObject, AttachmentService
 from testy.core.services.labels import LabelService
 from testy.tests_description.models import TestCase, TestCaseStep
 from testy.tests_description.selectors.cases import TestCaseSelector, TestCaseStepSelector
@@ -44,10 +46,18 @@ _USER = 'user'
 _ID = 'id'
 _SKIP_HISTORY = 'skip_history'
 _TEST_CASE_HISTORY_ID = 'test_case_history_id'
+_UPDATED_AT = 'updated_at'
 
 logger = getLogger(__name__)
 
 
+class _StepsSync(NamedTuple):
+    to_create: list[TestCaseStep]
+    to_update: list[TestCaseStep]
+    update_fields: list[str]
+    attachments: AttachmentsByObject
+
+
 class TestCaseService:
     non_side_effect_fields = ['name', 'project', 'scenario', 'expected']
 
@@ -127,38 +137,20 @@ class TestCaseService:
     @transaction.atomic
     def case_with_steps_update(self, case: TestCase, data: dict[str, Any]) -> TestCase:
         case_steps = data.pop('steps', [])
+        user = data.get(_USER)
         case = self.case_update(case, data)
-        steps_id_pool: list[int] = []
-
-        for step in case_steps:
-            if _ID in step.keys():
-                if TestCaseStepSelector().step_exists(step[_ID]):
-                    step_instance = TestCaseStep.objects.get(id=step[_ID])
-
-                    step_instance = self.step_update(
-                        step=step_instance,
-                        data={
-                            _TEST_CASE_HISTORY_ID: case.history.first().history_id,
-                            _SKIP_HISTORY: data.get(_SKIP_HISTORY),
-                            **step,
-                        },
-                    )
-                    steps_id_pool.append(step_instance.id)
-                else:
-                    # TODO: add logging
-                    continue
-            else:
-                step['test_case'] = case
-                step['project'] = case.project
-                step[_TEST_CASE_HISTORY_ID] = case.history.first().history_id
-                step_instance = self.step_create(step)
-                steps_id_pool.append(step_instance.id)
-
-        for step_id in TestCaseSelector().get_steps_ids_by_testcase(case):
-            if step_id not in steps_id_pool:
-                TestCaseStep.objects.filter(test_case=case).update(test_case_history_id=case.history.first().history_id)
-                TestCaseStep.objects.filter(pk=step_id).delete()
-
+        case_history_id = TestCaseSelector.get_latest_version_by_id(case.id)
+        steps_sync = self._steps_sync(case, case_steps, case_history_id)
+        self._bulk_update_steps(steps_sync.to_update, steps_sync.update_fields, user, bool(data.get(_SKIP_HISTORY)))
+        bulk_create_with_history(steps_sync.to_create, TestCaseStep, default_user=user)
+
+        step_ids = [step_instance.pk for step_instance, _ in steps_sync.attachments]
+        removed_steps = TestCaseStep.objects.filter(test_case=case).exclude(pk__in=step_ids)
+        removed_steps.update(test_case_history_id=case_history_id)
+        removed_steps.delete()
+
+        step_history_ids = dict(TestCaseStepSelector.latest_history_by_ids(step_ids).values_list(_ID, 'history_id'))
+        AttachmentService().bulk_attachments_update_content_objects(steps_sync.attachments, step_history_ids)
         return case
 
     @transaction.atomic
@@ -228,3 +220,47 @@ class TestCaseService:
         AttachmentService().restore_by_version(history.instance, version)
         cls.restore_test_case_steps_versions(history)
         return history.instance
+
+    @classmethod
+    def _steps_sync(cls, case: TestCase, case_steps: list[dict[str, Any]], case_history_id: int) -> _StepsSync:
+        existing_steps = TestCaseStep.objects.in_bulk([step[_ID] for step in case_steps if _ID in step])
+        steps_sync = _StepsSync(
+            to_create=[], to_update=[], update_fields=[_TEST_CASE_HISTORY_ID, _UPDATED_AT], attachments=[],
+        )
+        for step in case_steps:
+            if _ID not in step:
+                step_fields = {field: step[field] for field in cls.step_non_side_effect_fields if field in step}
+                step_instance = TestCaseStep(**step_fields, test_case=case, project=case.project)
+                steps_sync.to_create.append(step_instance)
+            elif (step_instance := existing_steps.get(step[_ID])) is not None:
+                _, changed_fields = step_instance.model_update(cls.step_non_side_effect_fields, step, commit=False)
+                steps_sync.update_fields.extend(set(changed_fields).difference(steps_sync.update_fields))
+                steps_sync.to_update.append(step_instance)
+            else:
+                logger.warning(f'Step with id {step[_ID]} was not found')
+                continue
+            step_instance.test_case_history_id = case_history_id
+            steps_sync.attachments.append((step_instance, step.get(_ATTACHMENTS, [])))
+        return steps_sync
+
+    @classmethod
+    def _bulk_update_steps(
+        cls,
+        steps: list[TestCaseStep],
+        update_fields: list[str],
+        user,
+        skip_history: bool,
+    ) -> None:
+        updated_at = timezone.now()
+        for step in steps:
+            step.updated_at = updated_at
+        if not skip_history:
+            bulk_update_with_history(steps, TestCaseStep, update_fields, default_user=user)
+            return
+        TestCaseStep.objects.bulk_update(steps, update_fields)
+        steps_by_id = {step.pk: step for step in steps}
+        latest_history = list(TestCaseStepSelector.latest_history_by_ids(steps_by_id))
+        for history_instance in latest_history:
+            for field in update_fields:
+                setattr(history_instance, field, getattr(steps_by_id[history_instance.id], field))
+        TestCaseStep.history.bulk_update(latest_history, update_fields)
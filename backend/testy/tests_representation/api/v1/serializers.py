@@ -39,8 +39,9 @@ from testy.core.api.v1.serializers import AttachmentSerializer
 from testy.core.selectors.attachments import AttachmentSelector
 from testy.serializer_fields import EstimateField
 from testy.tests_description.api.v1.serializers import TestCaseLabelOutputSerializer
-from testy.tests_description.selectors.cases import TestCaseStepSelector
-from testy.tests_representation.models import Parameter, ResultStatus, Test, TestPlan, TestResult, TestStepResult
+from testy.tests_representation.api.v2.serializers import TestResultListSerializer
+from testy.tests_representation.api.v2.serializers import TestStepResultSerializer as TestStepResultSerializerV2
+from testy.tests_representation.models import Parameter, ResultStatus, Test, TestPlan, TestResult
 from testy.tests_representation.selectors.parameters import ParameterSelector
 from testy.tests_representation.selectors.testplan import TestPlanSelector
 from testy.tests_representation.selectors.tests import TestSelector
@@ -61,6 +62,7 @@ from testy.utilities.tree import get_breadcrumbs_treeview
 from testy.validators import compare_related_manager, compare_steps, validator_launcher
 
 
+
 class ParameterSerializer(ModelSerializer):
     url = HyperlinkedIdentityField(view_name='api:v1:parameter-detail')
 
@@ -169,26 +171,10 @@ class TestSerializer(ModelSerializer):
         )
 
 
-class TestStepResultSerializer(ModelSerializer):
-    id = IntegerField(required=False)
-    name = SerializerMethodField()
-    sort_order = SerializerMethodField()
-    status_text = CharField(source='status.name', read_only=True)
-    status_color = CharField(source='status.color', read_only=True)
-
-    class Meta:
-        model = TestStepResult
-        fields = ('id', 'step', 'name', 'status', 'status_text', 'status_color', 'sort_order')
+class TestStepResultSerializer(TestStepResultSerializerV2):
+    class Meta(TestStepResultSerializerV2.Meta):
         ref_name = 'TestStepResultV1'
 
-    def get_name(self, instance):
-        step = TestCaseStepSelector().get_step_by_step_result(instance)
-        return step.name if step else '-'
-
-    def get_sort_order(self, instance):
-        step = TestCaseStepSelector().get_step_by_step_result(instance)
-        return step.sort_order if step else 0
-
 
 class TestResultSerializer(ModelSerializer):
     url = HyperlinkedIdentityField(view_name='api:v1:testresult-detail')
@@ -210,6 +196,7 @@ class TestResultSerializer(ModelSerializer):
 
         read_only_fields = ('test_case_version', 'project', 'user', 'id')
         validators = [TestResultArchiveTestValidator()]
+        list_serializer_class = TestResultListSerializer
         extra_kwargs = {
             'status': {
                 'required': True,
@@ -345,9 +332,7 @@ class TestPlanOutputSerializer(ModelSerializer):
 
     @classmethod
     def get_title(cls, instance: TestPlan):
-        if parameters := instance.parameters.all():
-            return '{0} [{1}]'.format(instance.name, ', '.join([parameter.data for parameter in parameters]))
-        return instance.name
+        return instance.title
 
 
 class TestPlanRetrieveSerializer(TestPlanOutputSerializer):
@@ -426,7 +411,7 @@ class TestPlanMinSerializer(ModelSerializer):
 
     class Meta:
         model = TestPlan
-        exclude = ('is_deleted', 'created_at', 'updated_at', 'tree_id')
+        exclude = ('is_deleted', 'created_at', 'updated_at', 'tree_id', 'title', 'parameter_ids', 'plan_path')
         ref_name = 'TestPlanMinV1'
 
 
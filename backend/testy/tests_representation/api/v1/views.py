@@ -121,6 +121,13 @@ _IS_ARCHIVE = 'is_archive'
 _LIST = 'list'
 _ACTIVITY = 'activity'
 _RESULT_STATUS = 'status'
+_ARCHIVE_ACTIONS = frozenset((
+    'archive_preview',
+    'archive_objects',
+    'archive_async',
+    'restore_archived',
+    'restore_archived_async',
+))
 
 
 class ParameterViewSet(TestyModelViewSet):
@@ -226,7 +233,7 @@ class TestPlanViewSet(TestyModelViewSet, TestyArchiveMixin):
             return ActivityFilter
 
     def get_queryset(self):
-        if self.action in {'recovery_list', 'restore', 'delete_permanently'}:
+        if self.action in {'recovery_list', 'restore', 'restore_async', 'delete_permanently'}:
             return TestPlanSelector().testplan_deleted_list()
         if get_boolean(self.request, 'treeview') and self.action == _LIST:
             qs = TestPlanSelector.testplan_list_raw()
@@ -408,7 +415,7 @@ class TestViewSet(TestyModelViewSet, TestyArchiveMixin):
 
     def get_queryset(self, test_plan_ids: list[int] | None = None):
         filters = {'plan_id__in': test_plan_ids} if test_plan_ids else {}
-        if self.action in {'archive_preview', 'archive_objects', 'restore_archived'}:
+        if self.action in _ARCHIVE_ACTIONS:
             return TestSelector().test_list()
         return TestSelector().test_list_with_last_status(filter_condition=filters)
 
@@ -426,7 +433,11 @@ class TestViewSet(TestyModelViewSet, TestyArchiveMixin):
         filter_conditions = serializer.validated_data.pop('filter_conditions', {})
         if filter_conditions:
             queryset = self._filter_queryset_from_request_payload(queryset, filter_conditions)
-        tests = TestService().bulk_update_tests(queryset, serializer.validated_data, request.user)
+        updated_tests = TestService().bulk_update_tests(queryset, serializer.validated_data, request.user)
+        tests = TestSelector().test_list_with_last_status(
+            filter_condition={'pk__in': [test['id'] for test in updated_tests]},
+        )
+        tests = TestSuiteSelector.annotate_suite_path(tests, 'case__suite')
         return Response(TestSerializer(tests, many=True, context=self.get_serializer_context()).data)
 
     def _filter_queryset_from_request_payload(self, queryset: QuerySet[Test], filter_conditions: dict[str, Any]):
@@ -485,7 +496,7 @@ class ResultStatusViewSet(TestyModelViewSet):
             return ResultStatusFilter
 
     def get_queryset(self):
-        if self.action in {'recovery_list', 'restore', 'delete_permanently'}:
+        if self.action in {'recovery_list', 'restore', 'restore_async', 'delete_permanently'}:
             return ResultStatusSelector.status_deleted_list()
         elif self.action == 'list':
             project = ProjectSelector.project_by_id(self.request.query_params.get('project'))
@@ -30,10 +30,13 @@
 # <http://www.gnu.org/licenses/>.
 from functools import partial
 
+from django.conf import settings
+from django.db.models.manager import BaseManager
+from rest_framework.exceptions import ValidationError
 from rest_framework.fields import BooleanField, CharField, DateTimeField, IntegerField, ListField, SerializerMethodField
 from rest_framework.relations import HyperlinkedIdentityField, PrimaryKeyRelatedField
 from rest_framework.reverse import reverse
-from rest_framework.serializers import JSONField, ModelSerializer, Serializer
+from rest_framework.serializers import JSONField, ListSerializer, ModelSerializer, Serializer
 
 from testy.core.api.v2.serializers import AttachmentSerializer, ParentMinSerializer
 from testy.core.selectors.attachments import AttachmentSelector
@@ -62,6 +65,8 @@ from testy.users.selectors.users import UserSelector
 from testy.utilities.tree import get_breadcrumbs_treeview
 from testy.validators import compare_related_manager, compare_steps, validator_launcher
 
+_STEPS_BY_STEP_RESULT = 'steps_by_step_result'
+
 
 class ParameterSerializer(ModelSerializer):
     url = HyperlinkedIdentityField(view_name='api:v2:parameter-detail')
@@ -182,13 +187,26 @@ class TestStepResultSerializer(ModelSerializer):
         fields = ('id', 'step', 'name', 'status', 'status_text', 'status_color', 'sort_order')
 
     def get_name(self, instance):
-        step = TestCaseStepSelector().get_step_by_step_result(instance)
+        step = self._get_historical_step(instance)
         return step.name if step else '-'
 
     def get_sort_order(self, instance):
-        step = TestCaseStepSelector().get_step_by_step_result(instance)
+        step = self._get_historical_step(instance)
         return step.sort_order if step else 0
 
+    def _get_historical_step(self, instance):
+        steps = self.context.get(_STEPS_BY_STEP_RESULT)
+        if steps is not None and instance.id in steps:
+            return steps[instance.id]
+        return TestCaseStepSelector().get_step_by_step_result(instance)
+
+
+class TestResultListSerializer(ListSerializer):
+    def to_representation(self, data):
+        results = list(data.all() if isinstance(data, BaseManager) else data)
+        self.context[_STEPS_BY_STEP_RESULT] = TestCaseStepSelector.steps_by_step_results(results)
+        return super().to_representation(results)
+
 
 class TestResultSerializer(ModelSerializer):
     url = HyperlinkedIdentityField(view_name='api:v2:testresult-detail')
@@ -210,6 +228,7 @@ class TestResultSerializer(ModelSerializer):
 
         read_only_fields = ('test_case_version', 'project', 'user', 'id')
         validators = [TestResultArchiveTestValidator()]
+        list_serializer_class = TestResultListSerializer
         extra_kwargs = {
             'status': {
                 'required': True,
@@ -316,6 +335,33 @@ class TestResultInputSerializer(TestResultSerializer):
         ]
 
 
+class TestResultIngestSerializer(Serializer):
+    test = IntegerField()
+    status = IntegerField()
+    comment = CharField(allow_blank=True, default='')
+    execution_time = IntegerField(min_value=settings.MIN_VALUE_POSITIVE_INTEGER, allow_null=True, default=None)
+    attributes = JSONField(default=dict)
+
+    def validate_status(self, status_id: int) -> int:
+        if status_id not in self.context['statuses']:
+            raise ValidationError('Status does not exist in project')
+        return status_id
+
+    def validate_attributes(self, attributes):
+        if not isinstance(attributes, dict):
+            raise ValidationError('Attributes must be an object')
+        return attributes
+
+    def validate(self, attrs):
+        self.context['attributes_validator'](attrs)
+        return attrs
+
+
+class TestResultIngestOutputSerializer(Serializer):
+    created = IntegerField(read_only=True)
+    errors = ListField(child=JSONField(), read_only=True)
+
+
 class ParentPlanSerializer(ModelSerializer):
     class Meta:
         model = TestPlan
@@ -352,9 +398,7 @@ class TestPlanOutputSerializer(ModelSerializer):
 
     @classmethod
     def get_name(cls, instance: TestPlan):
-        if parameters := instance.parameters.all():
-            return '{0} [{1}]'.format(instance.name, ', '.join([parameter.data for parameter in parameters]))
-        return instance.name
+        return instance.title
 
 
 class TestPlanUnionSerializer(TestPlanOutputSerializer):
@@ -466,7 +510,7 @@ class TestPlanMinSerializer(ModelSerializer):
 
     class Meta:
         model = TestPlan
-        exclude = ('is_deleted', 'created_at', 'updated_at', 'tree_id')
+        exclude = ('is_deleted', 'created_at', 'updated_at', 'tree_id', 'title', 'parameter_ids', 'plan_path')
 
 
 class ResultStatusSerializer(ModelSerializer):
@@ -530,6 +574,12 @@ class BulkUpdateTestsSerializer(Serializer):
         ]
 
 
+class BulkUpdateTestsOutputSerializer(Serializer):
+    id = IntegerField(read_only=True)  # noqa: WPS125
+    plan = IntegerField(read_only=True)
+    assignee = IntegerField(read_only=True, allow_null=True)
+
+
 class TestPlanTreeBreadcrumbsSerializer(ModelSerializer):
     has_children = BooleanField(read_only=True)
     parent = ParentMinSerializer(read_only=True)
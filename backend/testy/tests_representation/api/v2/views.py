@@ -29,11 +29,12 @@
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
 from functools import partial
+from itertools import islice
 from typing import Any, Iterable
 
 import orjson
 from django.db.models import QuerySet
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django_filters import CharFilter
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
@@ -43,16 +44,16 @@ from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, ViewSet
 from simple_history.utils import get_history_model_for_model
 
-from testy.core.api.v2.serializers import LabelSerializer, UnionSerializer
+from testy.core.api.v2.serializers import LabelSerializer, TaskSerializer, UnionSerializer
 from testy.core.selectors.labels import LabelSelector
 from testy.core.selectors.projects import ProjectSelector
 from testy.core.services.copy import CopyService
 from testy.filters import NumberInFilter, TestyBaseSearchFilter, TestyFilterBackend
-from testy.paginations import StandardSetPagination
+from testy.paginations import StandardSetPagination, UnionCursorPagination
 from testy.permissions import ForbidChangesOnArchivedProject, IsAdminOrForbidArchiveUpdate
 from testy.root.mixins import TestyArchiveMixin, TestyModelViewSet
 from testy.root.querysets import SoftDeleteTreeQuerySet
-from testy.swagger.common_query_parameters import is_archive_parameter
+from testy.swagger.common_query_parameters import is_archive_parameter, project_param
 from testy.swagger.v1.results import result_list_schema
 from testy.swagger.v2.testplans import (
     get_plan_histogram_schema,
@@ -69,6 +70,7 @@ from testy.tests_description.api.v2.serializers import TestSuiteTreeBreadcrumbsS
 from testy.tests_description.selectors.cases import TestCaseSelector
 from testy.tests_description.selectors.suites import TestSuiteSelector
 from testy.tests_representation.api.v2.serializers import (
+    BulkUpdateTestsOutputSerializer,
     BulkUpdateTestsSerializer,
     ParameterSerializer,
     ResultStatusSerializer,
@@ -81,6 +83,8 @@ from testy.tests_representation.api.v2.serializers import (
     TestPlanUnionSerializer,
     TestPlanUpdateSerializer,
     TestResultActivitySerializer,
+    TestResultIngestOutputSerializer,
+    TestResultIngestSerializer,
     TestResultInputSerializer,
     TestResultSerializer,
     TestSerializer,
@@ -113,6 +117,8 @@ from testy.tests_representation.services.results import TestResultService
 from testy.tests_representation.services.status import ResultStatusService
 from testy.tests_representation.services.testplans import TestPlanService
 from testy.tests_representation.services.tests import TestService
+from testy.tests_representation.tasks import copy_plans
+from testy.tests_representation.validators import ResultIngestCustomAttributeValuesValidator
 from testy.utilities.request import (
     PeriodDateTime,
     get_boolean,
@@ -130,6 +136,14 @@ _IS_ARCHIVE = 'is_archive'
 _LIST = 'list'
 _ACTIVITY = 'activity'
 _RESULT_STATUS = 'status'
+_ARCHIVE_ACTIONS = frozenset((
+    'archive_preview',
+    'archive_objects',
+    'archive_async',
+    'restore_archived',
+    'restore_archived_async',
+))
+_INGEST_VALIDATION_BATCH_SIZE = 1000
 
 
 class ParameterViewSet(TestyModelViewSet):
@@ -284,7 +298,7 @@ class TestPlanViewSet(TestyModelViewSet, TestyArchiveMixin):
     def get_queryset(self):
         queryset = TestPlanSelector.testplan_list()
         match self.action:
-            case 'recovery_list' | 'restore' | 'delete_permanently':
+            case 'recovery_list' | 'restore' | 'restore_async' | 'delete_permanently':
                 queryset = TestPlanSelector.testplan_deleted_list()
             case 'list_union' | 'list':
                 queryset = TestPlanSelector.testplan_list_titled()
@@ -300,7 +314,7 @@ class TestPlanViewSet(TestyModelViewSet, TestyArchiveMixin):
                 return TestPlanInputSerializer
             case 'update' | 'partial_update':
                 return TestPlanUpdateSerializer
-            case 'copy_plans':
+            case 'copy_plans' | 'copy_plans_async':
                 return TestPlanCopySerializer
             case 'suites_by_plan' | 'suites_by_root':
                 return TestSuiteTreeBreadcrumbsSerializer
@@ -349,28 +363,34 @@ class TestPlanViewSet(TestyModelViewSet, TestyArchiveMixin):
             plans = TestPlan.objects.filter(
                 id__in=tests.values_list('plan_id', flat=True).distinct(),
             ).get_ancestors(include_self=True)
-            plans = TestPlanSelector.annotate_title(plans)
             plans = PlanUnionFilterNoSearch(request.query_params, request=request, queryset=plans).qs
 
         if has_common_filters:
             plans = plans | self.filter_queryset(self.get_queryset())
 
+        paginator = self.paginator
+        position = None
+        if UnionCursorPagination.is_requested(request):
+            paginator = UnionCursorPagination()
+            position = paginator.get_position(request)
+
         plans_union = TestPlanSelector.plans_tests_union(
             tests,
             parent_id,
             plans,
+            position,
         )
 
         plans_union = PlanUnionOrderingFilter(request.query_params, queryset=plans_union).qs
 
-        page = self.paginate_queryset(plans_union)
+        page = paginator.paginate_queryset(plans_union, request, view=self)
         context = self.get_serializer_context()
         data = TestPlanSelector().get_union_data(
             page,
             partial(TestUnionSerializer, context=context),
             partial(TestPlanUnionSerializer, context=context),
         )
-        return self.get_paginated_response(data)
+        return paginator.get_paginated_response(data)
 
     @plan_activity_schema
     @action(methods=[_GET], url_path=_ACTIVITY, url_name=_ACTIVITY, detail=True, suffix='List')
@@ -420,9 +440,8 @@ class TestPlanViewSet(TestyModelViewSet, TestyArchiveMixin):
             plans = TestPlanSelector.plan_list_by_tree_id(plans.values_list('tree_id', flat=True))
         elif get_boolean(request, 'show_descendants'):
             plans = plans.get_descendants(include_self=True)
-        suites = TestSuiteSelector().root_suites_by_plans(plans, parent)
-        data = orjson.dumps(suites)
-        return HttpResponse(content=data, content_type='application/json')
+        content = TestSuiteSelector().root_suites_by_plans(plans, parent)
+        return StreamingHttpResponse(streaming_content=content, content_type='application/json')
 
     @action(methods=[_GET], url_path='suites', url_name='suites', detail=True)
     def suites_by_plan(self, request, pk):
@@ -437,9 +456,8 @@ class TestPlanViewSet(TestyModelViewSet, TestyArchiveMixin):
     def descendants_tree_by_root(self, request):
         plans = self.filter_queryset(self.get_queryset())
         parent_id = get_integer(request, 'parent')
-        plans = TestPlanSelector().plans_breadcrumbs_by_root(plans, parent_id)
-        content = orjson.dumps(plans)
-        return HttpResponse(content=content, content_type='application/json')
+        content = TestPlanSelector().plans_breadcrumbs_by_root(plans, parent_id)
+        return StreamingHttpResponse(streaming_content=content, content_type='application/json')
 
     @action(methods=[_GET], url_path='descendants-tree', url_name='descendants-tree', detail=True)
     def descendants_tree(self, request, pk):
@@ -500,7 +518,7 @@ class TestPlanViewSet(TestyModelViewSet, TestyArchiveMixin):
     def copy_plans(self, request):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        plans = CopyService.plans_copy(serializer.validated_data)
+        plans = CopyService.plans_copy(serializer.validated_data, user_id=request.user.pk)
         return Response(
             TestPlanOutputSerializer(
                 plans,
@@ -509,6 +527,20 @@ class TestPlanViewSet(TestyModelViewSet, TestyArchiveMixin):
             ).data,
         )
 
+    @swagger_auto_schema(responses={status.HTTP_202_ACCEPTED: TaskSerializer()})
+    @action(methods=['post'], url_path='copy/async', url_name='copy-async', detail=False)
+    def copy_plans_async(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        dst_plan = serializer.validated_data.get('dst_plan')
+        task = copy_plans.delay(
+            plans=[dict(plan_details) for plan_details in serializer.data['plans']],
+            dst_plan_id=dst_plan.pk if dst_plan else None,
+            keep_assignee=serializer.validated_data['keep_assignee'],
+            user_id=request.user.pk,
+        )
+        return Response(TaskSerializer({'task_id': task.id}).data, status=status.HTTP_202_ACCEPTED)
+
     @action(methods=[_GET], url_path='breadcrumbs', url_name='breadcrumbs', detail=True)
     def breadcrumbs(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -540,8 +572,8 @@ class TestPlanViewSet(TestyModelViewSet, TestyArchiveMixin):
         ).qs.values_list('id', flat=True)
         tests = TestSelector.test_list_by_testplan_ids(plan_ids)
         tests = TestSelector().test_list_with_last_status(tests)
-        tests = TestSuiteSelector.annotate_suite_path(tests, 'case__suite__path')
-        tests = TestPlanSelector.annotate_plan_path(tests, 'plan__path').order_by('created_at')
+        tests = TestSuiteSelector.annotate_suite_path(tests, 'case__suite')
+        tests = TestPlanSelector.annotate_plan_path(tests, 'plan').order_by('created_at')
         tests = TestsByPlanFilter(request.query_params, request=request, queryset=tests).qs
         page = self.paginate_queryset(tests)
         serializer = self.get_serializer(page, many=True)
@@ -589,18 +621,18 @@ class TestViewSet(TestyModelViewSet, TestyArchiveMixin):
 
     def get_queryset(self, test_plan_ids: Iterable[int] | None = None):
         filters = {'plan_id__in': test_plan_ids} if test_plan_ids else {}
-        if self.action in {'archive_preview', 'archive_objects', 'restore_archived'}:
+        if self.action in _ARCHIVE_ACTIONS:
             return TestSelector().test_list()
         qs = TestSelector().test_list_with_last_status(filter_condition=filters)
-        qs = TestSuiteSelector.annotate_suite_path(qs, 'case__suite__path')
-        return TestPlanSelector.annotate_plan_path(qs, 'plan__path')
+        qs = TestSuiteSelector.annotate_suite_path(qs, 'case__suite')
+        return TestPlanSelector.annotate_plan_path(qs, 'plan')
 
     def get_serializer_class(self):
         if self.action == 'bulk_update_tests':
             return BulkUpdateTestsSerializer
         return TestSerializer
 
-    @swagger_auto_schema(responses={status.HTTP_200_OK: TestSerializer(many=True)})
+    @swagger_auto_schema(responses={status.HTTP_200_OK: BulkUpdateTestsOutputSerializer(many=True)})
     @action(methods=['put'], url_path='bulk-update', url_name='bulk-update', detail=False)
     def bulk_update_tests(self, request):
         serializer = self.get_serializer(data=request.data)
@@ -612,7 +644,7 @@ class TestViewSet(TestyModelViewSet, TestyArchiveMixin):
         if filter_conditions:
             queryset = self._filter_queryset_from_request_payload(queryset, filter_conditions)
         tests = TestService().bulk_update_tests(queryset, serializer.validated_data, request.user)
-        return Response(TestSerializer(tests, many=True, context=self.get_serializer_context()).data)
+        return Response(BulkUpdateTestsOutputSerializer(tests, many=True).data)
 
     def _filter_queryset_from_request_payload(self, queryset: QuerySet[Test], filter_conditions: dict[str, Any]):
         mocked_request = mock_request_with_query_params(filter_conditions)
@@ -633,6 +665,8 @@ class TestResultViewSet(ModelViewSet, TestyArchiveMixin):
     def get_serializer_class(self):
         if self.action in {'create', 'partial_update'}:
             return TestResultInputSerializer
+        if self.action == 'ingest':
+            return TestResultIngestSerializer
         return TestResultSerializer
 
     @property
@@ -656,6 +690,55 @@ class TestResultViewSet(ModelViewSet, TestyArchiveMixin):
         ).delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @swagger_auto_schema(
+        manual_parameters=[project_param],
+        responses={status.HTTP_200_OK: TestResultIngestOutputSerializer()},
+    )
+    @action(
+        methods=['post'],
+        url_path='ingest',
+        url_name='ingest',
+        detail=False,
+        permission_classes=[IsAuthenticated, TestResultPermission],
+    )
+    def ingest(self, request):
+        project = ProjectSelector.project_by_id(request.query_params.get('project'))
+        statuses = set(ResultStatusSelector.status_list(project=project).values_list('id', flat=True))
+        context = {
+            'statuses': statuses,
+            'attributes_validator': ResultIngestCustomAttributeValuesValidator(project),
+        }
+        errors = []
+        created, ingest_errors = TestResultService.result_bulk_ingest(
+            project,
+            self._ingest_records(request, context, errors),
+            request.user,
+        )
+        errors = sorted(errors + ingest_errors, key=lambda error: error['line'])
+        return Response(TestResultIngestOutputSerializer({'created': created, 'errors': errors}).data)
+
+    @classmethod
+    def _ingest_records(cls, request, context: dict, errors: list[dict[str, Any]]):
+        lines = enumerate(request.stream or [], start=1)
+        while batch := list(islice(lines, _INGEST_VALIDATION_BATCH_SIZE)):
+            parsed_batch = []
+            for line_number, line in batch:
+                if not line.strip():
+                    continue
+                try:
+                    parsed_batch.append((line_number, orjson.loads(line)))
+                except orjson.JSONDecodeError:
+                    errors.append({'line': line_number, 'errors': {'non_field_errors': ['Invalid JSON']}})
+            context['attributes_validator'].prefetch_tests(
+                data.get('test') for _, data in parsed_batch if isinstance(data, dict)
+            )
+            for line_number, data in parsed_batch:
+                serializer = TestResultIngestSerializer(data=data, context=context)
+                if serializer.is_valid():
+                    yield line_number, serializer.validated_data
+                else:
+                    errors.append({'line': line_number, 'errors': serializer.errors})
+
 
 class ResultStatusViewSet(TestyModelViewSet):
     queryset = ResultStatusSelector.status_list_raw()
@@ -671,7 +754,7 @@ class ResultStatusViewSet(TestyModelViewSet):
 
     def get_queryset(self):
         match self.action:
-            case 'recovery_list' | 'restore' | 'delete_permanently':
+            case 'recovery_list' | 'restore' | 'restore_async' | 'delete_permanently':
                 return ResultStatusSelector.status_deleted_list()
             case 'list':
                 project = ProjectSelector.project_by_id(self.request.query_params.get('project'))
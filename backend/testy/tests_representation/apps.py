@@ -36,6 +36,7 @@ def notification_callback(sender, **kwargs):
     from testy.core.services.notifications import NotificationService
     recipient = kwargs.get('recipient')
     if recipient:
+        NotificationService.adjust_unread_count(recipient.id, 1)
         NotificationService.change_notifications_count(recipient)
 
 
@@ -110,13 +110,13 @@ class PlanFilter(SearchFilterMixin):
         ),
     )
     search_fields = ['title', 'id']
+    search_rank_field = 'title'
 
     def filter_by_treesearch(self, qs, field_name, value):
         if not parse_bool_from_str(self.data.get('is_archive')):
             qs = qs.filter(is_archive=False)
         qs = self.filter_by_search(qs, field_name, value)
         ancestors = qs.get_ancestors(include_self=True)
-        ancestors = TestPlanSelector.annotate_title(ancestors)
         return TestPlanSelector.annotate_has_children_with_tests(
             ancestors,
             ancestors.filter(parent_id=OuterRef('pk')),
@@ -124,9 +124,7 @@ class PlanFilter(SearchFilterMixin):
 
     @classmethod
     def filter_by_parameters(cls, queryset, field_name, parameter_ids):
-        for parameter_id in parameter_ids:
-            queryset = queryset.filter(parameters__id=parameter_id)
-        return queryset
+        return queryset.filter(**{f'{field_name}__contains': parameter_ids})
 
     @classmethod
     def filter_by_parent(cls, queryset, field_name, parent):
@@ -462,7 +460,7 @@ class TestPlanSearchFilter(TreeSearchBaseFilter):
         }
         if not get_boolean(request, 'is_archive'):
             additional_filters['is_archive'] = False
-        qs = TestPlanSelector.annotate_title(TestPlanSelector.testplan_list_raw())
+        qs = TestPlanSelector.testplan_list_raw()
         return qs.filter(filter_conditions, **additional_filters)
 
 
@@ -487,9 +485,7 @@ class PlanFilterV1(filters.FilterSet):
 
     @classmethod
     def filter_by_parameters(cls, queryset, field_name, parameter_ids):
-        for parameter_id in parameter_ids:
-            queryset = queryset.filter(parameters__id=parameter_id)
-        return queryset
+        return queryset.filter(**{f'{field_name}__contains': parameter_ids})
 
     @classmethod
     def filter_by_parent(cls, queryset, field_name, parent):
@@ -0,0 +1,97 @@
+# Generated by Django 4.2.13 on 2026-10-18 02:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.functions.comparison
+import pgtrigger.compiler
+import pgtrigger.migrations
+from django.db.models import BigIntegerField, Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_plan_statistics(apps, schema_editor):
+    Test = apps.get_model('tests_representation', 'Test')
+    TestPlanStatistics = apps.get_model('tests_representation', 'TestPlanStatistics')
+    rows = (
+        Test.objects
+        .filter(is_deleted=False)
+        .values('project_id', 'plan_id', 'last_status_id', 'is_archive')
+        .annotate(
+            tests_count=Count('id'),
+            estimates=Coalesce(Sum('case__estimate'), 0, output_field=BigIntegerField()),
+            empty_estimates=Count('id', filter=Q(case__estimate__isnull=True)),
+        )
+        .order_by()
+    )
+    TestPlanStatistics.objects.bulk_create(
+        [
+            TestPlanStatistics(
+                project_id=row['project_id'],
+                plan_id=row['plan_id'],
+                status_id=row['last_status_id'],
+                is_archive=row['is_archive'],
+                tests_count=row['tests_count'],
+                estimates_sum=row['estimates'],
+                empty_estimates_count=row['empty_estimates'],
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_remove_customattribute_content_types_and_more'),
+        ('tests_representation', '0035_testresult_results_histogram_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestPlanStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_archive', models.BooleanField(default=False)),
+                ('tests_count', models.IntegerField(default=0)),
+                ('estimates_sum', models.BigIntegerField(default=0)),
+                ('empty_estimates_count', models.IntegerField(default=0)),
+            ],
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='test',
+            trigger=pgtrigger.compiler.Trigger(name='plan_statistics_on_insert', sql=pgtrigger.compiler.UpsertTriggerSql(func='IF NOT NEW.is_deleted THEN \nINSERT INTO tests_representation_testplanstatistics AS stat\n(project_id, plan_id, status_id, is_archive, tests_count, estimates_sum, empty_estimates_count)\nSELECT NEW.project_id, NEW.plan_id, NEW.last_status_id, NEW.is_archive,\n       1, COALESCE(tc.estimate, 0), (tc.estimate IS NULL)::int\nFROM tests_description_testcase tc\nWHERE tc.id = NEW.case_id\nON CONFLICT (plan_id, COALESCE(status_id, 0), is_archive) DO UPDATE\nSET tests_count = stat.tests_count + EXCLUDED.tests_count,\n    estimates_sum = stat.estimates_sum + EXCLUDED.estimates_sum,\n    empty_estimates_count = stat.empty_estimates_count + EXCLUDED.empty_estimates_count;\n END IF; RETURN NULL;', hash='a5983c97d3a56b45d2be7e826e582d52a870e4e1', operation='INSERT', pgid='pgtrigger_plan_statistics_on_insert_99e10', table='tests_representation_test', when='AFTER')),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='test',
+            trigger=pgtrigger.compiler.Trigger(name='plan_statistics_on_update', sql=pgtrigger.compiler.UpsertTriggerSql(condition='WHEN (OLD."plan_id" IS DISTINCT FROM (NEW."plan_id") OR OLD."last_status_id" IS DISTINCT FROM (NEW."last_status_id") OR OLD."is_archive" IS DISTINCT FROM (NEW."is_archive") OR OLD."is_deleted" IS DISTINCT FROM (NEW."is_deleted") OR OLD."case_id" IS DISTINCT FROM (NEW."case_id"))', func='\nIF NOT OLD.is_deleted THEN \nUPDATE tests_representation_testplanstatistics\nSET tests_count = tests_count - 1,\n    estimates_sum = estimates_sum - COALESCE(tc.estimate, 0),\n    empty_estimates_count = empty_estimates_count - (tc.estimate IS NULL)::int\nFROM tests_description_testcase tc\nWHERE tc.id = OLD.case_id\n  AND tests_representation_testplanstatistics.plan_id = OLD.plan_id\n  AND COALESCE(tests_representation_testplanstatistics.status_id, 0) = COALESCE(OLD.last_status_id, 0)\n  AND tests_representation_testplanstatistics.is_archive = OLD.is_archive;\n END IF;\nIF NOT NEW.is_deleted THEN \nINSERT INTO tests_representation_testplanstatistics AS stat\n(project_id, plan_id, status_id, is_archive, tests_count, estimates_sum, empty_estimates_count)\nSELECT NEW.project_id, NEW.plan_id, NEW.last_status_id, NEW.is_archive,\n       1, COALESCE(tc.estimate, 0), (tc.estimate IS NULL)::int\nFROM tests_description_testcase tc\nWHERE tc.id = NEW.case_id\nON CONFLICT (plan_id, COALESCE(status_id, 0), is_archive) DO UPDATE\nSET tests_count = stat.tests_count + EXCLUDED.tests_count,\n    estimates_sum = stat.estimates_sum + EXCLUDED.estimates_sum,\n    empty_estimates_count = stat.empty_estimates_count + EXCLUDED.empty_estimates_count;\n END IF;\nRETURN NULL;\n', hash='8b4b2dbcbc8f51152b349fc74e48cc436a5b7978', operation='UPDATE', pgid='pgtrigger_plan_statistics_on_update_4ac22', table='tests_representation_test', when='AFTER')),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='test',
+            trigger=pgtrigger.compiler.Trigger(name='plan_statistics_on_delete', sql=pgtrigger.compiler.UpsertTriggerSql(func='IF NOT OLD.is_deleted THEN \nUPDATE tests_representation_testplanstatistics\nSET tests_count = tests_count - 1,\n    estimates_sum = estimates_sum - COALESCE(tc.estimate, 0),\n    empty_estimates_count = empty_estimates_count - (tc.estimate IS NULL)::int\nFROM tests_description_testcase tc\nWHERE tc.id = OLD.case_id\n  AND tests_representation_testplanstatistics.plan_id = OLD.plan_id\n  AND COALESCE(tests_representation_testplanstatistics.status_id, 0) = COALESCE(OLD.last_status_id, 0)\n  AND tests_representation_testplanstatistics.is_archive = OLD.is_archive;\n END IF; RETURN NULL;', hash='22401f3ed12863d92dee9494c6c7f88b776a652d', operation='DELETE', pgid='pgtrigger_plan_statistics_on_delete_0d721', table='tests_representation_test', when='AFTER')),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='testplan',
+            trigger=pgtrigger.compiler.Trigger(name='plan_statistics_on_plan_delete', sql=pgtrigger.compiler.UpsertTriggerSql(func='DELETE FROM tests_representation_testplanstatistics WHERE plan_id = OLD.id; RETURN OLD;', hash='52b3c0255c9ff495f456fb34b07939c539d70e7b', operation='DELETE', pgid='pgtrigger_plan_statistics_on_plan_delete_63237', table='tests_representation_testplan', when='BEFORE')),
+        ),
+        migrations.AddField(
+            model_name='testplanstatistics',
+            name='plan',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='tests_representation.testplan'),
+        ),
+        migrations.AddField(
+            model_name='testplanstatistics',
+            name='project',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='core.project'),
+        ),
+        migrations.AddField(
+            model_name='testplanstatistics',
+            name='status',
+            field=models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='tests_representation.resultstatus'),
+        ),
+        migrations.AddConstraint(
+            model_name='testplanstatistics',
+            constraint=models.UniqueConstraint(models.F('plan'), django.db.models.functions.comparison.Coalesce(models.F('status'), models.Value(0)), models.F('is_archive'), name='plan_statistics_unique_constraint'),
+        ),
+        migrations.RunPython(fill_plan_statistics, migrations.RunPython.noop),
+    ]
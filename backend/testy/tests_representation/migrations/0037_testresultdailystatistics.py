@@ -0,0 +1,102 @@
+# Generated by Django 4.2.13 on 2026-10-18 03:22
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+import pgtrigger.compiler
+import pgtrigger.migrations
+from datetime import timezone
+
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def fill_result_statistics(apps, schema_editor):
+    TestResult = apps.get_model('tests_representation', 'TestResult')
+    TestResultDailyStatistics = apps.get_model('tests_representation', 'TestResultDailyStatistics')
+    rows = (
+        TestResult.objects
+        .filter(is_deleted=False)
+        .annotate(day=TruncDate('created_at', tzinfo=timezone.utc))
+        .values('project_id', 'test__plan_id', 'status_id', 'is_archive', 'day')
+        .annotate(results_count=Count('id'))
+        .order_by()
+    )
+    TestResultDailyStatistics.objects.bulk_create(
+        [
+            TestResultDailyStatistics(
+                project_id=row['project_id'],
+                plan_id=row['test__plan_id'],
+                status_id=row['status_id'],
+                is_archive=row['is_archive'],
+                day=row['day'],
+                results_count=row['results_count'],
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_remove_customattribute_content_types_and_more'),
+        ('tests_representation', '0036_testplanstatistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestResultDailyStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_archive', models.BooleanField(default=False)),
+                ('day', models.DateField()),
+                ('results_count', models.IntegerField(default=0)),
+            ],
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='test',
+            trigger=pgtrigger.compiler.Trigger(name='result_statistics_on_test_move', sql=pgtrigger.compiler.UpsertTriggerSql(condition='WHEN (OLD."plan_id" IS DISTINCT FROM (NEW."plan_id"))', func="\nINSERT INTO tests_representation_testresultdailystatistics (project_id, plan_id, status_id, is_archive, day, results_count)\nSELECT r.project_id, OLD.plan_id, r.status_id, r.is_archive,\n       (r.created_at AT TIME ZONE 'UTC')::date, -COUNT(*)\nFROM tests_representation_testresult r\nWHERE r.test_id = NEW.id AND NOT r.is_deleted\nGROUP BY r.project_id, r.status_id, r.is_archive, (r.created_at AT TIME ZONE 'UTC')::date;\n \nINSERT INTO tests_representation_testresultdailystatistics (project_id, plan_id, status_id, is_archive, day, results_count)\nSELECT r.project_id, NEW.plan_id, r.status_id, r.is_archive,\n       (r.created_at AT TIME ZONE 'UTC')::date, COUNT(*)\nFROM tests_representation_testresult r\nWHERE r.test_id = NEW.id AND NOT r.is_deleted\nGROUP BY r.project_id, r.status_id, r.is_archive, (r.created_at AT TIME ZONE 'UTC')::date;\n RETURN NULL;", hash='9e5d5e2491d20487894fb32172cd14f4bd52ba6d', operation='UPDATE', pgid='pgtrigger_result_statistics_on_test_move_746bd', table='tests_representation_test', when='AFTER')),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='testplan',
+            trigger=pgtrigger.compiler.Trigger(name='result_statistics_on_plan_delete', sql=pgtrigger.compiler.UpsertTriggerSql(func='DELETE FROM tests_representation_testresultdailystatistics WHERE plan_id = OLD.id; RETURN OLD;', hash='dac7cfb17c8ea3e69521dfb3775f33a64779f571', operation='DELETE', pgid='pgtrigger_result_statistics_on_plan_delete_48b04', table='tests_representation_testplan', when='BEFORE')),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='testresult',
+            trigger=pgtrigger.compiler.Trigger(name='result_statistics_on_insert', sql=pgtrigger.compiler.UpsertTriggerSql(func="IF NOT NEW.is_deleted THEN \nINSERT INTO tests_representation_testresultdailystatistics (project_id, plan_id, status_id, is_archive, day, results_count)\nSELECT NEW.project_id, t.plan_id, NEW.status_id, NEW.is_archive,\n       (NEW.created_at AT TIME ZONE 'UTC')::date, 1\nFROM tests_representation_test t\nWHERE t.id = NEW.test_id;\n END IF; RETURN NULL;", hash='fe18fdeb9fc3ba05258a02ec090a39cf00fb00a6', operation='INSERT', pgid='pgtrigger_result_statistics_on_insert_85c97', table='tests_representation_testresult', when='AFTER')),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='testresult',
+            trigger=pgtrigger.compiler.Trigger(name='result_statistics_on_update', sql=pgtrigger.compiler.UpsertTriggerSql(condition='WHEN (OLD."test_id" IS DISTINCT FROM (NEW."test_id") OR OLD."project_id" IS DISTINCT FROM (NEW."project_id") OR OLD."status_id" IS DISTINCT FROM (NEW."status_id") OR OLD."is_archive" IS DISTINCT FROM (NEW."is_archive") OR OLD."is_deleted" IS DISTINCT FROM (NEW."is_deleted") OR OLD."created_at" IS DISTINCT FROM (NEW."created_at"))', func="\nIF NOT OLD.is_deleted THEN \nINSERT INTO tests_representation_testresultdailystatistics (project_id, plan_id, status_id, is_archive, day, results_count)\nSELECT OLD.project_id, t.plan_id, OLD.status_id, OLD.is_archive,\n       (OLD.created_at AT TIME ZONE 'UTC')::date, -1\nFROM tests_representation_test t\nWHERE t.id = OLD.test_id;\n END IF;\nIF NOT NEW.is_deleted THEN \nINSERT INTO tests_representation_testresultdailystatistics (project_id, plan_id, status_id, is_archive, day, results_count)\nSELECT NEW.project_id, t.plan_id, NEW.status_id, NEW.is_archive,\n       (NEW.created_at AT TIME ZONE 'UTC')::date, 1\nFROM tests_representation_test t\nWHERE t.id = NEW.test_id;\n END IF;\nRETURN NULL;\n", hash='db19dbb5425c42884836ef34a2cf3b1d4b7e5342', operation='UPDATE', pgid='pgtrigger_result_statistics_on_update_a41f7', table='tests_representation_testresult', when='AFTER')),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='testresult',
+            trigger=pgtrigger.compiler.Trigger(name='result_statistics_on_delete', sql=pgtrigger.compiler.UpsertTriggerSql(func="IF NOT OLD.is_deleted THEN \nINSERT INTO tests_representation_testresultdailystatistics (project_id, plan_id, status_id, is_archive, day, results_count)\nSELECT OLD.project_id, t.plan_id, OLD.status_id, OLD.is_archive,\n       (OLD.created_at AT TIME ZONE 'UTC')::date, -1\nFROM tests_representation_test t\nWHERE t.id = OLD.test_id;\n END IF; RETURN NULL;", hash='6aa45f9fac71310d6f581b591b4f45d524b39165', operation='DELETE', pgid='pgtrigger_result_statistics_on_delete_2530b', table='tests_representation_testresult', when='AFTER')),
+        ),
+        migrations.AddField(
+            model_name='testresultdailystatistics',
+            name='plan',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='tests_representation.testplan'),
+        ),
+        migrations.AddField(
+            model_name='testresultdailystatistics',
+            name='project',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='core.project'),
+        ),
+        migrations.AddField(
+            model_name='testresultdailystatistics',
+            name='status',
+            field=models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='tests_representation.resultstatus'),
+        ),
+        migrations.AddIndex(
+            model_name='testresultdailystatistics',
+            index=django.contrib.postgres.indexes.BTreeIndex(models.F('project_id'), models.F('day'), name='result_statistics_project_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testresultdailystatistics',
+            index=django.contrib.postgres.indexes.BTreeIndex(models.F('plan_id'), models.F('day'), name='result_statistics_plan_idx'),
+        ),
+        migrations.RunPython(fill_result_statistics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.13 on 2026-10-18 03:34
+
+from django.db import migrations
+import pgtrigger.compiler
+import pgtrigger.migrations
+
+REFRESH_LAST_STATUS_SQL = """
+UPDATE tests_representation_test t
+SET last_status_id = latest.status_id
+FROM (
+    SELECT DISTINCT ON (r.test_id) r.test_id, r.status_id
+    FROM tests_representation_testresult r
+    WHERE NOT r.is_deleted
+    ORDER BY r.test_id, r.created_at DESC, r.id DESC
+) latest
+WHERE t.id = latest.test_id AND t.last_status_id IS DISTINCT FROM latest.status_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests_representation', '0037_testresultdailystatistics'),
+    ]
+
+    operations = [
+        pgtrigger.migrations.AddTrigger(
+            model_name='testresult',
+            trigger=pgtrigger.compiler.Trigger(name='last_status_on_insert', sql=pgtrigger.compiler.UpsertTriggerSql(func='\nUPDATE tests_representation_test t\nSET last_status_id = latest.status_id\nFROM (\n    SELECT DISTINCT ON (changed.test_id) changed.test_id, r.status_id\n    FROM (SELECT DISTINCT test_id FROM new_results) changed\n    LEFT JOIN tests_representation_testresult r ON r.test_id = changed.test_id AND NOT r.is_deleted\n    ORDER BY changed.test_id, r.created_at DESC NULLS LAST, r.id DESC\n) latest\nWHERE t.id = latest.test_id AND t.last_status_id IS DISTINCT FROM latest.status_id;\nRETURN NULL;\n', hash='f1217038ded4d73e1b2054874882b1f8820e5dfc', level='STATEMENT', operation='INSERT', pgid='pgtrigger_last_status_on_insert_30a16', referencing='REFERENCING NEW TABLE AS new_results ', table='tests_representation_testresult', when='AFTER')),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='testresult',
+            trigger=pgtrigger.compiler.Trigger(name='last_status_on_update', sql=pgtrigger.compiler.UpsertTriggerSql(func='\nUPDATE tests_representation_test t\nSET last_status_id = latest.status_id\nFROM (\n    SELECT DISTINCT ON (changed.test_id) changed.test_id, r.status_id\n    FROM (\nSELECT o.test_id FROM old_results o JOIN new_results n ON n.id = o.id\nWHERE (o.test_id, o.status_id, o.created_at, o.is_deleted) IS DISTINCT FROM\n      (n.test_id, n.status_id, n.created_at, n.is_deleted)\nUNION\nSELECT n.test_id FROM old_results o JOIN new_results n ON n.id = o.id\nWHERE (o.test_id, o.status_id, o.created_at, o.is_deleted) IS DISTINCT FROM\n      (n.test_id, n.status_id, n.created_at, n.is_deleted)\n) changed\n    LEFT JOIN tests_representation_testresult r ON r.test_id = changed.test_id AND NOT r.is_deleted\n    ORDER BY changed.test_id, r.created_at DESC NULLS LAST, r.id DESC\n) latest\nWHERE t.id = latest.test_id AND t.last_status_id IS DISTINCT FROM latest.status_id;\nRETURN NULL;\n', hash='e804fdb5ce92a1f8ed789cd9b909127d7fc3c5e3', level='STATEMENT', operation='UPDATE', pgid='pgtrigger_last_status_on_update_d1c5e', referencing='REFERENCING OLD TABLE AS old_results  NEW TABLE AS new_results ', table='tests_representation_testresult', when='AFTER')),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='testresult',
+            trigger=pgtrigger.compiler.Trigger(name='last_status_on_delete', sql=pgtrigger.compiler.UpsertTriggerSql(func='\nUPDATE tests_representation_test t\nSET last_status_id = latest.status_id\nFROM (\n    SELECT DISTINCT ON (changed.test_id) changed.test_id, r.status_id\n    FROM (SELECT DISTINCT test_id FROM old_results) changed\n    LEFT JOIN tests_representation_testresult r ON r.test_id = changed.test_id AND NOT r.is_deleted\n    ORDER BY changed.test_id, r.created_at DESC NULLS LAST, r.id DESC\n) latest\nWHERE t.id = latest.test_id AND t.last_status_id IS DISTINCT FROM latest.status_id;\nRETURN NULL;\n', hash='e98cbe02ad86d9964ea476447379b11687a23011', level='STATEMENT', operation='DELETE', pgid='pgtrigger_last_status_on_delete_9643a', referencing='REFERENCING OLD TABLE AS old_results ', table='tests_representation_testresult', when='AFTER')),
+        ),
+        migrations.RunSQL(REFRESH_LAST_STATUS_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 4.2.13 on 2026-10-18 07:04
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+import pgtrigger.compiler
+import pgtrigger.migrations
+
+BACKFILL_TITLE_SQL = 'UPDATE tests_representation_testplan SET parameter_ids = parameter_ids'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests_representation', '0038_testresult_last_status_triggers'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='TestPlanParameter',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                    ],
+                    options={
+                        'db_table': 'tests_representation_testplan_parameters',
+                    },
+                ),
+                migrations.AddField(
+                    model_name='testplanparameter',
+                    name='parameter',
+                    field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tests_representation.parameter'),
+                ),
+                migrations.AddField(
+                    model_name='testplanparameter',
+                    name='testplan',
+                    field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tests_representation.testplan'),
+                ),
+                migrations.AlterField(
+                    model_name='testplan',
+                    name='parameters',
+                    field=models.ManyToManyField(blank=True, related_name='test_plans', through='tests_representation.TestPlanParameter', to='tests_representation.parameter'),
+                ),
+                migrations.AlterUniqueTogether(
+                    name='testplanparameter',
+                    unique_together={('testplan', 'parameter')},
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='testplan',
+            name='parameter_ids',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='testplan',
+            name='title',
+            field=models.TextField(default='', editable=False),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='parameter',
+            trigger=pgtrigger.compiler.Trigger(name='plan_title_on_parameter_update', sql=pgtrigger.compiler.UpsertTriggerSql(condition='WHEN (OLD."data" IS DISTINCT FROM (NEW."data"))', func='\nUPDATE tests_representation_testplan SET parameter_ids = parameter_ids\nWHERE parameter_ids @> ARRAY[NEW.id];\nRETURN NULL;\n', hash='e3906e810197ec550c5cda550e1eaaa09cc0b4c5', operation='UPDATE', pgid='pgtrigger_plan_title_on_parameter_update_46253', table='tests_representation_parameter', when='AFTER')),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='testplan',
+            trigger=pgtrigger.compiler.Trigger(name='plan_title_on_change', sql=pgtrigger.compiler.UpsertTriggerSql(func="\nSELECT COALESCE(array_agg(prm.id ORDER BY prm.id), ARRAY[]::bigint[]),\n       NEW.name || COALESCE(' [' || string_agg(prm.data, ', ' ORDER BY prm.data) || ']', '')\nINTO NEW.parameter_ids, NEW.title\nFROM tests_representation_testplan_parameters tp\nJOIN tests_representation_parameter prm ON prm.id = tp.parameter_id\nWHERE tp.testplan_id = NEW.id;\nRETURN NEW;\n", hash='fee618d4167586777c961075fc84bbf9c43c276e', operation='INSERT OR UPDATE OF "name", "parameter_ids"', pgid='pgtrigger_plan_title_on_change_7cbc3', table='tests_representation_testplan', when='BEFORE')),
+        ),
+        migrations.RunSQL(BACKFILL_TITLE_SQL, migrations.RunSQL.noop),
+        pgtrigger.migrations.AddTrigger(
+            model_name='testplanparameter',
+            trigger=pgtrigger.compiler.Trigger(name='plan_title_on_parameters_insert', sql=pgtrigger.compiler.UpsertTriggerSql(func='\nUPDATE tests_representation_testplan SET parameter_ids = parameter_ids\nWHERE id IN (SELECT testplan_id FROM new_parameters);\nRETURN NULL;\n', hash='0aa01b47a8d4b229d6094c8348ea0ef1d91f3db9', level='STATEMENT', operation='INSERT', pgid='pgtrigger_plan_title_on_parameters_insert_b07b4', referencing='REFERENCING NEW TABLE AS new_parameters ', table='tests_representation_testplan_parameters', when='AFTER')),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='testplanparameter',
+            trigger=pgtrigger.compiler.Trigger(name='plan_title_on_parameters_delete', sql=pgtrigger.compiler.UpsertTriggerSql(func='\nUPDATE tests_representation_testplan SET parameter_ids = parameter_ids\nWHERE id IN (SELECT testplan_id FROM old_parameters);\nRETURN NULL;\n', hash='ac38787dc15e85e4436723cdb82ab738009b82c4', level='STATEMENT', operation='DELETE', pgid='pgtrigger_plan_title_on_parameters_delete_2ebbf', referencing='REFERENCING OLD TABLE AS old_parameters ', table='tests_representation_testplan_parameters', when='AFTER')),
+        ),
+    ]
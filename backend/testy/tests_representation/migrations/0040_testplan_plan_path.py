@@ -0,0 +1,45 @@
+# Generated by Django 4.2.13 on 2026-10-18 07:19
+
+from django.db import migrations, models
+import pgtrigger.compiler
+import pgtrigger.migrations
+
+BACKFILL_PATH_SQL = """
+UPDATE tests_representation_testplan node
+SET plan_path = titles.plan_path
+FROM (
+    SELECT descendant.id, string_agg(ancestor.title, '/' ORDER BY ancestor.path) AS plan_path
+    FROM tests_representation_testplan descendant
+    JOIN tests_representation_testplan ancestor ON ancestor.tree_id = descendant.tree_id AND ancestor.path @> descendant.path
+    GROUP BY descendant.id
+) titles
+WHERE node.id = titles.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests_representation', '0039_testplan_denormalized_title'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testplan',
+            name='plan_path',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunSQL(BACKFILL_PATH_SQL, migrations.RunSQL.noop),
+        pgtrigger.migrations.AddTrigger(
+            model_name='testplan',
+            trigger=pgtrigger.compiler.Trigger(name='plan_title_path_insert_trg', sql=pgtrigger.compiler.UpsertTriggerSql(func="NEW.plan_path = COALESCE((SELECT plan_path || '/' FROM tests_representation_testplan WHERE id = NEW.parent_id), '') || NEW.title; RETURN NEW;", hash='5abc32433daa1ae6ed890aab962b7309e6a0bf97', operation='INSERT', pgid='pgtrigger_plan_title_path_insert_trg_df70f', table='tests_representation_testplan', when='BEFORE')),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='testplan',
+            trigger=pgtrigger.compiler.Trigger(name='plan_title_path_change_trg', sql=pgtrigger.compiler.UpsertTriggerSql(condition='WHEN (OLD."parent_id" IS DISTINCT FROM (NEW."parent_id") OR OLD."title" IS DISTINCT FROM (NEW."title") OR OLD."plan_path" IS DISTINCT FROM (NEW."plan_path"))', func="IF pg_trigger_depth() > 1 AND OLD.parent_id IS NOT DISTINCT FROM NEW.parent_id AND OLD.title IS NOT DISTINCT FROM NEW.title THEN     RETURN NEW; END IF; NEW.plan_path = COALESCE((SELECT plan_path || '/' FROM tests_representation_testplan WHERE id = NEW.parent_id), '') || NEW.title; RETURN NEW;", hash='ee73b7ac648bd68422630c719490ab05329215ac', operation='UPDATE', pgid='pgtrigger_plan_title_path_change_trg_d3137', table='tests_representation_testplan', when='BEFORE')),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='testplan',
+            trigger=pgtrigger.compiler.Trigger(name='plan_title_path_descendants_trg', sql=pgtrigger.compiler.UpsertTriggerSql(condition='WHEN (OLD."parent_id" IS DISTINCT FROM (NEW."parent_id") OR OLD."title" IS DISTINCT FROM (NEW."title"))', func='UPDATE tests_representation_testplan SET plan_path = NEW.plan_path || substr(plan_path, char_length(OLD.plan_path) + 1) WHERE (path <@ OLD.path OR path <@ NEW.path) AND id != NEW.id; RETURN NEW;', hash='b871d2f99e0b0524be59b7f5113f0b3419cf0984', operation='UPDATE', pgid='pgtrigger_plan_title_path_descendants_trg_35493', table='tests_representation_testplan', when='AFTER')),
+        ),
+    ]
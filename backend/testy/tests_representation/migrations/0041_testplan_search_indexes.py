@@ -0,0 +1,31 @@
+# Generated by Django 4.2.13 on 2026-10-18 07:58
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+from django.db import migrations, models
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('testy', '0003_trigram_extension'),
+        ('tests_representation', '0040_testplan_plan_path'),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='testplan',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('title', output_field=models.TextField())), name='gin_trgm_ops'), name='plan_title_trgm_idx'),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='testplan',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('id', output_field=models.TextField())), name='gin_trgm_ops'), name='plan_id_trgm_idx'),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='testplan',
+            index=django.contrib.postgres.indexes.GinIndex(models.F('parameter_ids'), name='plan_parameter_ids_idx'),
+        ),
+    ]
@@ -28,19 +28,22 @@
 # if any, to sign a "copyright disclaimer" for the program, if necessary.
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
-from typing import Any, Iterable
+from typing import Any
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericRelation
-from django.contrib.postgres.indexes import BTreeIndex
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import BTreeIndex, GinIndex
 from django.core.validators import MinValueValidator
-from django.db import models, transaction
+from django.db import models
+from django.db.models.functions import Coalesce
 from simple_history.models import HistoricalRecords
 
 from testy.comments.models import Comment
 from testy.core.constraints import unique_soft_delete_constraint
 from testy.core.models import Attachment, Project
+from testy.indexes import get_search_indexes
 from testy.root.ltree.indexes import get_indexes
 from testy.root.ltree.managers import LtreeManager
 from testy.root.ltree.triggers import get_triggers
@@ -48,11 +51,24 @@ from testy.root.mixins import TestyArchiveMixin
 from testy.root.models import BaseModel, LtreeBaseModel
 from testy.tests_description.models import TestCase, TestCaseStep
 from testy.tests_representation.choices import ResultStatusType
-from testy.triggers import get_statistic_triggers
+from testy.triggers import (
+    get_last_status_triggers,
+    get_parameter_data_triggers,
+    get_plan_parameters_triggers,
+    get_plan_statistic_cleanup_triggers,
+    get_plan_statistic_triggers,
+    get_plan_title_triggers,
+    get_result_statistic_move_triggers,
+    get_result_statistic_triggers,
+    get_statistic_triggers,
+)
 from testy.users.models import User
 
 UserModel = get_user_model()
 
+_NO_REVERSE = '+'
+_PLAN = 'plan'
+
 
 class Parameter(BaseModel):
     project = models.ForeignKey(Project, on_delete=models.CASCADE)
@@ -62,6 +78,7 @@ class Parameter(BaseModel):
     class Meta:
         default_related_name = 'parameters'
         constraints = [unique_soft_delete_constraint(['group_name', 'data', 'project'], 'parameter')]
+        triggers = get_parameter_data_triggers()
 
     def __str__(self):
         return f'{self.group_name}: {self.data}'
@@ -77,7 +94,12 @@ class TestPlan(LtreeBaseModel, TestyArchiveMixin):
         blank=True,
         related_name='child_test_plans',
     )
-    parameters = models.ManyToManyField(Parameter, blank=True, related_name='test_plans')
+    parameters = models.ManyToManyField(
+        Parameter,
+        blank=True,
+        related_name='test_plans',
+        through='TestPlanParameter',
+    )
     started_at = models.DateTimeField()
     due_date = models.DateTimeField()
     finished_at = models.DateTimeField(null=True, blank=True)
@@ -86,12 +108,36 @@ class TestPlan(LtreeBaseModel, TestyArchiveMixin):
     comments = GenericRelation(Comment)
     attributes = models.JSONField(default=dict, blank=True)
     attachments = GenericRelation(Attachment)
+    # Denormalized from parameters by triggers
+    title = models.TextField(default='', editable=False)
+    parameter_ids = ArrayField(models.BigIntegerField(), default=list, blank=True, editable=False)
+    # Titles of ancestors joined by slash, maintained by triggers
+    plan_path = models.TextField(default='', editable=False)
     objects: LtreeManager
 
     class Meta:
         default_related_name = 'test_plans'
-        triggers = get_triggers('plan') + get_statistic_triggers('plans_count')
-        indexes = get_indexes('plan')
+        triggers = (
+            get_triggers(_PLAN, 'title')
+            + get_statistic_triggers('plans_count')
+            + get_plan_statistic_cleanup_triggers()
+            + get_plan_title_triggers()
+        )
+        indexes = [
+            *get_indexes(_PLAN),
+            *get_search_indexes(_PLAN, 'title', 'id'),
+            GinIndex('parameter_ids', name='plan_parameter_ids_idx'),
+        ]
+
+
+class TestPlanParameter(models.Model):
+    testplan = models.ForeignKey(TestPlan, on_delete=models.CASCADE, related_name=_NO_REVERSE)
+    parameter = models.ForeignKey(Parameter, on_delete=models.CASCADE, related_name=_NO_REVERSE)
+
+    class Meta:
+        db_table = 'tests_representation_testplan_parameters'
+        unique_together = ('testplan', 'parameter')
+        triggers = get_plan_parameters_triggers()
 
 
 class ResultStatus(BaseModel):
@@ -118,7 +164,61 @@ class Test(BaseModel):
 
     class Meta:
         default_related_name = 'tests'
-        triggers = get_statistic_triggers('tests_count')
+        triggers = [
+            *get_statistic_triggers('tests_count'),
+            *get_plan_statistic_triggers(),
+            *get_result_statistic_move_triggers(),
+        ]
+
+
+class TestPlanStatistics(models.Model):
+    project = models.ForeignKey(Project, on_delete=models.DO_NOTHING, db_constraint=False, related_name=_NO_REVERSE)
+    plan = models.ForeignKey(TestPlan, on_delete=models.DO_NOTHING, db_constraint=False, related_name=_NO_REVERSE)
+    status = models.ForeignKey(
+        ResultStatus,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        related_name=_NO_REVERSE,
+    )
+    is_archive = models.BooleanField(default=False)
+    tests_count = models.IntegerField(default=0)
+    # Sum of case estimates in seconds
+    estimates_sum = models.BigIntegerField(default=0)
+    empty_estimates_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                models.F('plan'),
+                Coalesce(models.F('status'), models.Value(0)),
+                models.F('is_archive'),
+                name='plan_statistics_unique_constraint',
+            ),
+        ]
+
+
+class TestResultDailyStatistics(models.Model):
+    project = models.ForeignKey(Project, on_delete=models.DO_NOTHING, db_constraint=False, related_name=_NO_REVERSE)
+    plan = models.ForeignKey(TestPlan, on_delete=models.DO_NOTHING, db_constraint=False, related_name=_NO_REVERSE)
+    status = models.ForeignKey(
+        ResultStatus,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        related_name=_NO_REVERSE,
+    )
+    is_archive = models.BooleanField(default=False)
+    # Day of result creation in UTC
+    day = models.DateField()
+    # Append-only delta, rows of same bucket are merged by compaction
+    results_count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            BTreeIndex('project_id', 'day', name='result_statistics_project_idx'),
+            BTreeIndex('plan_id', 'day', name='result_statistics_plan_idx'),
+        ]
 
 
 class TestResult(BaseModel):
@@ -154,6 +254,7 @@ class TestResult(BaseModel):
                 name='results_histogram_idx',
             ),
         ]
+        triggers = get_result_statistic_triggers() + get_last_status_triggers()
 
     def model_clone(
         self,
@@ -173,24 +274,6 @@ class TestResult(BaseModel):
             common_attrs_to_change,
         )
 
-    @transaction.atomic
-    def save(
-        self,
-        force_insert: bool = False,
-        force_update: bool = False,
-        using: str | None = None,
-        update_fields: Iterable[str] | None = None,
-    ) -> None:
-        is_inserted = self.pk is None
-        super().save(force_insert, force_update, using, update_fields)
-        latest_result_pk = None
-        if latest_result := self.test.results.order_by('-created_at').first():
-            latest_result_pk = latest_result.pk
-        last_result_updated = update_fields and 'status' in update_fields and self.pk == latest_result_pk
-        if is_inserted or last_result_updated:
-            self.test.last_status = self.status
-            self.test.save()
-
 
 class TestStepResult(BaseModel):
     project = models.ForeignKey(Project, on_delete=models.CASCADE)
@@ -36,6 +36,7 @@ from rest_framework.request import Request
 
 from testy.core.models import Project
 from testy.core.permissions import MISSING_PROJECT_CODE, BaseProjectPermission, getter_to_method
+from testy.core.selectors.projects import ProjectSelector
 from testy.tests_representation.choices import ResultStatusType
 from testy.tests_representation.selectors.testplan import TestPlanSelector
 from testy.users.selectors.roles import RoleSelector
@@ -46,6 +47,24 @@ class ProjectAssignable(Protocol):
 
 
 class TestResultPermission(BaseProjectPermission):
+    def has_permission(self, request, view):
+        if view.action != 'ingest':
+            return super().has_permission(request, view)
+        project_pk = request.query_params.get('project')
+        if not project_pk:
+            raise ValidationError('Could not get project id from request', code=MISSING_PROJECT_CODE)
+        project = ProjectSelector.project_by_id(project_pk)
+        if project.is_archive:
+            return False
+        if request.user.is_superuser:
+            return True
+        if not project.is_private and not RoleSelector.restricted_project_access(request.user):
+            return True
+        return RoleSelector.create_action_allowed(
+            user=request.user,
+            project=project,
+            model_name=view.queryset.model._meta.model_name,
+        )
 
     @classmethod
     def _get_project_from_request(
@@ -68,7 +87,7 @@ class TestPlanPermission(BaseProjectPermission):
     def has_permission(self, request, view):  # noqa: WPS212
         if any([request.method in self.safe_non_read_methods, request.user.is_superuser, view.detail]):
             return True
-        if view.action == 'copy_plans':
+        if view.action in {'copy_plans', 'copy_plans_async'}:
             return self._validate_plans_copy_permissions(request, view)
         project = self._get_project_from_request(request)
         if not project.is_private and not RoleSelector.restricted_project_access(request.user):
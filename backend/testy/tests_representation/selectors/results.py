@@ -48,7 +48,7 @@ class TestResultSelector:
         ).order_by(
             _CREATED_AT_DESC,
         ).prefetch_related(
-            'user', 'steps_results', 'attachments', _RESULT_STATUS,
+            'user', 'steps_results__status', 'attachments', _RESULT_STATUS,
         ).annotate(
             latest_result_id=self.get_latest_result_by_test_subquery(),
         )
@@ -31,12 +31,13 @@
 
 import logging
 import warnings
-from typing import TYPE_CHECKING, Any, Iterable, Mapping, TypeVar
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping, TypeVar
 
-from django.contrib.postgres.aggregates import ArrayAgg, StringAgg
 from django.db.models import (
     Case,
     CharField,
+    Count,
     DateTimeField,
     Exists,
     F,
@@ -45,29 +46,22 @@ from django.db.models import (
     Q,
     QuerySet,
     Subquery,
-    TextField,
     Value,
     When,
 )
-from django.db.models.functions import Concat
 from django.shortcuts import get_object_or_404
 from mptt.querysets import TreeQuerySet
 
+from testy.root.ltree.functions import Subpath
 from testy.root.querysets import SoftDeleteTreeQuerySet
 from testy.tests_description.selectors.suites import TestSuiteSelector
-from testy.tests_representation.models import Parameter, Test, TestPlan
-from testy.tests_representation.selectors.results import TestResultSelector
+from testy.tests_representation.models import Parameter, Test, TestPlan, TestResult
 from testy.tests_representation.selectors.tests import TestSelector
 from testy.tests_representation.services.statistics import HistogramProcessor, LabelProcessor, PieChartProcessor
 from testy.utilities.request import PeriodDateTime
-from testy.utilities.sql import ConcatSubquery, SubCount, get_max_level
+from testy.utilities.sql import UnionPosition, filter_after_position, get_max_level
 from testy.utilities.string import parse_bool_from_str
-from testy.utilities.tree import (
-    build_tree,
-    form_tree_prefetch_lookups,
-    form_tree_prefetch_objects,
-    get_breadcrumbs_treeview,
-)
+from testy.utilities.tree import build_breadcrumbs, form_tree_prefetch_objects, stream_tree
 
 if TYPE_CHECKING:
     from django.db.models.query import ValuesQuerySet
@@ -89,6 +83,9 @@ _PLAN = 'plan'
 _OUTER_REF_PK = OuterRef('pk')
 _MT = TypeVar('_MT', bound=Model)
 _IS_LEAF = 'is_leaf'
+_PATH = 'path'
+_TITLE = 'title'
+_PROGRESS_FIELDS = ('tests_total', 'tests_progress_period', 'tests_progress_total')
 
 
 class TestPlanSelector:  # noqa: WPS214
@@ -97,32 +94,6 @@ class TestPlanSelector:  # noqa: WPS214
     def testplan_list_raw(cls) -> QuerySet[TestPlan]:
         return TestPlan.objects.all()
 
-    @classmethod
-    def annotate_title(cls, qs: QuerySet[TestPlan]) -> QuerySet[TestPlan]:
-        return qs.annotate(
-            parameter_ids=ArrayAgg('parameters__id'),
-            parameter_str=StringAgg(
-                'parameters__data',
-                delimiter=', ',
-                output_field=TextField(),
-                ordering='parameters__data',
-            ),
-            title=Case(
-                When(
-                    parameter_str__isnull=False,
-                    then=Concat(
-                        F(_NAME),
-                        Value(' '),
-                        Value('['),
-                        F('parameter_str'),
-                        Value(']'),
-                    ),
-                ),
-                default=F(_NAME),
-                output_field=TextField(),
-            ),
-        )
-
     @classmethod
     def plan_list_by_tree_id(cls, tree_ids: Iterable[int]) -> QuerySet[TestPlan]:
         return TestPlan.objects.filter(tree_id__in=tree_ids)
@@ -131,22 +102,17 @@ class TestPlanSelector:  # noqa: WPS214
     def list_qs(cls, qs: QuerySet[TestPlan], search: str | None = None) -> QuerySet[TestPlan]:
         if not search:
             qs = cls.annotate_has_children_with_tests(qs)
-        return cls.annotate_title(qs).select_related('parent')
+        return qs.select_related('parent')
 
     @classmethod
     def testplan_list_titled(cls) -> QuerySet[TestPlan]:
-        return (
-            cls
-            .annotate_title(cls.testplan_list_raw())
-            .prefetch_related(_PARAMETERS, 'attachments')
-            .order_by(_NAME)
-        )
+        return cls.testplan_list_raw().prefetch_related(_PARAMETERS, 'attachments').order_by(_NAME)
 
     @classmethod
     def testplan_list(cls) -> QuerySet[TestPlan]:
         plan_subq = TestPlan.objects.filter(parent=_OUTER_REF_PK)
         qs = TestPlan.objects.all().prefetch_related(_PARAMETERS, 'attachments').select_related(_PARENT)
-        return cls.annotate_title(qs).annotate(
+        return qs.annotate(
             has_children=Exists(plan_subq),
         ).order_by(_NAME)
 
@@ -179,17 +145,8 @@ class TestPlanSelector:  # noqa: WPS214
 
     @classmethod
     def testplan_deleted_list(cls):
-        max_level = get_max_level(TestPlan)
-        return TestPlan.deleted_objects.all().prefetch_related(
-            *form_tree_prefetch_objects(
-                nested_prefetch_field=_CHILD_TEST_PLANS,
-                prefetch_field=_CHILD_TEST_PLANS,
-                tree_depth=max_level,
-                queryset_class=TestPlan,
-                manager_name='deleted_objects',
-            ),
-            *form_tree_prefetch_lookups(_CHILD_TEST_PLANS, _PARAMETERS, max_level),
-        )
+        deleted_plans = TestPlan.deleted_objects.prefetch_related(_PARAMETERS)
+        return deleted_plans.prefetch_tree(deleted_plans)
 
     @classmethod
     def testplan_project_root_list(cls, project_id: int) -> SoftDeleteTreeQuerySet[TestPlan]:
@@ -200,23 +157,13 @@ class TestPlanSelector:  # noqa: WPS214
         return get_object_or_404(TestPlan, pk=pk)
 
     @classmethod
-    def testplan_breadcrumbs_by_ids(cls, ids: list[int]) -> dict[str, dict[str, Any]]:
-        plans = TestPlan.objects.filter(pk__in=ids).prefetch_related(_PARAMETERS)
-        ancestors = plans.get_ancestors(include_self=False).prefetch_related(_PARAMETERS)
-        ids_to_breadcrumbs = {}
-        for plan in plans:
-            tree = [ancestor for ancestor in ancestors if ancestor.is_ancestor_of(plan)]
-            tree.append(plan)
-            ids_to_breadcrumbs[plan.id] = get_breadcrumbs_treeview(
-                instances=tree,
-                depth=len(tree) - 1,
-                title_method=cls._get_testplan_title,
-            )
-        return ids_to_breadcrumbs
+    def testplan_breadcrumbs_by_ids(cls, ids: Iterable[int]) -> dict[int, dict[str, Any]]:
+        ancestors = TestPlan.objects.filter(pk__in=ids).get_ancestors(include_self=True)
+        return build_breadcrumbs(ancestors.values(_ID, _TITLE, 'parent_id'))
 
     @classmethod
     def testplan_list_ancestors(cls, instance: TestPlan) -> TreeQuerySet[TestPlan]:
-        return instance.get_ancestors(include_self=True).prefetch_related(_PARAMETERS)
+        return instance.get_ancestors(include_self=True)
 
     @classmethod
     def get_testplan_descendants_ids_by_testplan(cls, test_plan: TestPlan, include_self: bool = True):
@@ -247,27 +194,55 @@ class TestPlanSelector:  # noqa: WPS214
         )
 
     def get_plan_progress(self, plan_id: int, period: PeriodDateTime):
-        last_status_period = TestResultSelector.get_last_status_subquery(
-            filters=[Q(created_at__gte=period.start) & Q(created_at__lte=period.end)],
-        )
-        last_status_total = TestResultSelector.get_last_status_subquery()
-        descendants_include_self_lookup = Q(
-            plan__path__descendant=OuterRef('path'),
+        plans = TestPlan.objects.filter(parent=plan_id, is_archive=False)
+        if not plans:
+            return plans
+        child_level = plans[0].path.count('.') + 1
+        child_path = Subpath(F('plan__path'), 0, child_level)
+        tests = Test.objects.filter(
+            plan__tree_id=plans[0].tree_id,
+            plan__path__descendant_any=plans.values(_PATH),
             plan__is_archive=False,
         )
-        tests_total_query = Test.objects.filter(descendants_include_self_lookup).values(_PK)
-        tests_progress_period = self._get_tests_subquery(last_status_period, descendants_include_self_lookup)
-        tests_progress_total = self._get_tests_subquery(last_status_total, descendants_include_self_lookup)
-        return (
-            TestPlan.objects
-            .filter(parent=plan_id, is_archive=False)
-            .prefetch_related(_PARAMETERS)
-            .annotate(
-                tests_total=SubCount(tests_total_query),
-                tests_progress_period=SubCount(tests_progress_period),
-                tests_progress_total=SubCount(tests_progress_total),
+        # plan progress never limited progress by period, so progress for period is equal to total progress
+        progress = self.tests_progress(tests, child_path, period=None)
+        for plan in plans:
+            for field_name, tests_count in progress[plan.path].items():
+                setattr(plan, field_name, tests_count)
+        return plans
+
+    @classmethod
+    def tests_progress(cls, tests: QuerySet[Test], group_by: F | Subpath, period: PeriodDateTime | None):
+        """
+        Count total and finished tests for every group with single grouped query.
+
+        Args:
+            tests: tests to count.
+            group_by: expression to group tests by.
+            period: period tests with results created within are counted as progress for period,
+                if None progress for period is equal to total progress.
+
+        Returns:
+            Mapping of group value to tests_total, tests_progress_period and tests_progress_total counts,
+            missing groups are mapped to zero counts.
+        """
+        has_status = Q(last_status__isnull=False)
+        has_status_in_period = has_status
+        if period is not None:
+            period_results = QuerySet(TestResult).filter(
+                test_id=_OUTER_REF_PK,
+                created_at__range=(period.start, period.end),
             )
-        )
+            has_status_in_period = has_status & Exists(period_results)
+        tests_counts = tests.annotate(progress_group=group_by).values('progress_group').annotate(
+            tests_total=Count(_PK),
+            tests_progress_period=Count(_PK, filter=has_status_in_period),
+            tests_progress_total=Count(_PK, filter=has_status),
+        ).order_by()
+        progress = defaultdict(lambda: dict.fromkeys(_PROGRESS_FIELDS, 0))
+        for group_counts in tests_counts:
+            progress[group_counts.pop('progress_group')] = group_counts
+        return progress
 
     def testplan_histogram(
         self,
@@ -298,6 +273,7 @@ class TestPlanSelector:  # noqa: WPS214
         tests: QuerySet[Test],
         parent_id: int | None,
         plans: QuerySet[TestPlan],
+        position: UnionPosition | None = None,
     ) -> 'ValuesQuerySet[TestPlan, dict[str, Any]]':
         fields = (
             _ID,
@@ -316,7 +292,8 @@ class TestPlanSelector:  # noqa: WPS214
                 union_suite_path=Value(None, output_field=CharField()),
                 union_assignee_username=Value(None, output_field=CharField()),
             ).values(*fields)
-            return plans_values.order_by(_IS_LEAF, _NAME)
+            plans_values = filter_after_position(plans_values, position, is_leaf=False)
+            return plans_values.order_by(_IS_LEAF, _NAME, _ID)
 
         tests = tests.filter(plan=parent_id)
 
@@ -335,14 +312,16 @@ class TestPlanSelector:  # noqa: WPS214
             union_suite_path=Value(None, output_field=CharField()),
             union_assignee_username=Value(None, output_field=CharField()),
         ).values(*fields)
+        tests_for_display = filter_after_position(tests_for_display, position, is_leaf=True)
+        plans_values = filter_after_position(plans_values, position, is_leaf=False)
         plans_values = plans_values.union(tests_for_display)
-        return plans_values.order_by(_IS_LEAF, _NAME)
+        return plans_values.order_by(_IS_LEAF, _NAME, _ID)
 
     def plan_annotated_by_ids(self, ids: Iterable[int]) -> QuerySet[TestPlan]:
         child_subq = Subquery(TestPlan.objects.filter(parent_id=_OUTER_REF_PK))
         tests_subq = Subquery(Test.objects.filter(plan_id=_OUTER_REF_PK))
         qs = TestPlan.objects.filter(pk__in=ids).prefetch_related(_PARAMETERS).select_related(_PARENT)
-        return self.annotate_title(qs).annotate(
+        return qs.annotate(
             has_children=Case(
                 When(Exists(child_subq), then=_DB_TRUE),
                 When(Exists(tests_subq), then=_DB_TRUE),
@@ -374,7 +353,7 @@ class TestPlanSelector:  # noqa: WPS214
         tests = TestSelector().test_list_with_last_status(
             filter_condition={'pk__in': test_ids},
         ).annotate(is_leaf=Value(True))
-        tests = TestSuiteSelector.annotate_suite_path(tests, 'case__suite__path')
+        tests = TestSuiteSelector.annotate_suite_path(tests, 'case__suite')
         tests = {test.pk: test for test in tests}
 
         result_data = []
@@ -391,44 +370,30 @@ class TestPlanSelector:  # noqa: WPS214
         return TestPlan.objects.filter(**{f'{field_name}__in': ids})
 
     @classmethod
-    def annotate_plan_path(cls, qs: QuerySet[_MT], outer_ref_key: str = 'path') -> QuerySet[_MT]:
-        ancestor_paths = TestPlan.objects.filter(
-            Q(path__ancestor=OuterRef(outer_ref_key)),
-        ).order_by('path')
-        ancestor_paths = cls.annotate_title(ancestor_paths).values('title')
-        return qs.annotate(plan_path=ConcatSubquery(ancestor_paths, separator='/')).order_by('case__name')
+    def annotate_plan_path(cls, qs: QuerySet[_MT], plan_lookup: str) -> QuerySet[_MT]:
+        return qs.annotate(plan_path=F(f'{plan_lookup}__plan_path')).order_by('case__name')
 
     @classmethod
     def plans_breadcrumbs_by_root(
         cls,
         plans: QuerySet[TestPlan],
         parent_id: int | None = None,
-    ) -> list[dict[str, Any]]:
+    ) -> Iterator[bytes]:
         if parent_id is None:
             plans = cls.plan_list_by_tree_id(plans.values_list('tree_id', flat=True))
         else:
             plans = plans.get_descendants(include_self=True)
-        qs = cls.annotate_title(plans)
-        qs = cls.annotate_has_children_with_tests(qs, Subquery(qs.filter(parent_id=_OUTER_REF_PK)))
-        return build_tree(
-            qs.values('id', 'title', 'has_children', 'parent'),
-            title_key='title',
+        qs = cls.annotate_has_children_with_tests(plans, Subquery(plans.filter(parent_id=_OUTER_REF_PK)))
+        return stream_tree(
+            qs.values('id', _TITLE, 'has_children', 'parent').order_by(_PATH).iterator(),
+            title_key=_TITLE,
             omitted_ids={parent_id} if parent_id else None,
         )
 
     def plans_breadcrumbs(self, plans: QuerySet[TestPlan]) -> QuerySet[TestPlan]:
-        max_level = get_max_level(TestPlan)
-        annotate_qs = self.annotate_has_children(self.annotate_title(self.testplan_list_raw()))
-        qs = self.annotate_title(plans)
-        qs = self.annotate_has_children_with_tests(qs)
-        return qs.prefetch_related(
-            *form_tree_prefetch_objects(
-                'child_test_plans',
-                'child_test_plans',
-                tree_depth=max_level,
-                queryset=annotate_qs,
-            ),
-        ).order_by('name')
+        annotate_qs = self.annotate_has_children(self.testplan_list_raw())
+        qs = self.annotate_has_children_with_tests(plans)
+        return qs.prefetch_tree(annotate_qs).order_by('name')
 
     def testplan_list_v1(self, is_archive: bool = False) -> QuerySet[TestPlan]:
         warnings.warn('Function is deprecated', DeprecationWarning, stacklevel=2)
@@ -454,7 +419,6 @@ class TestPlanSelector:  # noqa: WPS214
 
     def testplan_treeview_list(self, qs: QuerySet[TestPlan], parent_id: int | None = None) -> QuerySet[TestPlan]:
         warnings.warn('Treeviews are deprecated', DeprecationWarning, stacklevel=2)
-        qs = self.annotate_title(qs)
         max_level = get_max_level(TestPlan)
         testplan_prefetch_objects = form_tree_prefetch_objects(
             nested_prefetch_field=_CHILD_TEST_PLANS,
@@ -470,20 +434,6 @@ class TestPlanSelector:  # noqa: WPS214
                 queryset_class=Parameter,
             ),
         )
-        qs = TestPlan.objects.filter(parent=parent_id).order_by('-created_at').prefetch_related(
+        return TestPlan.objects.filter(parent=parent_id).order_by('-created_at').prefetch_related(
             *testplan_prefetch_objects,
         )
-        return self.annotate_title(qs)
-
-    @classmethod
-    def _get_tests_subquery(cls, last_status_subquery, descendants_lookup):
-        return Test.objects.filter(
-            descendants_lookup,
-            last_status__isnull=False,
-        ).values(_PK)
-
-    @classmethod
-    def _get_testplan_title(cls, instance: TestPlan):
-        if parameters := instance.parameters.all():
-            return '{0} [{1}]'.format(instance.name, ', '.join([parameter.data for parameter in parameters]))
-        return instance.name
@@ -32,6 +32,7 @@ from typing import TYPE_CHECKING, Any, Iterable
 
 from django.db.models import F, Q, QuerySet
 
+from testy.core.models import Project
 from testy.root.ltree.querysets import LtreeQuerySet
 from testy.tests_representation.models import Test, TestPlan
 
@@ -68,7 +69,7 @@ class TestSelector:
             lookup |= Q(plan=parent_id)
         if not has_common_filters:
             tests = tests.filter(lookup)
-        tests = suite_selector.annotate_suite_path(tests, 'case__suite__path')
+        tests = suite_selector.annotate_suite_path(tests, 'case__suite')
         return tests.annotate(assignee_username=F('assignee__username'))
 
     def test_list_with_last_status(
@@ -108,3 +109,7 @@ class TestSelector:
     @classmethod
     def test_list_by_ids(cls, ids: Iterable[int]) -> QuerySet[Test]:
         return Test.objects.filter(pk__in=ids)
+
+    @classmethod
+    def suite_ids_by_tests(cls, project: Project, test_ids: Iterable[int]) -> QuerySet[tuple[int, int]]:
+        return Test.objects.filter(project=project, pk__in=test_ids).values_list('pk', 'case__suite_id')
@@ -29,17 +29,89 @@
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
 
+from itertools import islice
 from typing import Any, Iterable
 
-from django.db import transaction
-from simple_history.utils import bulk_create_with_history, bulk_update_with_history
+import orjson
+from django.db import connection, transaction
+from simple_history.utils import bulk_create_with_history
 
+from testy.core.models import Project
 from testy.core.services.attachments import AttachmentService
 from testy.tests_description.selectors.cases import TestCaseSelector
-from testy.tests_representation.models import Test, TestResult, TestStepResult
+from testy.tests_representation.models import ResultStatus, TestResult, TestStepResult
+from testy.tests_representation.selectors.status import ResultStatusSelector
+from testy.tests_representation.selectors.tests import TestSelector
 from testy.tests_representation.signals import pre_create_result
 from testy.users.models import User
 
+_IngestRecord = tuple[int, dict[str, Any]]
+_IngestRecords = Iterable[_IngestRecord]
+_IngestBatch = list[_IngestRecord]
+_IngestReport = tuple[int, list[dict[str, Any]]]
+
+_INGEST_BATCH_SIZE = 1000
+
+_CREATE_INGEST_STAGING = """
+CREATE TEMPORARY TABLE IF NOT EXISTS results_ingest_staging (
+    line integer NOT NULL,
+    test_id bigint NOT NULL,
+    status_id bigint NOT NULL,
+    comment text NOT NULL,
+    execution_time integer,
+    attributes jsonb NOT NULL
+) ON COMMIT DROP
+"""
+
+_TRUNCATE_INGEST_STAGING = 'TRUNCATE results_ingest_staging'
+
+_COPY_INGEST_STAGING = """
+COPY results_ingest_staging (line, test_id, status_id, comment, execution_time, attributes) FROM STDIN
+"""
+
+_DISCARD_INGEST_STAGING = """
+DELETE FROM results_ingest_staging s
+WHERE s.line = ANY(%(lines)s) AND NOT EXISTS (
+    SELECT 1 FROM tests_representation_test t
+    WHERE t.id = s.test_id AND t.project_id = %(project_id)s AND NOT t.is_deleted AND NOT t.is_archive
+)
+RETURNING s.line
+"""
+
+_MERGE_INGEST_STAGING = """
+WITH case_versions AS (
+    SELECT DISTINCT ON (h.id) h.id AS case_id, h.history_id
+    FROM tests_description_historicaltestcase h
+    WHERE h.id IN (
+        SELECT t.case_id FROM tests_representation_test t
+        WHERE t.id IN (SELECT test_id FROM results_ingest_staging)
+    )
+    ORDER BY h.id, h.history_date DESC, h.history_id DESC
+), results AS (
+    INSERT INTO tests_representation_testresult (
+        project_id, status_id, test_id, user_id, comment, is_archive, test_case_version, execution_time,
+        attributes, created_at, updated_at, is_deleted
+    )
+    SELECT %(project_id)s, s.status_id, s.test_id, %(user_id)s, s.comment, false, v.history_id, s.execution_time,
+           s.attributes, now(), now(), false
+    FROM results_ingest_staging s
+    JOIN tests_representation_test t ON t.id = s.test_id
+    LEFT JOIN case_versions v ON v.case_id = t.case_id
+    ORDER BY s.line
+    RETURNING *
+), results_history AS (
+    INSERT INTO tests_representation_historicaltestresult (
+        id, created_at, updated_at, comment, is_archive, test_case_version, execution_time, attributes,
+        history_date, history_type, history_user_id, project_id, test_id, user_id, deleted_at, is_deleted, status_id
+    )
+    SELECT r.id, r.created_at, r.updated_at, r.comment, r.is_archive, r.test_case_version, r.execution_time,
+           r.attributes, now(), '+', %(user_id)s, r.project_id, r.test_id, r.user_id, r.deleted_at, r.is_deleted,
+           r.status_id
+    FROM results r
+)
+SELECT COUNT(*) FROM results
+"""
+
 
 class TestResultService:
     non_side_effect_fields = [
@@ -102,18 +174,74 @@ class TestResultService:
     @classmethod
     @transaction.atomic
     def result_bulk_create(cls, results: Iterable[TestResult], user: User, batch_size: int = 500) -> list[TestResult]:
-        results = bulk_create_with_history(results, TestResult, batch_size=batch_size, default_user=user)
-        id_to_status = {result.test_id: result.status for result in results}
-        tests = Test.objects.filter(id__in=id_to_status.keys())
-        tests_to_update = []
-        for test in tests:
-            test.last_status = id_to_status[test.id]
-            tests_to_update.append(test)
-        bulk_update_with_history(
-            tests_to_update,
-            Test,
-            batch_size=batch_size,
-            default_user=user,
-            fields=['last_status'],
-        )
-        return results
+        return bulk_create_with_history(results, TestResult, batch_size=batch_size, default_user=user)
+
+    @classmethod
+    @transaction.atomic
+    def result_bulk_ingest(
+        cls,
+        project: Project,
+        records: _IngestRecords,
+        user: User,
+    ) -> _IngestReport:
+        """
+        Create results from stream of validated records with COPY and single merge statement.
+
+        Records are read and copied into temporary staging table in batches, so record validation may query
+        database between batches. Records pointing to tests outside of project, deleted or archived tests are
+        discarded and reported after each batch, pre create signal is sent for the rest of the batch.
+        Remaining records are merged into results and results history at once.
+
+        Args:
+            project: project results are ingested to.
+            records: iterable of (line number, validated record) pairs.
+            user: user results are created by.
+
+        Returns:
+            number of created results and list of per-record errors.
+        """
+        statuses = ResultStatusSelector.status_list(project=project).in_bulk()
+        params = {'project_id': project.pk, 'user_id': user.pk}
+        errors = []
+        records = iter(records)
+        with connection.cursor() as cursor:
+            # staging table lives until commit, so it is reused by ingests within one transaction
+            cursor.execute(_CREATE_INGEST_STAGING)
+            cursor.execute(_TRUNCATE_INGEST_STAGING)
+            while batch := list(islice(records, _INGEST_BATCH_SIZE)):
+                cls._copy_ingest_batch(cursor, batch)
+                cursor.execute(_DISCARD_INGEST_STAGING, {**params, 'lines': [line for line, _ in batch]})
+                discarded_lines = {row[0] for row in cursor.fetchall()}
+                errors.extend(
+                    {'line': line, 'errors': {'test': ['Test does not exist, archived or belongs to other project']}}
+                    for line in sorted(discarded_lines)
+                )
+                cls._send_pre_create_signals(
+                    [record for line, record in batch if line not in discarded_lines],
+                    statuses,
+                )
+            cursor.execute(_MERGE_INGEST_STAGING, params)
+            created_count = cursor.fetchone()[0]
+        return created_count, errors
+
+    @classmethod
+    def _copy_ingest_batch(cls, cursor, batch: _IngestBatch) -> None:
+        with cursor.copy(_COPY_INGEST_STAGING) as copy:
+            for line_number, record in batch:
+                copy.write_row([
+                    line_number,
+                    record['test'],
+                    record['status'],
+                    record['comment'],
+                    record['execution_time'],
+                    orjson.dumps(record['attributes']).decode(),
+                ])
+
+    @classmethod
+    def _send_pre_create_signals(cls, records: list[dict[str, Any]], statuses: dict[int, ResultStatus]) -> None:
+        tests = TestSelector.test_list_by_ids({record['test'] for record in records}).in_bulk()
+        for record in records:
+            pre_create_result.send(
+                sender=cls.result_bulk_ingest,
+                data={**record, 'test': tests[record['test']], 'status': statuses[record['status']]},
+            )
@@ -32,17 +32,17 @@ import operator
 from datetime import datetime
 from functools import reduce
 from itertools import groupby
-from typing import Any
+from typing import Any, Iterable
 
-from django.db.models import Case, Count, DateTimeField, F, FloatField, Q, QuerySet, Sum, Value, When
+from django.db import connection, transaction
+from django.db.models import BigIntegerField, Case, Count, DateTimeField, F, FloatField, Q, QuerySet, Sum, Value, When
 from django.db.models.functions import Cast, Coalesce
 from django.utils import timezone
-
 from testy.core.models import Project
 from testy.tests_description.models import TestCase
 from testy.tests_representation.choices import UNTESTED_STATUS
 from testy.tests_representation.exceptions import DateRangeIsAbsent
-from testy.tests_representation.models import Test, TestPlan, TestResult
+from testy.tests_representation.models import Test, TestPlan, TestPlanStatistics, TestResult, TestResultDailyStatistics
 from testy.tests_representation.selectors.status import ResultStatusSelector
 from testy.utilities.sql import DateTrunc
 from testy.utilities.time import Period
@@ -61,6 +61,9 @@ _NAME = 'name'
 _VALUE = 'value'
 _LABEL = 'label'
 
+_StatisticsMap = dict[tuple[Any, ...], dict[str, Any]]
+_StatusList = Iterable[dict[str, Any]]
+
 
 class LabelProcessor:
     def __init__(
@@ -120,11 +123,6 @@ class PieChartProcessor:
         is_whole_project: bool,
         root_only: bool = False,
     ):
-        results = []
-        total_estimate = Sum(
-            Cast(F('case__estimate'), FloatField()) / self.seconds,
-            output_field=FloatField(),
-        )
         project = Project.objects.filter(id=project_id).first()
         general_filters = Q(project=project)
         if not is_whole_project:
@@ -133,33 +131,11 @@ class PieChartProcessor:
             if not root_only:
                 custom_filter |= Q(plan__path__descendant=parent_test_plan.path)
             general_filters &= custom_filter
-        tests = (
-            Test
-            .objects
-            .filter(
-                general_filters,
-                is_archive_condition,
-                Q(plan__is_deleted=False),
-            )
-            .annotate(
-                status=Coalesce(F('last_status_id'), Value(UNTESTED_STATUS.id)),
-                status_name=Coalesce(F('last_status__name'), Value(UNTESTED_STATUS.name.upper())),
-                status_color=Coalesce(F('last_status__color'), Value(UNTESTED_STATUS.color)),
-                estimates=Coalesce(total_estimate, 0, output_field=FloatField()),
-                is_empty_estimate=Case(
-                    When(Q(case__estimate__isnull=True), then=1),
-                    default=0,
-                ),
-                empty_estimates=Sum('is_empty_estimate'),
-            )
-            .values(
-                _STATUS, 'status_color', 'status_name', _ESTIMATES, _EMPTY_ESTIMATES,
-            )
-            .annotate(count=Count(_ID, distinct=True))
-            .order_by('-count')
-        )
         if label_processor.labels or label_processor.not_labels:
-            tests = label_processor.process_labels(tests)
+            tests = self._get_tests_statistic(general_filters, is_archive_condition, label_processor)
+        else:
+            tests = self._get_rollup_statistic(general_filters, is_archive_condition)
+        results = []
         presented_statuses = set()
         for test in tests:
             results.append(
@@ -198,6 +174,68 @@ class PieChartProcessor:
             )
         return results
 
+    def _get_rollup_statistic(self, general_filters: Q, is_archive_condition: Q) -> QuerySet[TestPlanStatistics]:
+        return (
+            TestPlanStatistics
+            .objects
+            .filter(
+                general_filters,
+                is_archive_condition,
+                Q(plan__is_deleted=False),
+            )
+            .values(_STATUS)
+            .annotate(
+                status_name=Coalesce(F('status__name'), Value(UNTESTED_STATUS.name.upper())),
+                status_color=Coalesce(F('status__color'), Value(UNTESTED_STATUS.color)),
+                count=Sum('tests_count'),
+                estimates=Coalesce(
+                    Sum(Cast(F('estimates_sum'), FloatField()) / self.seconds, output_field=FloatField()),
+                    0,
+                    output_field=FloatField(),
+                ),
+                empty_estimates=Sum('empty_estimates_count'),
+            )
+            .filter(count__gt=0)
+            .order_by('-count')
+        )
+
+    def _get_tests_statistic(
+        self,
+        general_filters: Q,
+        is_archive_condition: Q,
+        label_processor: LabelProcessor,
+    ) -> QuerySet[Test]:
+        total_estimate = Sum(
+            Cast(F('case__estimate'), FloatField()) / self.seconds,
+            output_field=FloatField(),
+        )
+        tests = (
+            Test
+            .objects
+            .filter(
+                general_filters,
+                is_archive_condition,
+                Q(plan__is_deleted=False),
+            )
+            .annotate(
+                status=Coalesce(F('last_status_id'), Value(UNTESTED_STATUS.id)),
+                status_name=Coalesce(F('last_status__name'), Value(UNTESTED_STATUS.name.upper())),
+                status_color=Coalesce(F('last_status__color'), Value(UNTESTED_STATUS.color)),
+                estimates=Coalesce(total_estimate, 0, output_field=FloatField()),
+                is_empty_estimate=Case(
+                    When(Q(case__estimate__isnull=True), then=1),
+                    default=0,
+                ),
+                empty_estimates=Sum('is_empty_estimate'),
+            )
+            .values(
+                _STATUS, 'status_color', 'status_name', _ESTIMATES, _EMPTY_ESTIMATES,
+            )
+            .annotate(count=Count(_ID, distinct=True))
+            .order_by('-count')
+        )
+        return label_processor.process_labels(tests)
+
 
 class HistogramProcessor:
     def __init__(self, parameters: dict[str, Any]) -> None:
@@ -215,14 +253,14 @@ class HistogramProcessor:
             )
 
         self.all_dates = {
-            self.period[0] + timezone.timedelta(days=n_day) for n_day in range(
+            (self.period[0] + timezone.timedelta(days=n_day)).date() for n_day in range(
                 (self.period[1] - self.period[0]).days,
             )
         }
 
-    def fill_empty_points(self, result: list[dict[str, Any]], test_plan_statuses: QuerySet):
+    def fill_empty_points(self, result: list[dict[str, Any]], test_plan_statuses: _StatusList):
         for unused_date in self.all_dates:
-            item = {_POINT: unused_date.date()}
+            item = {_POINT: unused_date}
             item.update(
                 {
                     status[_STATUS]: {
@@ -252,47 +290,34 @@ class HistogramProcessor:
         is_whole_project: bool,
         root_only: bool = False,
     ) -> list[dict[str, Any]]:
-        query_kwargs = self._get_query_kwargs()
         project = Project.objects.filter(id=project_id).first()
-        general_filters = Q(project=project)
-        if not is_whole_project:
-            parent_test_plan = parent_test_plans.first()
-            custom_filter = Q(test__plan=parent_test_plan)
-            if not root_only:
-                custom_filter |= Q(test__plan__path__descendant=parent_test_plan.path)
-            general_filters &= custom_filter
-
-        test_results_formatted = (
-            TestResult
-            .objects
-            .filter(
-                general_filters,
+        parent_test_plan = None if is_whole_project else parent_test_plans.first()
+        if self.attribute or label_processor.labels or label_processor.not_labels:
+            test_results_formatted = self._get_results_statistic(
+                Q(project=project) & self._get_plan_filters(parent_test_plan, root_only, 'test__plan'),
+                is_archive_condition,
+                label_processor,
+            )
+        else:
+            test_results_formatted = self._get_daily_statistic(
+                Q(project=project) & self._get_plan_filters(parent_test_plan, root_only, 'plan'),
                 is_archive_condition,
-                Q(test__plan__is_deleted=False),
-                Q(created_at__range=self.period),
-                *query_kwargs.get('filter_condition', []),
             )
-            .annotate(**query_kwargs.get('annotate_condition', {}))
-            .values(*query_kwargs.get('values_list', []))
-            .annotate(status_count=Count(_ID))
-            .order_by(query_kwargs.get('order_condition', _ID))
-            .distinct()
-        )
-        if label_processor.labels or label_processor.not_labels:
-            test_results_formatted = label_processor.process_labels(test_results_formatted)
 
         group_func = self.group_by_attribute if self.attribute else self.group_by_date
         grouped_data = groupby(test_results_formatted, group_func)
         result = []
-        test_plan_statuses = (
+        test_plan_statuses = list(
             ResultStatusSelector()
             .status_list(project=project)
             .annotate(status=F(_ID), status__name=F('name'), status__color=F(_COLOR))
-            .values(_STATUS, _RESULT_STATUS_NAME, _RESULT_STATUS_COLOR)
+            .values(_STATUS, _RESULT_STATUS_NAME, _RESULT_STATUS_COLOR),
         )
         for group_key, group_values in grouped_data:
+            point = group_key
             if not self.attribute:
-                self.all_dates.remove(group_key)
+                point = group_key.date() if isinstance(group_key, datetime) else group_key
+                self.all_dates.discard(point)
 
             histogram_bar_data = {
                 obj[_STATUS]: {
@@ -308,10 +333,11 @@ class HistogramProcessor:
                     _COUNT: 0,
                     _COLOR: empty_status[_RESULT_STATUS_COLOR],
                 }
-                for empty_status in test_plan_statuses.exclude(pk__in=histogram_bar_data.keys())
+                for empty_status in test_plan_statuses
+                if empty_status[_STATUS] not in histogram_bar_data
             }
             histogram_bar_data.update(empty_statuses)
-            histogram_bar_data[_POINT] = group_key if self.attribute else group_key.date()
+            histogram_bar_data[_POINT] = point
             result.append(histogram_bar_data)
 
         if not self.attribute:
@@ -323,6 +349,59 @@ class HistogramProcessor:
 
         return sorted(result, key=lambda obj: str(obj[_POINT]))
 
+    @classmethod
+    def _get_plan_filters(cls, parent_test_plan: TestPlan | None, root_only: bool, plan_lookup: str) -> Q:
+        if parent_test_plan is None:
+            return Q()
+        plan_filters = Q(**{plan_lookup: parent_test_plan})
+        if not root_only:
+            plan_filters |= Q(**{f'{plan_lookup}__path__descendant': parent_test_plan.path})
+        return plan_filters
+
+    def _get_daily_statistic(self, general_filters: Q, is_archive_condition: Q) -> QuerySet[TestResultDailyStatistics]:
+        return (
+            TestResultDailyStatistics.objects
+            .filter(
+                general_filters,
+                is_archive_condition,
+                plan__is_deleted=False,
+                day__gte=self.period[0].date(),
+                day__lt=self.period[1].date(),
+            )
+            .annotate(**{_PERIOD_DAY: F('day')})
+            .values(_PERIOD_DAY, _STATUS, _RESULT_STATUS_NAME, _RESULT_STATUS_COLOR)
+            .annotate(status_count=Sum('results_count'))
+            .filter(status_count__gt=0)
+            .order_by(_PERIOD_DAY)
+        )
+
+    def _get_results_statistic(
+        self,
+        general_filters: Q,
+        is_archive_condition: Q,
+        label_processor: LabelProcessor,
+    ) -> QuerySet[TestResult]:
+        query_kwargs = self._get_query_kwargs()
+        test_results_formatted = (
+            TestResult
+            .objects
+            .filter(
+                general_filters,
+                is_archive_condition,
+                Q(test__plan__is_deleted=False),
+                Q(created_at__range=self.period),
+                *query_kwargs.get('filter_condition', []),
+            )
+            .annotate(**query_kwargs.get('annotate_condition', {}))
+            .values(*query_kwargs.get('values_list', []))
+            .annotate(status_count=Count(_ID))
+            .order_by(query_kwargs.get('order_condition', _ID))
+            .distinct()
+        )
+        if label_processor.labels or label_processor.not_labels:
+            test_results_formatted = label_processor.process_labels(test_results_formatted)
+        return test_results_formatted
+
     def _get_query_kwargs(self):
         query_kwargs = {}
         if self.attribute:
@@ -346,3 +425,113 @@ class HistogramProcessor:
                 ),
             }
         return query_kwargs
+
+
+class TestPlanStatisticsService:
+    _key_fields = ('plan_id', 'status_id', 'is_archive')
+    _value_fields = ('project_id', 'tests_count', 'estimates_sum', 'empty_estimates_count')
+
+    @classmethod
+    def calculate_statistics(cls, project_id: int | None = None) -> _StatisticsMap:
+        tests = Test.objects.all()
+        if project_id is not None:
+            tests = tests.filter(project_id=project_id)
+        rows = (
+            tests
+            .annotate(status_id=F('last_status_id'))
+            .values('project_id', *cls._key_fields)
+            .annotate(
+                tests_count=Count(_ID),
+                estimates_sum=Coalesce(Sum('case__estimate'), 0, output_field=BigIntegerField()),
+                empty_estimates_count=Count(_ID, filter=Q(case__estimate__isnull=True)),
+            )
+            .order_by()
+        )
+        return cls._map_by_key(rows)
+
+    @classmethod
+    def stored_statistics(cls, project_id: int | None = None) -> _StatisticsMap:
+        statistics = TestPlanStatistics.objects.filter(tests_count__gt=0)
+        if project_id is not None:
+            statistics = statistics.filter(project_id=project_id)
+        return cls._map_by_key(statistics.values(*cls._key_fields, *cls._value_fields))
+
+    @classmethod
+    @transaction.atomic
+    def rebuild(cls, project_id: int | None = None) -> int:
+        statistics = TestPlanStatistics.objects.all()
+        if project_id is not None:
+            statistics = statistics.filter(project_id=project_id)
+        statistics.delete()
+        created = TestPlanStatistics.objects.bulk_create(
+            [TestPlanStatistics(**row) for row in cls.calculate_statistics(project_id).values()],
+            batch_size=1000,
+        )
+        return len(created)
+
+    @classmethod
+    def verify(cls, project_id: int | None = None) -> list[dict[str, Any]]:
+        """
+        Compare stored plan statistics with statistics calculated from tests.
+
+        Args:
+            project_id: limit verification to single project.
+
+        Returns:
+            list of mismatched rows with expected and actual values.
+        """
+        expected = cls.calculate_statistics(project_id)
+        actual = cls.stored_statistics(project_id)
+        mismatches = []
+        for key in expected.keys() | actual.keys():
+            expected_row = expected.get(key)
+            actual_row = actual.get(key)
+            if expected_row is not None and actual_row is not None:
+                is_equal = all(expected_row[field] == actual_row[field] for field in cls._value_fields)
+                if is_equal:
+                    continue
+            mismatches.append(
+                {
+                    **dict(zip(cls._key_fields, key)),
+                    'expected': expected_row,
+                    'actual': actual_row,
+                },
+            )
+        return mismatches
+
+    @classmethod
+    def _map_by_key(cls, rows: Iterable[dict[str, Any]]) -> _StatisticsMap:
+        return {tuple(row[key] for key in cls._key_fields): row for row in rows}
+
+
+class TestResultStatisticsService:
+    _compact_sql = """
+    WITH merged AS (
+        DELETE FROM {table}
+        WHERE (project_id, plan_id, COALESCE(status_id, 0), is_archive, day) IN (
+            SELECT project_id, plan_id, COALESCE(status_id, 0), is_archive, day
+            FROM {table}
+            GROUP BY project_id, plan_id, COALESCE(status_id, 0), is_archive, day
+            HAVING COUNT(*) > 1 OR SUM(results_count) = 0
+        )
+        RETURNING project_id, plan_id, status_id, is_archive, day, results_count
+    )
+    INSERT INTO {table} (project_id, plan_id, status_id, is_archive, day, results_count)
+    SELECT project_id, plan_id, status_id, is_archive, day, SUM(results_count)
+    FROM merged
+    GROUP BY project_id, plan_id, status_id, is_archive, day
+    HAVING SUM(results_count) <> 0
+    """
+
+    @classmethod
+    @transaction.atomic
+    def compact(cls) -> int:
+        """
+        Merge appended daily result deltas into single row per bucket and drop empty buckets.
+
+        Returns:
+            number of merged buckets written.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(cls._compact_sql.format(table=TestResultDailyStatistics._meta.db_table))
+            return cursor.rowcount
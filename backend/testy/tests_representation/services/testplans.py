@@ -103,7 +103,7 @@ class TestPlanService:
                 TestService().bulk_test_create([test_plan], cases)
         attachments = data.get(_ATTACHMENTS, [])
         AttachmentService().attachments_update_content_object(attachments, test_plan)
-        test_plan.refresh_from_db(fields=[_ATTACHMENTS])
+        test_plan.refresh_from_db(fields=[_ATTACHMENTS, 'title'])
         return test_plan
 
     @classmethod
@@ -34,19 +34,57 @@ from typing import Any
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 from django.contrib.contenttypes.models import ContentType
-from django.db import transaction
+from django.db import connection, transaction
 from django.db.models import QuerySet
-from simple_history.utils import bulk_update_with_history
 
+from testy.core.choices import ActionCode
+from testy.core.services.notifications import NotificationEvent
 from testy.root.celery import app
 from testy.tests_description.models import TestCase
-from testy.tests_description.selectors.suites import TestSuiteSelector
 from testy.tests_representation.models import Test, TestPlan
 from testy.tests_representation.selectors.tests import TestSelector
 from testy.users.models import User
+from testy.utilities.sql import get_history_insert_columns
 
 channel_layer = get_channel_layer()
 
+_BulkUpdateSummary = list[dict[str, Any]]
+
+_PLAN = 'plan'
+_ASSIGNEE = 'assignee'
+_BULK_UPDATE_CHANGE_REASON = 'Bulk update tests'
+
+# Values of historical record fields that are not copied from updated test, other columns are taken from test
+_BULK_UPDATE_HISTORY_VALUES = {
+    'history_date': 'now()',
+    'history_type': "'~'",
+    'history_user_id': '%s',
+    'history_change_reason': '%s',
+}
+
+_BULK_UPDATE_TESTS_SQL = """
+WITH selected_tests AS (
+    SELECT t.id, t.assignee_id
+    FROM tests_representation_test t
+    WHERE t.id IN ({tests})
+    ORDER BY t.id
+    FOR UPDATE
+), updated_tests AS (
+    UPDATE tests_representation_test t
+    SET plan_id = CASE WHEN %s THEN %s::bigint ELSE t.plan_id END,
+        assignee_id = CASE WHEN %s THEN %s::bigint ELSE t.assignee_id END,
+        updated_at = now()
+    FROM selected_tests s
+    WHERE t.id = s.id
+    RETURNING t.*, s.assignee_id AS old_assignee_id
+), history AS (
+    INSERT INTO {history_table} ({history_columns})
+    SELECT {history_values}
+    FROM updated_tests t
+)
+SELECT id, plan_id, assignee_id, old_assignee_id FROM updated_tests ORDER BY id
+"""
+
 
 class TestService:
     non_side_effect_fields = ['case', 'plan', 'assignee', 'is_archive', 'project']
@@ -96,43 +134,94 @@ class TestService:
         self.notify_assignee(test, old_assignee_id, assignee, user.pk, ct_id)
         return test
 
-    def bulk_update_tests(self, queryset: QuerySet[Test], payload: dict[str, Any], user: User):
+    @transaction.atomic
+    def bulk_update_tests(self, queryset: QuerySet[Test], payload: dict[str, Any], user: User) -> _BulkUpdateSummary:
+        """
+        Update plan and assignee of selected tests with single set based statement.
+
+        Selected tests are locked and updated by one UPDATE, historical records are written by one INSERT SELECT
+        from updated rows in the same statement.
+
+        Args:
+            queryset: tests available for update.
+            payload: validated bulk update data.
+            user: user tests are updated by.
+
+        Returns:
+            List of updated tests summaries with id, plan and assignee.
+        """
         tests = TestSelector.test_list_for_bulk_operation(
             queryset=queryset,
             included_tests=payload.pop('included_tests', None),
             excluded_tests=payload.pop('excluded_tests', None),
         )
-        updated_tests = []
-
-        test_to_old_assignee = {}
-        for test in tests:
-            test_to_old_assignee[test.pk] = test.assignee_id
-            updated_tests.append(self.test_update(test, payload, commit=False, user=user, notify_user=False))
-
-        if assignee := payload.get('assignee'):
-            assignee = assignee.pk
-
-        app.send_task(
-            'testy.tests_representation.tasks.notify_bulk_assign',
-            args=[
-                test_to_old_assignee,
-                assignee,
-                user.pk,
-            ],
-        )
-        bulk_update_with_history(
-            updated_tests,
-            Test,
-            fields=payload.keys(),
-            default_user=user,
-            default_change_reason='Bulk update tests',
-        )
-        qs = TestSelector().test_list_with_last_status(filter_condition={'pk__in': tests})
-        return TestSuiteSelector.annotate_suite_path(qs, 'case__suite__path')
+        tests_sql, tests_params = tests.values('pk').query.sql_with_params()
+        plan, assignee = payload.get(_PLAN), payload.get(_ASSIGNEE)
+        history_columns, history_values = get_history_insert_columns(Test, _BULK_UPDATE_HISTORY_VALUES)
+        history_params = {'history_user_id': user.pk, 'history_change_reason': _BULK_UPDATE_CHANGE_REASON}
+        with connection.cursor() as cursor:
+            cursor.execute(
+                _BULK_UPDATE_TESTS_SQL.format(
+                    tests=tests_sql,
+                    history_table=Test.history.model._meta.db_table,
+                    history_columns=', '.join(history_columns),
+                    history_values=', '.join(history_values),
+                ),
+                (
+                    *tests_params,
+                    _PLAN in payload,
+                    plan and plan.pk,
+                    _ASSIGNEE in payload,
+                    assignee and assignee.pk,
+                    *[history_params[column] for column in history_columns if column in history_params],
+                ),
+            )
+            rows = cursor.fetchall()
+        if _ASSIGNEE in payload:
+            test_to_old_assignee = {row[0]: row[3] for row in rows}
+            app.send_task(
+                'testy.tests_representation.tasks.notify_bulk_assign',
+                args=[test_to_old_assignee, assignee and assignee.pk, user.pk],
+            )
+        return [
+            {'id': test_id, _PLAN: plan_id, _ASSIGNEE: assignee_id}
+            for test_id, plan_id, assignee_id, _ in rows
+        ]
 
     def get_testcase_ids_by_testplan(self, test_plan: TestPlan) -> QuerySet[int]:
         return test_plan.tests.values_list('case', flat=True)
 
+    @classmethod
+    def assign_notification_events(
+        cls,
+        test_to_old_assignee: dict[int, int | None],
+        new_assignee_id: int | None,
+        actor_id: int,
+    ) -> list[NotificationEvent]:
+        ct_id = ContentType.objects.get_for_model(Test).pk
+        tests = TestSelector.test_list_by_ids(test_to_old_assignee.keys()).values_list(
+            'pk', 'project_id', 'plan_id', 'case__name',
+        )
+        events = []
+        for test_id, project_id, plan_id, name in tests:
+            context = {
+                'object_id': test_id,
+                'test_id': test_id,
+                'content_type_id': ct_id,
+                'actor_id': actor_id,
+                'project_id': project_id,
+                'plan_id': plan_id,
+                'name': name,
+            }
+            old_assignee_id = test_to_old_assignee[test_id]
+            if old_assignee_id and new_assignee_id != old_assignee_id:
+                events.append(
+                    NotificationEvent(test_id, ct_id, old_assignee_id, ActionCode.TEST_UNASSIGNED, context),
+                )
+            if new_assignee_id:
+                events.append(NotificationEvent(test_id, ct_id, new_assignee_id, ActionCode.TEST_ASSIGNED, context))
+        return events
+
     @classmethod
     def notify_assignee(
         cls,
@@ -28,22 +28,69 @@
 # if any, to sign a "copyright disclaimer" for the program, if necessary.
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
+from typing import Any
+
 from celery import shared_task
-from django.contrib.contenttypes.models import ContentType
+from django.utils.dateparse import parse_datetime
 
-from testy.tests_representation.models import Test
-from testy.tests_representation.selectors.tests import TestSelector
+from testy.core.services.copy import CopyService
+from testy.core.services.notifications import NotificationService
+from testy.tests_representation.selectors.testplan import TestPlanSelector
+from testy.tests_representation.services.statistics import TestResultStatisticsService
 from testy.tests_representation.services.tests import TestService
+from testy.users.selectors.users import UserSelector
+
+_PLAN = 'plan'
 
 
 @shared_task()
 def notify_bulk_assign(tests_mapping: dict[str, int], assignee_id: int, user_id: int):
-    tests = TestSelector.test_list_by_ids(tests_mapping.keys()).prefetch_related(
-        'project',
-        'plan',
-        'case',
-        'assignee',
-    )
-    ct_id = ContentType.objects.get_for_model(Test).pk
-    for test in tests:
-        TestService.notify_assignee(test, tests_mapping.get(str(test.pk)), assignee_id, user_id, ct_id)
+    actor = UserSelector.user_by_id(user_id)
+    if actor is None:
+        return
+    test_to_old_assignee = {int(test_id): old_assignee_id for test_id, old_assignee_id in tests_mapping.items()}
+    events = TestService.assign_notification_events(test_to_old_assignee, assignee_id, user_id)
+    NotificationService.notify_users_bulk(events, actor)
+
+
+@shared_task()
+def compact_result_statistics():
+    TestResultStatisticsService.compact()
+
+
+@shared_task(bind=True)
+def copy_plans(
+    self,
+    plans: list[dict[str, Any]],
+    dst_plan_id: int | None,
+    keep_assignee: bool,
+    user_id: int,
+) -> list[int]:
+    """
+    Copy plans validated by TestPlanCopySerializer in view.
+
+    Args:
+        self: bound task reporting copying progress.
+        plans: serialized plan details with plan ids and ISO formatted dates.
+        dst_plan_id: id of plan to copy into, None to copy to root.
+        keep_assignee: keep assignees of copied tests.
+        user_id: id of user who requested copying.
+
+    Returns:
+        ids of copied plans.
+    """
+    plans_by_id = TestPlanSelector.plans_by_ids([details[_PLAN] for details in plans]).in_bulk()
+    plans_details = []
+    for details in plans:
+        plan_details = {**details, _PLAN: plans_by_id[details[_PLAN]]}
+        for date_field in ('started_at', 'due_date'):
+            if date_value := details.get(date_field):
+                plan_details[date_field] = parse_datetime(date_value)
+        plans_details.append(plan_details)
+    payload = {
+        'plans': plans_details,
+        'dst_plan': TestPlanSelector.plans_by_ids([dst_plan_id]).first() if dst_plan_id else None,
+        'keep_assignee': keep_assignee,
+    }
+    copied_plans = CopyService.plans_copy(payload, task=self, user_id=user_id)
+    return list(copied_plans.values_list('id', flat=True))
@@ -43,9 +43,11 @@ from testy.core.models import Project
 from testy.core.selectors.custom_attribute import CustomAttributeSelector
 from testy.core.selectors.project_settings import ProjectSettings
 from testy.core.validators import BaseCustomAttributeValuesValidator
+from testy.tests_description.models import TestSuite
 from testy.tests_description.selectors.cases import TestCaseSelector
 from testy.tests_representation.choices import ResultStatusType, TestStatuses
 from testy.tests_representation.selectors.status import ResultStatusSelector
+from testy.tests_representation.selectors.tests import TestSelector
 from testy.users.selectors.roles import RoleSelector
 from testy.utilities.time import WorkTimeProcessor
 from testy.validators import FieldsToComparator
@@ -266,6 +268,51 @@ class TestResultCustomAttributeValuesValidator(BaseCustomAttributeValuesValidato
         self._validate(attributes, attr_getter)
 
 
+class ResultIngestCustomAttributeValuesValidator(BaseCustomAttributeValuesValidator):
+    """Validate custom attributes of ingested results with required attributes cached per suite and status."""
+
+    app_name = 'tests_representation'
+    model_name = 'testresult'
+
+    def __init__(self, project: Project):
+        self.project = project
+        self._statuses = ResultStatusSelector.status_list(project=project).in_bulk()
+        self._suite_ids: dict[int, int] = {}
+        self._required_attributes: dict[tuple[int, int], list[str]] = {}
+
+    def __call__(self, attrs: dict[str, Any]):
+        attr_getter = partial(self._required_attributes_by_test, attrs['test'], attrs[_STATUS])
+        self._validate(attrs.get('attributes', {}), attr_getter)
+
+    def prefetch_tests(self, test_ids: Iterable[Any]) -> None:
+        """
+        Load suites of tests of the next batch of records, suites of previous batch are dropped.
+
+        Args:
+            test_ids: raw test ids of records, non integer ids are skipped.
+        """
+        test_ids = {test_id for test_id in test_ids if isinstance(test_id, int)}
+        self._suite_ids = dict(TestSelector.suite_ids_by_tests(self.project, test_ids))
+
+    def _required_attributes_by_test(self, test_id: int, status_id: int, content_type_name: str) -> list[str]:
+        if test_id not in self._suite_ids:
+            self._suite_ids.update(TestSelector.suite_ids_by_tests(self.project, [test_id]))
+        suite_id = self._suite_ids.get(test_id)
+        if suite_id is None or status_id not in self._statuses:
+            return []
+        key = (suite_id, status_id)
+        if key not in self._required_attributes:
+            self._required_attributes[key] = list(
+                CustomAttributeSelector.required_attributes_by_status(
+                    project=self.project,
+                    suite=TestSuite(pk=suite_id),
+                    content_type_name=content_type_name,
+                    status=self._statuses[status_id],
+                ),
+            )
+        return self._required_attributes[key]
+
+
 @deconstructible
 class DateRangeValidator:
     def __call__(self, attrs):
@@ -28,7 +28,13 @@
 # if any, to sign a "copyright disclaimer" for the program, if necessary.
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
-from pgtrigger import Before, Delete, Insert, Q, Trigger, Update
+import operator
+from functools import reduce
+
+from pgtrigger import After, Before, Delete, F, Insert, Q, Referencing, Statement, Trigger, Update, UpdateOf
+
+_NEW = 'NEW'
+_OLD = 'OLD'
 
 
 def get_statistic_triggers(
@@ -88,3 +94,363 @@ def get_statistic_triggers(
             """.format(count_field=count_field),  # noqa: S608
         ),
     ]
+
+
+_PLAN_STATISTICS_TABLE = 'tests_representation_testplanstatistics'
+
+_PLAN_STATISTICS_SUBTRACT_TEMPLATE = """
+UPDATE {table}
+SET tests_count = tests_count - 1,
+    estimates_sum = estimates_sum - COALESCE(tc.estimate, 0),
+    empty_estimates_count = empty_estimates_count - (tc.estimate IS NULL)::int
+FROM tests_description_testcase tc
+WHERE tc.id = OLD.case_id
+  AND {table}.plan_id = OLD.plan_id
+  AND COALESCE({table}.status_id, 0) = COALESCE(OLD.last_status_id, 0)
+  AND {table}.is_archive = OLD.is_archive;
+"""
+
+_PLAN_STATISTICS_ADD_TEMPLATE = """
+INSERT INTO {table} AS stat
+(project_id, plan_id, status_id, is_archive, tests_count, estimates_sum, empty_estimates_count)
+SELECT NEW.project_id, NEW.plan_id, NEW.last_status_id, NEW.is_archive,
+       1, COALESCE(tc.estimate, 0), (tc.estimate IS NULL)::int
+FROM tests_description_testcase tc
+WHERE tc.id = NEW.case_id
+ON CONFLICT (plan_id, COALESCE(status_id, 0), is_archive) DO UPDATE
+SET tests_count = stat.tests_count + EXCLUDED.tests_count,
+    estimates_sum = stat.estimates_sum + EXCLUDED.estimates_sum,
+    empty_estimates_count = stat.empty_estimates_count + EXCLUDED.empty_estimates_count;
+"""
+
+_PLAN_STATISTICS_SUBTRACT = _PLAN_STATISTICS_SUBTRACT_TEMPLATE.format(table=_PLAN_STATISTICS_TABLE)
+_PLAN_STATISTICS_ADD = _PLAN_STATISTICS_ADD_TEMPLATE.format(table=_PLAN_STATISTICS_TABLE)
+
+_ROW_CHANGE = """
+IF NOT OLD.is_deleted THEN {subtract_old} END IF;
+IF NOT NEW.is_deleted THEN {add_new} END IF;
+RETURN NULL;
+"""
+
+_PLAN_STATISTICS_ESTIMATE_UPDATE = """
+UPDATE {table}
+SET estimates_sum = {table}.estimates_sum
+        + (COALESCE(NEW.estimate, 0) - COALESCE(OLD.estimate, 0)) * t.tests_count,
+    empty_estimates_count = {table}.empty_estimates_count
+        + ((NEW.estimate IS NULL)::int - (OLD.estimate IS NULL)::int) * t.tests_count
+FROM (
+    SELECT plan_id, last_status_id, is_archive, COUNT(*) AS tests_count
+    FROM tests_representation_test
+    WHERE case_id = NEW.id AND NOT is_deleted
+    GROUP BY plan_id, last_status_id, is_archive
+) t
+WHERE {table}.plan_id = t.plan_id
+  AND COALESCE({table}.status_id, 0) = COALESCE(t.last_status_id, 0)
+  AND {table}.is_archive = t.is_archive;
+RETURN NULL;
+"""
+
+
+def _for_alive_row(row: str, statement: str) -> str:
+    return f'IF NOT {row}.is_deleted THEN {statement} END IF; RETURN NULL;'
+
+
+def get_plan_statistic_triggers() -> list[Trigger]:
+    """
+    Get triggers keeping tests_representation_testplanstatistics in sync with tests.
+
+    Rollup row is identified by (plan, last status, is_archive), soft deleted tests are not counted.
+
+    Returns:
+        list of triggers for Test model.
+    """
+    tracked_fields = ('plan_id', 'last_status_id', 'is_archive', 'is_deleted', 'case_id')
+    lookups = []
+    for field in tracked_fields:
+        new_value = F(f'new__{field}')
+        lookups.append(Q(**{f'old__{field}__df': new_value}))
+    return [
+        Trigger(
+            name='plan_statistics_on_insert',
+            operation=Insert,
+            when=After,
+            func=_for_alive_row(_NEW, _PLAN_STATISTICS_ADD),
+        ),
+        Trigger(
+            name='plan_statistics_on_update',
+            operation=Update,
+            when=After,
+            func=_ROW_CHANGE.format(subtract_old=_PLAN_STATISTICS_SUBTRACT, add_new=_PLAN_STATISTICS_ADD),
+            condition=reduce(operator.or_, lookups),
+        ),
+        Trigger(
+            name='plan_statistics_on_delete',
+            operation=Delete,
+            when=After,
+            func=_for_alive_row(_OLD, _PLAN_STATISTICS_SUBTRACT),
+        ),
+    ]
+
+
+def get_plan_statistic_estimate_triggers() -> list[Trigger]:
+    """
+    Get triggers moving estimates of plan statistics when estimate of test case is changed.
+
+    Returns:
+        list of triggers for TestCase model.
+    """
+    return [
+        Trigger(
+            name='plan_statistics_on_estimate_update',
+            operation=Update,
+            when=After,
+            func=_PLAN_STATISTICS_ESTIMATE_UPDATE.format(table=_PLAN_STATISTICS_TABLE),
+            condition=Q(old__estimate__df=F('new__estimate')),
+        ),
+    ]
+
+
+def get_plan_statistic_cleanup_triggers() -> list[Trigger]:
+    return [
+        Trigger(
+            name='plan_statistics_on_plan_delete',
+            operation=Delete,
+            when=Before,
+            func=f'DELETE FROM {_PLAN_STATISTICS_TABLE} WHERE plan_id = OLD.id; RETURN OLD;',  # noqa: S608
+        ),
+        Trigger(
+            name='result_statistics_on_plan_delete',
+            operation=Delete,
+            when=Before,
+            func=f'DELETE FROM {_RESULT_STATISTICS_TABLE} WHERE plan_id = OLD.id; RETURN OLD;',  # noqa: S608
+        ),
+    ]
+
+
+_RESULT_STATISTICS_TABLE = 'tests_representation_testresultdailystatistics'
+
+_RESULT_STATISTICS_APPEND = """
+INSERT INTO {table} (project_id, plan_id, status_id, is_archive, day, results_count)
+SELECT {row}.project_id, t.plan_id, {row}.status_id, {row}.is_archive,
+       ({row}.created_at AT TIME ZONE 'UTC')::date, {sign}1
+FROM tests_representation_test t
+WHERE t.id = {row}.test_id;
+"""
+
+_RESULT_STATISTICS_MOVE = """
+INSERT INTO {table} (project_id, plan_id, status_id, is_archive, day, results_count)
+SELECT r.project_id, {row}.plan_id, r.status_id, r.is_archive,
+       (r.created_at AT TIME ZONE 'UTC')::date, {sign}COUNT(*)
+FROM tests_representation_testresult r
+WHERE r.test_id = NEW.id AND NOT r.is_deleted
+GROUP BY r.project_id, r.status_id, r.is_archive, (r.created_at AT TIME ZONE 'UTC')::date;
+"""
+
+
+def get_result_statistic_triggers() -> list[Trigger]:
+    """
+    Get triggers appending daily result buckets to tests_representation_testresultdailystatistics.
+
+    Every change of result is appended as +1/-1 row, rows are merged later by compaction task.
+
+    Returns:
+        list of triggers for TestResult model.
+    """
+    append_new = _RESULT_STATISTICS_APPEND.format(table=_RESULT_STATISTICS_TABLE, row=_NEW, sign='')
+    append_old = _RESULT_STATISTICS_APPEND.format(table=_RESULT_STATISTICS_TABLE, row=_OLD, sign='-')
+    tracked_fields = ('test_id', 'project_id', 'status_id', 'is_archive', 'is_deleted', 'created_at')
+    lookups = []
+    for field in tracked_fields:
+        new_value = F(f'new__{field}')
+        lookups.append(Q(**{f'old__{field}__df': new_value}))
+    return [
+        Trigger(
+            name='result_statistics_on_insert',
+            operation=Insert,
+            when=After,
+            func=_for_alive_row(_NEW, append_new),
+        ),
+        Trigger(
+            name='result_statistics_on_update',
+            operation=Update,
+            when=After,
+            func=_ROW_CHANGE.format(subtract_old=append_old, add_new=append_new),
+            condition=reduce(operator.or_, lookups),
+        ),
+        Trigger(
+            name='result_statistics_on_delete',
+            operation=Delete,
+            when=After,
+            func=_for_alive_row(_OLD, append_old),
+        ),
+    ]
+
+
+def get_result_statistic_move_triggers() -> list[Trigger]:
+    """
+    Get triggers moving daily result buckets of test to another plan.
+
+    Returns:
+        list of triggers for Test model.
+    """
+    move_from_old = _RESULT_STATISTICS_MOVE.format(table=_RESULT_STATISTICS_TABLE, row=_OLD, sign='-')
+    move_to_new = _RESULT_STATISTICS_MOVE.format(table=_RESULT_STATISTICS_TABLE, row=_NEW, sign='')
+    return [
+        Trigger(
+            name='result_statistics_on_test_move',
+            operation=Update,
+            when=After,
+            func=f'{move_from_old} {move_to_new} RETURN NULL;',
+            condition=Q(old__plan_id__df=F('new__plan_id')),
+        ),
+    ]
+
+
+_LAST_STATUS_REFRESH = """
+UPDATE tests_representation_test t
+SET last_status_id = latest.status_id
+FROM (
+    SELECT DISTINCT ON (changed.test_id) changed.test_id, r.status_id
+    FROM ({changed_tests}) changed
+    LEFT JOIN tests_representation_testresult r ON r.test_id = changed.test_id AND NOT r.is_deleted
+    ORDER BY changed.test_id, r.created_at DESC NULLS LAST, r.id DESC
+) latest
+WHERE t.id = latest.test_id AND t.last_status_id IS DISTINCT FROM latest.status_id;
+RETURN NULL;
+"""
+
+_LAST_STATUS_CHANGED_ON_UPDATE = """
+SELECT o.test_id FROM old_results o JOIN new_results n ON n.id = o.id
+WHERE (o.test_id, o.status_id, o.created_at, o.is_deleted) IS DISTINCT FROM
+      (n.test_id, n.status_id, n.created_at, n.is_deleted)
+UNION
+SELECT n.test_id FROM old_results o JOIN new_results n ON n.id = o.id
+WHERE (o.test_id, o.status_id, o.created_at, o.is_deleted) IS DISTINCT FROM
+      (n.test_id, n.status_id, n.created_at, n.is_deleted)
+"""
+
+
+def get_last_status_triggers() -> list[Trigger]:
+    """
+    Get statement level triggers keeping tests_representation_test.last_status_id in sync with results.
+
+    Last status is recalculated once per affected test from its latest not deleted result, so bulk and
+    out of order writes end up with the same status as sequential ones.
+
+    Returns:
+        list of triggers for TestResult model.
+    """
+    return [
+        Trigger(
+            name='last_status_on_insert',
+            operation=Insert,
+            when=After,
+            level=Statement,
+            referencing=Referencing(new='new_results'),
+            func=_LAST_STATUS_REFRESH.format(changed_tests='SELECT DISTINCT test_id FROM new_results'),
+        ),
+        Trigger(
+            name='last_status_on_update',
+            operation=Update,
+            when=After,
+            level=Statement,
+            referencing=Referencing(old='old_results', new='new_results'),
+            func=_LAST_STATUS_REFRESH.format(changed_tests=_LAST_STATUS_CHANGED_ON_UPDATE),
+        ),
+        Trigger(
+            name='last_status_on_delete',
+            operation=Delete,
+            when=After,
+            level=Statement,
+            referencing=Referencing(old='old_results'),
+            func=_LAST_STATUS_REFRESH.format(changed_tests='SELECT DISTINCT test_id FROM old_results'),
+        ),
+    ]
+
+
+_PLAN_TITLE_TOUCH = """
+UPDATE tests_representation_testplan SET parameter_ids = parameter_ids
+WHERE id IN (SELECT testplan_id FROM {changed_rows});
+RETURN NULL;
+"""
+
+_PLAN_TITLE_REFRESH = """
+SELECT COALESCE(array_agg(prm.id ORDER BY prm.id), ARRAY[]::bigint[]),
+       NEW.name || COALESCE(' [' || string_agg(prm.data, ', ' ORDER BY prm.data) || ']', '')
+INTO NEW.parameter_ids, NEW.title
+FROM tests_representation_testplan_parameters tp
+JOIN tests_representation_parameter prm ON prm.id = tp.parameter_id
+WHERE tp.testplan_id = NEW.id;
+RETURN NEW;
+"""
+
+_PLAN_TITLE_TOUCH_BY_PARAMETER = """
+UPDATE tests_representation_testplan SET parameter_ids = parameter_ids
+WHERE parameter_ids @> ARRAY[NEW.id];
+RETURN NULL;
+"""
+
+
+def get_plan_title_triggers() -> list[Trigger]:
+    """
+    Get triggers keeping denormalized title and parameter_ids of test plan in sync with its parameters.
+
+    Title is plan name followed by sorted parameters data in square brackets. Triggers on parameters
+    side set parameter_ids to itself to make this trigger recalculate title.
+
+    Returns:
+        list of triggers for TestPlan model.
+    """
+    return [
+        Trigger(
+            name='plan_title_on_change',
+            operation=Insert | UpdateOf('name', 'parameter_ids'),
+            when=Before,
+            func=_PLAN_TITLE_REFRESH,
+        ),
+    ]
+
+
+def get_plan_parameters_triggers() -> list[Trigger]:
+    """
+    Get statement level triggers refreshing titles of plans which parameters were added or removed.
+
+    Returns:
+        list of triggers for TestPlanParameter model.
+    """
+    return [
+        Trigger(
+            name='plan_title_on_parameters_insert',
+            operation=Insert,
+            when=After,
+            level=Statement,
+            referencing=Referencing(new='new_parameters'),
+            func=_PLAN_TITLE_TOUCH.format(changed_rows='new_parameters'),
+        ),
+        Trigger(
+            name='plan_title_on_parameters_delete',
+            operation=Delete,
+            when=After,
+            level=Statement,
+            referencing=Referencing(old='old_parameters'),
+            func=_PLAN_TITLE_TOUCH.format(changed_rows='old_parameters'),
+        ),
+    ]
+
+
+def get_parameter_data_triggers() -> list[Trigger]:
+    """
+    Get triggers refreshing titles of plans when data of parameter is changed.
+
+    Returns:
+        list of triggers for Parameter model.
+    """
+    return [
+        Trigger(
+            name='plan_title_on_parameter_update',
+            operation=Update,
+            when=After,
+            func=_PLAN_TITLE_TOUCH_BY_PARAMETER,
+            condition=Q(old__data__df=F('new__data')),
+        ),
+    ]
@@ -28,11 +28,13 @@
 # if any, to sign a "copyright disclaimer" for the program, if necessary.
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
-from typing import Protocol
+from collections import defaultdict
+from typing import Optional, Protocol, TypeAlias
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission
+from django.core.cache import cache
 from django.db.models import Q, QuerySet
 
 from testy.core.choices import AccessRequestStatus
@@ -42,6 +44,10 @@ from testy.users.models import Membership, Role, User
 
 UserModel = get_user_model()
 
+_PERMISSION_MATRIX_KEY = 'permission_matrix_{user_id}'
+
+PermissionMatrix: TypeAlias = dict[Optional[int], frozenset[str]]
+
 
 class ProjectAssignable(Protocol):
     project: Project
@@ -86,38 +92,47 @@ class RoleSelector:
         project: ProjectAssignable | Project,
         permission_code: UserAllowedPermissionCodenames | str,
     ) -> bool:
-        lookup = (
-            Q(user__pk=user.pk)
-            & Q(role__permissions__codename=permission_code)
-            & Q(project=project)
-        )
-        return Membership.objects.filter(lookup).exists()
+        return cls._project_permission_granted(user, project, permission_code)
 
     @classmethod
     def create_action_allowed(cls, user: User, project: Project, model_name: str) -> bool:
-        lookup = (
-            Q(user__pk=user.pk)
-            & Q(role__permissions__codename=f'add_{model_name}')
-            & Q(project=project)
-        )
-        return Membership.objects.filter(lookup).exists()
+        return cls._project_permission_granted(user, project, f'add_{model_name}')
 
     @classmethod
     def project_view_allowed(cls, user: User, project: Project) -> bool:
-        lookup = (
-            Q(user__pk=user.pk)
-            & Q(role__permissions__codename=UserAllowedPermissionCodenames.VIEW_PROJECT)
-            & Q(project=project)
-        )
-        return Membership.objects.filter(lookup).exists()
+        return cls._project_permission_granted(user, project, UserAllowedPermissionCodenames.VIEW_PROJECT)
 
     @classmethod
     def restricted_project_access(cls, user: User) -> bool:
-        lookup = (
-            Q(user__pk=user.pk)
-            & Q(role__permissions__codename=UserAllowedPermissionCodenames.VIEW_PROJECT_RESTRICTION)
-        )
-        return Membership.objects.filter(lookup).exists()
+        restriction = UserAllowedPermissionCodenames.VIEW_PROJECT_RESTRICTION
+        return any(restriction in codenames for codenames in cls.permission_matrix(user).values())
+
+    @classmethod
+    def permission_matrix(cls, user: User) -> PermissionMatrix:
+        """
+        Get permission codenames granted to user by memberships grouped by project id.
+
+        Matrix is compiled with single query and kept in cache until user memberships, roles or
+        permissions change, so repeated permission checks do not hit database.
+
+        Args:
+            user: user to get permissions for.
+
+        Returns:
+            Mapping of project id to permission codenames, None key holds memberships without project.
+        """
+        if user.pk is None:
+            return {}
+        cache_key = cls.permission_matrix_cache_key(user.pk)
+        matrix = cache.get(cache_key)
+        if matrix is None:
+            matrix = cls._compile_permission_matrix(user.pk)
+            cache.set(cache_key, matrix)
+        return matrix
+
+    @classmethod
+    def permission_matrix_cache_key(cls, user_id: int) -> str:
+        return _PERMISSION_MATRIX_KEY.format(user_id=user_id)
 
     @classmethod
     def admin_user_role(cls) -> Role | None:
@@ -133,3 +148,24 @@ class RoleSelector:
     @classmethod
     def access_request_pending_list(cls, project: Project, user: User) -> QuerySet[AccessRequest]:
         return AccessRequest.objects.filter(project=project, user=user, status=AccessRequestStatus.PENDING)
+
+    @classmethod
+    def _project_permission_granted(
+        cls,
+        user: User,
+        project: ProjectAssignable | Project | int,
+        permission_code: UserAllowedPermissionCodenames | str,
+    ) -> bool:
+        project_id = int(getattr(project, 'pk', project))
+        return permission_code in cls.permission_matrix(user).get(project_id, frozenset())
+
+    @classmethod
+    def _compile_permission_matrix(cls, user_id: int) -> PermissionMatrix:
+        grants = Membership.objects.filter(
+            user_id=user_id,
+            role__permissions__isnull=False,
+        ).values_list('project_id', 'role__permissions__codename')
+        matrix = defaultdict(set)
+        for project_id, codename in grants:
+            matrix[project_id].add(codename)
+        return {project_id: frozenset(codenames) for project_id, codenames in matrix.items()}
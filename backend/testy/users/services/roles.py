@@ -28,8 +28,10 @@
 # if any, to sign a "copyright disclaimer" for the program, if necessary.
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
-from typing import Any
+from functools import partial
+from typing import Any, Iterable
 
+from django.core.cache import cache
 from django.db import transaction
 from django.db.models import Q
 from rest_framework.exceptions import ValidationError
@@ -112,6 +114,23 @@ class RoleService:
             user=payload.get(_USER),
         ).hard_delete()
 
+    @classmethod
+    def invalidate_permission_matrix(cls, user_ids: Iterable[int]) -> None:
+        """
+        Drop cached permission matrices of users.
+
+        Cache is dropped right away for the current transaction and once more after commit so concurrent
+        requests could not cache state that was not committed yet.
+
+        Args:
+            user_ids: ids of users whose memberships, roles or permissions changed.
+        """
+        cache_keys = [RoleSelector.permission_matrix_cache_key(user_id) for user_id in set(user_ids)]
+        if not cache_keys:
+            return
+        cache.delete_many(cache_keys)
+        transaction.on_commit(partial(cache.delete_many, cache_keys))
+
     @classmethod
     def access_request_create(cls, project: Project, user: User, reason: str) -> AccessRequest:
         non_side_effect_fields = [_PROJECT, 'reason', 'status', _USER]
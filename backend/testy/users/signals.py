@@ -33,11 +33,15 @@ from functools import partial
 from pathlib import Path
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
 from django.db import transaction
-from django.db.models.signals import post_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
 from testy.core.services.media import MediaService
+from testy.root.querysets import pre_soft_delete_change
+from testy.users.models import Membership, Role
+from testy.users.services.roles import RoleService
 
 UserModel = get_user_model()
 
@@ -50,3 +54,35 @@ def auto_delete_file_on_delete(sender, instance, **kwargs):
         transaction.on_commit(
             partial(MediaService.remove_media, src_file_path=Path(instance.avatar.path)),
         )
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def reset_permissions_on_membership_change(sender, instance, **kwargs):
+    RoleService.invalidate_permission_matrix([instance.user_id])
+
+
+@receiver(pre_soft_delete_change, sender=Membership)
+def reset_permissions_on_membership_soft_delete(sender, queryset, **kwargs):
+    RoleService.invalidate_permission_matrix(queryset.values_list('user_id', flat=True))
+
+
+@receiver(m2m_changed, sender=Role.permissions.through)
+def reset_permissions_on_role_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in {'post_add', 'post_remove', 'pre_clear'}:
+        return
+    if reverse and pk_set is None:
+        role_lookup = {'role__permissions': instance}
+    elif reverse:
+        role_lookup = {'role__in': pk_set}
+    else:
+        role_lookup = {'role': instance}
+    user_ids = Membership.objects.filter(**role_lookup).values_list('user_id', flat=True)
+    RoleService.invalidate_permission_matrix(user_ids)
+
+
+@receiver(post_save, sender=Permission)
+@receiver(pre_delete, sender=Permission)
+def reset_permissions_on_permission_change(sender, instance, **kwargs):
+    user_ids = Membership.objects.filter(role__permissions=instance).values_list('user_id', flat=True)
+    RoleService.invalidate_permission_matrix(user_ids)
@@ -28,7 +28,16 @@
 # if any, to sign a "copyright disclaimer" for the program, if necessary.
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
-from django.db.models import F, Func, IntegerField, Max, Model, Q, Subquery, UniqueConstraint, Value, fields
+from typing import NamedTuple
+
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import BigIntegerField, F, Func, IntegerField, Max, Model, Q, QuerySet, Subquery, UniqueConstraint, Value
+
+
+class UnionPosition(NamedTuple):
+    is_leaf: bool
+    name: str
+    id: int  # noqa: WPS125
 
 
 class SubCount(Subquery):
@@ -43,19 +52,27 @@ class DateTrunc(Func):
         super().__init__(Value(trunc_type), field_expression, **extra)
 
 
-class ConcatSubquery(Subquery):
-    template = 'ARRAY_TO_STRING(ARRAY(%(subquery)s), %(separator)s)'  # noqa: WPS323
-    output_field = fields.CharField()
+class ArrayPosition(Func):
+    function = 'ARRAY_POSITION'
+    output_field = IntegerField()
+
+    def __init__(self, ids: list[int], field_expression, **extra):
+        super().__init__(Value(ids, output_field=ArrayField(BigIntegerField())), field_expression, **extra)
+
 
-    def __init__(self, *args, separator=', ', **kwargs):
-        self.separator = separator
-        super().__init__(*args, **kwargs)
+def get_history_insert_columns(model: type[Model], history_values: dict[str, str]) -> tuple[list[str], list[str]]:
+    """
+    Get columns of historical model and sql values inserting them from row of model aliased as t.
 
-    def as_sql(self, compiler, connection, template=None, **extra_context):
-        extra_context['separator'] = '%s'  # noqa: WPS323
-        sql, sql_params = super().as_sql(compiler, connection, template, **extra_context)  # type: ignore
-        sql_params = sql_params + (self.separator,)  # type: ignore
-        return sql, sql_params
+    Args:
+        model: model tracked by simple history.
+        history_values: sql values of columns that are not copied from row, e.g. history_date.
+
+    Returns:
+        Columns of historical model except its primary key and matching sql values.
+    """
+    columns = [field.column for field in model.history.model._meta.concrete_fields if not field.primary_key]
+    return columns, [history_values.get(column, f't.{column}') for column in columns]
 
 
 def get_next_max_int_value(model: type[Model], field: str) -> int:
@@ -80,3 +97,25 @@ def get_max_level(model: type[Model]) -> int:
         )
     ).get('max_level')
     return max_level if max_level else 0
+
+
+def filter_after_position(qs: QuerySet, position: UnionPosition | None, is_leaf: bool) -> QuerySet:
+    """
+    Keep rows of union part that follow position in (is_leaf, name, id) ordering.
+
+    Union could not be filtered after it is combined, so every part is filtered by keyset on its own.
+
+    Args:
+        qs: queryset of one union part.
+        position: last row of previous page, None for first page.
+        is_leaf: is_leaf value of all rows of union part.
+
+    Returns:
+        Filtered queryset.
+    """
+    if position is None:
+        return qs
+    if position.is_leaf != is_leaf:
+        return qs if is_leaf else qs.none()
+    same_name_lookup = Q(name=position.name, id__gt=position.id)
+    return qs.filter(Q(name__gt=position.name) | same_name_lookup)
@@ -28,12 +28,21 @@
 # if any, to sign a "copyright disclaimer" for the program, if necessary.
 # For more information on this, and how to apply and follow the GNU AGPL, see
 # <http://www.gnu.org/licenses/>.
-from typing import Any, Callable, Iterable
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Iterable, Iterator, Mapping, TypeAlias
 
-from django.db.models import Prefetch, QuerySet
+import orjson
+from django.db.models import Model, Prefetch, QuerySet
 
 _ID = 'id'
 _PARENT = 'parent'
+_PATH = 'path'
+_CHUNK_SIZE = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+TreeNode: TypeAlias = tuple[int, int | None, bytes | None]
 
 
 def form_tree_prefetch_lookups(nested_prefetch_field: str, prefetch_field: str, tree_depth) -> list[str]:
@@ -118,6 +127,47 @@ def form_tree_prefetch_objects(  # noqa: WPS211
     return prefetch_objects_list
 
 
+def prefetch_tree(instances: Iterable[Model], queryset: QuerySet) -> None:
+    """
+    Fetch all descendants of ltree instances in one query and attach them as prefetched children.
+
+    Descendants are grouped by parent id and stored in prefetch cache of parent related manager the same way
+    prefetch_related_objects does, as queryset filtered by parent with result cache of its children.
+    So instance.<children>.all() returns nodes without further queries on any level of tree and further
+    filtering of children queries only children of instance. Roots found among descendants are replaced
+    with passed instances.
+
+    Args:
+        instances: ltree model instances to be used as roots.
+        queryset: queryset to get descendants from, its filters, annotations and ordering are kept.
+    """
+    instances = list(instances)
+    if not instances:
+        return
+    parent_field = queryset.model._meta.get_field(_PARENT)
+    cache_name = parent_field.remote_field.get_cache_name()
+    accessor_name = parent_field.remote_field.get_accessor_name()
+    pk_to_root = {instance.pk: instance for instance in instances}
+    roots = queryset.model._base_manager.filter(pk__in=pk_to_root.keys())
+    descendants = queryset.filter(
+        tree_id__in={instance.tree_id for instance in instances},
+        path__descendant_any=roots.values(_PATH),
+    )
+    pk_to_children = defaultdict(list)
+    nodes = list(instances)
+    for descendant in descendants:
+        if descendant.pk not in pk_to_root:
+            nodes.append(descendant)
+        node = pk_to_root.get(descendant.pk, descendant)
+        pk_to_children[node.parent_id].append(node)
+    for node in nodes:
+        children = getattr(node, accessor_name)._apply_rel_filters(queryset)  # noqa: WPS437
+        children._result_cache = pk_to_children.get(node.pk, [])  # noqa: WPS437
+        children._prefetch_done = True  # noqa: WPS437
+        node._prefetched_objects_cache = getattr(node, '_prefetched_objects_cache', {})  # noqa: WPS437
+        node._prefetched_objects_cache[cache_name] = children  # noqa: WPS437
+
+
 def get_breadcrumbs_treeview(
     instances,
     depth: int,
@@ -141,30 +191,177 @@ def get_breadcrumbs_treeview(
     }
 
 
-def build_tree(  # noqa: WPS231
-    qs: QuerySet,
+def build_breadcrumbs(nodes: Iterable[Mapping[str, Any]], title_key: str = 'title') -> dict[int, dict[str, Any]]:
+    """
+    Build treeview breadcrumbs for every node, breadcrumbs of common ancestors are shared.
+
+    Args:
+        nodes: node mappings with id, parent_id and title ordered by ltree path, so parents go before children
+        title_key: key of node title
+
+    Returns:
+        Mapping of node id to breadcrumbs in format of get_breadcrumbs_treeview
+    """
+    ids_to_breadcrumbs = {}
+    for node in nodes:
+        ids_to_breadcrumbs[node[_ID]] = {
+            'id': node[_ID],
+            'title': node[title_key],
+            'parent': ids_to_breadcrumbs.get(node['parent_id']),
+        }
+    return ids_to_breadcrumbs
+
+
+def iter_tree_json(
+    nodes: Iterable[TreeNode],
+    children_key: str = 'children',
+    chunk_size: int = _CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Incrementally encode forest of nodes as json array without holding the whole tree in memory.
+
+    Args:
+        nodes: (id, parent id, encoded json object) triples in depth-first order, e.g. ordered by ltree path.
+            Node encoded as None is omitted, its children are placed instead of it.
+        children_key: key of nested children list added to every encoded node
+        chunk_size: approximate size of yielded chunks in bytes
+
+    Yields:
+        Chunks of json array
+    """
+    children_prefix = orjson.dumps(children_key)
+    buffer = bytearray(b'[')
+    open_nodes: list[tuple[int, bool]] = []
+    has_items = [False]
+    for node_id, parent_id, encoded in nodes:
+        while open_nodes and open_nodes[-1][0] != parent_id:
+            if open_nodes.pop()[1]:
+                has_items.pop()
+                buffer += b']}'
+        open_nodes.append((node_id, encoded is not None))
+        if encoded is None:
+            continue
+        if has_items[-1]:
+            buffer += b','
+        has_items[-1] = True
+        has_items.append(False)
+        buffer += encoded[:-1]
+        buffer += b',' + children_prefix + b':['
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    for _, is_encoded in reversed(open_nodes):
+        if is_encoded:
+            buffer += b']}'
+    buffer += b']'
+    yield bytes(buffer)
+
+
+def order_depth_first(nodes: Iterable[dict[str, Any]], parent_key: str = 'parent_id') -> list[dict[str, Any]]:
+    """
+    Order nodes depth first, siblings keep their order from nodes.
+
+    Args:
+        nodes: node dicts with id and parent keys, e.g. ordered by name
+        parent_key: key of parent id in node
+
+    Returns:
+        List of nodes where every node is followed by its subtree
+    """
+    nodes = list(nodes)
+    node_ids = {node[_ID] for node in nodes}
+    children = defaultdict(list)
+    for node in nodes:
+        parent_id = node[parent_key]
+        children[parent_id if parent_id in node_ids else None].append(node)
+    ordered_nodes = []
+    stack = children[None][::-1]
+    while stack:
+        node = stack.pop()
+        ordered_nodes.append(node)
+        stack.extend(reversed(children[node[_ID]]))
+    return ordered_nodes
+
+
+def stream_tree(
+    nodes: Iterable[dict[str, Any]],
     omitted_ids: Iterable[int] | None = None,
     title_key: str = 'name',
-) -> list[dict[str, Any]]:
+) -> Iterator[bytes]:
+    """
+    Stream tree of nodes as json, parent id of every node is replaced with breadcrumb of parent.
+
+    Args:
+        nodes: node dicts with id and parent keys ordered by ltree path
+        omitted_ids: ids of nodes to skip, their children are placed on the upper level
+        title_key: key of node title used in parent breadcrumb
+
+    Returns:
+        Iterator of json chunks
+    """
     if omitted_ids is None:
         omitted_ids = []
-    pk_to_suite = {}
-    resulting = []
+    return iter_tree_json(_encode_tree_nodes(nodes, omitted_ids, title_key))
 
-    for node in qs:
-        node['children'] = []
-        pk_to_suite[node[_ID]] = node
 
-    for node in pk_to_suite.values():
-        if node[_ID] in omitted_ids:
-            continue
+def stream_tree_with_leaves(
+    nodes: Iterable[dict[str, Any]],
+    leaves: Iterable[dict[str, Any]],
+    leaves_key: str,
+    leaf_parent_key: str,
+    parent_key: str = 'parent_id',
+) -> Iterator[bytes]:
+    """
+    Stream tree of nodes as json, every node gets list of its leaves under leaves_key.
+
+    Args:
+        nodes: node dicts ordered by ltree path
+        leaves: leaf dicts ordered by ltree path of their node, e.g. cases ordered by suite path
+        leaves_key: key of leaves list added to every node
+        leaf_parent_key: key of node id in leaf
+        parent_key: key of parent id in node
+
+    Returns:
+        Iterator of json chunks
+    """
+    return iter_tree_json(_encode_nodes_with_leaves(nodes, leaves, leaves_key, leaf_parent_key, parent_key))
+
+
+def _encode_tree_nodes(
+    nodes: Iterable[dict[str, Any]],
+    omitted_ids: Iterable[int],
+    title_key: str,
+) -> Iterator[TreeNode]:
+    ancestors: list[dict[str, Any]] = []
+    for node in nodes:
         parent_id = node.get(_PARENT)
-        if parent_id is None:
-            resulting.append(node)
-            continue
-        parent = pk_to_suite[parent_id]
-        node[_PARENT] = {_ID: parent[_ID], title_key: parent[title_key]}
-        parent['children'].append(node)
-        if parent_id in omitted_ids:
-            resulting.append(node)
-    return resulting
+        while ancestors and ancestors[-1][_ID] != parent_id:
+            ancestors.pop()
+        if ancestors:
+            node[_PARENT] = ancestors[-1]
+        ancestors.append({_ID: node[_ID], title_key: node[title_key]})
+        yield node[_ID], parent_id, None if node[_ID] in omitted_ids else orjson.dumps(node)
+
+
+def _encode_nodes_with_leaves(  # noqa: WPS211
+    nodes: Iterable[dict[str, Any]],
+    leaves: Iterable[dict[str, Any]],
+    leaves_key: str,
+    leaf_parent_key: str,
+    parent_key: str,
+) -> Iterator[TreeNode]:
+    nodes = list(nodes)
+    node_ids = {node[_ID] for node in nodes}
+    leaves = iter(leaves)
+    leaf = next(leaves, None)
+    for node in nodes:
+        node[leaves_key] = []
+        while leaf is not None:
+            if leaf[leaf_parent_key] == node[_ID]:
+                node[leaves_key].append(leaf)
+            elif leaf[leaf_parent_key] in node_ids:
+                break
+            else:
+                logger.error(f'Node {leaf[leaf_parent_key]} of leaf {leaf[_ID]} was not found, probably it was deleted')
+            leaf = next(leaves, None)
+        yield node[_ID], node[parent_key], orjson.dumps(node)
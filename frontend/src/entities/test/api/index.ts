@@ -38,7 +38,7 @@ export const testApi = createApi({
         dispatch(testPlanApi.util.invalidateTags([{ type: "TestPlanTest", id }]))
       },
     }),
-    bulkUpdate: builder.mutation<Test[], TestBulkUpdate>({
+    bulkUpdate: builder.mutation<TestBulkUpdateResult[], TestBulkUpdate>({
       query: (body) => ({
         url: `${rootPath}/bulk-update/`,
         method: "PUT",
@@ -133,6 +133,12 @@ interface TestBulkUpdate {
   filter_conditions?: Partial<TestGetFilters>
 }
 
+interface TestBulkUpdateResult {
+  id: number
+  plan: number
+  assignee: number | null
+}
+
 interface TestsWithPlanBreadcrumbs extends Test {
   breadcrumbs: BreadCrumbsActivityResult
 }